@@ -0,0 +1,103 @@
+import logging
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+
+import torch
+
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Collects concurrent single-image requests into one forward pass.
+
+    submit() enqueues a (C, H, W) tensor and returns a Future. A background
+    thread waits for up to ``max_batch_size`` items or ``max_delay_ms`` after
+    the first item arrives, stacks them, calls ``fn`` once and resolves each
+    future with its own row of the output.
+    """
+
+    def __init__(self, fn, max_batch_size=8, max_delay_ms=10, name="batcher"):
+        self.fn = fn
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay_ms / 1000.0
+        self.name = name
+
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+        self._stats_lock = threading.Lock()
+        self._batch_sizes = Counter()
+
+    def submit(self, tensor):
+        self._ensure_started()
+        future = Future()
+        self._queue.put((tensor, future))
+        return future
+
+    def __call__(self, tensor, timeout=None):
+        return self.submit(tensor).result(timeout=timeout)
+
+    def stats(self):
+        with self._stats_lock:
+            sizes = dict(self._batch_sizes)
+
+        batches = sum(sizes.values())
+        items = sum(size * count for size, count in sizes.items())
+        return {
+            "batches": batches,
+            "items": items,
+            "mean_batch_size": items / batches if batches else 0.0,
+            "batch_size_histogram": sizes,
+        }
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=self.name, daemon=True
+                )
+                self._thread.start()
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_delay
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            tensors = [item[0] for item in batch]
+            futures = [item[1] for item in batch]
+
+            try:
+                with torch.no_grad():
+                    outputs = self.fn(torch.stack(tensors))
+            except Exception as exc:
+                for future in futures:
+                    future.set_exception(exc)
+                continue
+
+            for i, future in enumerate(futures):
+                future.set_result(outputs[i])
+
+            with self._stats_lock:
+                self._batch_sizes[len(batch)] += 1
+            logger.debug("%s ran batch of %d", self.name, len(batch))
\ No newline at end of file
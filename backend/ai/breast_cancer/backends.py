@@ -0,0 +1,88 @@
+import torch
+
+from ai.registry import registry
+from .model import load_breast_cancer_model
+
+
+INPUT_SHAPE = (1, 3, 224, 224)
+
+# Backend name -> registry model name. Every backend loads into an object
+# that maps a (N, 3, 224, 224) float tensor to (N, 2) logits.
+BACKENDS = {
+    "eager": "breast_cancer",
+    "torchscript": "breast_cancer_torchscript",
+    "onnxruntime": "breast_cancer_onnx",
+    "quantized": "breast_cancer_quantized",
+}
+
+
+class OnnxRuntimeModel:
+    def __init__(self, path):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.input_name = self.session.get_inputs()[0].name
+
+    def eval(self):
+        return self
+
+    def __call__(self, x):
+        logits = self.session.run(None, {self.input_name: x.detach().cpu().numpy()})[0]
+        return torch.from_numpy(logits)
+
+
+def load_torchscript_model(path, device):
+    module = torch.jit.load(path, map_location=device)
+    return torch.jit.optimize_for_inference(module.eval())
+
+
+def load_onnx_model(path, device):
+    if device.type != "cpu":
+        raise ValueError("The onnxruntime backend only runs on CPU")
+    return OnnxRuntimeModel(path)
+
+
+def load_quantized_model(path, device):
+    if device.type != "cpu":
+        raise ValueError("Quantized models only run on CPU")
+    return torch.jit.load(path, map_location=device).eval()
+
+
+registry.register(BACKENDS["eager"], load_breast_cancer_model)
+registry.register(BACKENDS["torchscript"], load_torchscript_model)
+registry.register(BACKENDS["onnxruntime"], load_onnx_model)
+registry.register(BACKENDS["quantized"], load_quantized_model)
+
+
+def get_classifier(backend, path, device="cpu"):
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown breast cancer backend '{backend}'")
+    return registry.get(BACKENDS[backend], path, device)
+
+
+def export_torchscript(model, path):
+    example = torch.zeros(INPUT_SHAPE)
+    with torch.no_grad():
+        traced = torch.jit.trace(model.eval(), example)
+    torch.jit.freeze(traced).save(path)
+    return path
+
+
+def export_onnx(model, path, opset=17):
+    example = torch.zeros(INPUT_SHAPE)
+    torch.onnx.export(
+        model.eval(),
+        example,
+        path,
+        input_names=["input"],
+        output_names=["logits"],
+        dynamic_axes={"input": {0: "batch"}, "logits": {0: "batch"}},
+        opset_version=opset,
+        # The dynamo exporter (the default on current torch) needs onnxscript
+        dynamo=False,
+    )
+    return path
\ No newline at end of file
@@ -1,30 +1,92 @@
+import threading
+
 import torch
 
+
 class GradCAM:
+    """
+    Grad-CAM over ``target_layer`` from one grad-enabled forward pass and one
+    backward pass.
+
+    The forward hook is only attached while the engine is used as a context
+    manager (or between attach() and detach()), so a model shared through
+    the registry does not accumulate hooks. Captured activations are kept
+    per thread because concurrent requests run on the same module.
+    """
+
     def __init__(self, model, target_layer):
         self.model = model
         self.target_layer = target_layer
-        self.gradients = None
-        self.activations = None
-        self._register_hooks()
-
-    def _register_hooks(self):
-        self.target_layer.register_forward_hook(
-            lambda _, __, output: setattr(self, "activations", output)
-        )
-        self.target_layer.register_full_backward_hook(
-            lambda _, grad_input, grad_output: setattr(self, "gradients", grad_output[0])
-        )
+        self._handle = None
+        self._local = threading.local()
 
-    def generate(self, x, class_idx):
-        output = self.model(x)
-        self.model.zero_grad()
-        output[0, class_idx].backward()
+    def attach(self):
+        if self._handle is None:
+            self._handle = self.target_layer.register_forward_hook(self._save_activations)
+        return self
+
+    def detach(self):
+        if self._handle is not None:
+            self._handle.remove()
+            self._handle = None
+        self._local.activations = None
+
+    def __enter__(self):
+        return self.attach()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.detach()
+
+    def _save_activations(self, module, inputs, output):
+        self._local.activations = output
 
-        weights = self.gradients.mean(dim=(2, 3), keepdim=True)
-        cam = (weights * self.activations).sum(dim=1)
-        cam = torch.relu(cam)
+    def run(self, x, class_idx=None):
+        """
+        Classify the batch ``x`` and compute one CAM per image.
 
-        cam -= cam.min()
-        cam /= cam.max() + 1e-6
-        return cam.squeeze().detach().cpu().numpy()
\ No newline at end of file
+        ``class_idx`` selects the target class: None uses each image's
+        predicted class, an int applies to every image, and a sequence gives
+        one class per image (repeat an image in the batch to get CAMs for
+        several classes). Returns logits, softmax probabilities, the target
+        classes and the CAMs as an (N, H, W) array normalised to [0, 1].
+        """
+        if self._handle is None:
+            raise RuntimeError("GradCAM hooks are not attached; use it as a context manager")
+
+        with torch.enable_grad():
+            logits = self.model(x)
+            activations = self._local.activations
+
+            probs = torch.softmax(logits.detach(), dim=1)
+            if class_idx is None:
+                targets = probs.argmax(dim=1)
+            else:
+                targets = torch.as_tensor(class_idx, device=logits.device).reshape(-1)
+                targets = targets.expand(logits.shape[0])
+
+            # Images are independent in eval mode, so the gradient of the sum
+            # of the selected logits gives every image its own gradient.
+            score = logits.gather(1, targets.view(-1, 1)).sum()
+            gradients = torch.autograd.grad(score, activations)[0]
+
+        weights = gradients.mean(dim=(2, 3), keepdim=True)
+        cams = torch.relu((weights * activations.detach()).sum(dim=1))
+
+        flat = cams.flatten(1)
+        flat = flat - flat.min(dim=1, keepdim=True).values
+        flat = flat / (flat.max(dim=1, keepdim=True).values + 1e-6)
+
+        self._local.activations = None
+
+        return {
+            "logits": logits.detach(),
+            "probs": probs,
+            "class_idx": targets,
+            "cams": flat.view_as(cams).cpu().numpy(),
+        }
+
+    def generate(self, x, class_idx):
+        if self._handle is not None:
+            return self.run(x, class_idx)["cams"][0]
+        with self:
+            return self.run(x, class_idx)["cams"][0]
\ No newline at end of file
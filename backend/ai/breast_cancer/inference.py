@@ -1,60 +1,62 @@
 import torch
 import numpy as np
 import cv2
-import pydicom
 import os
+import threading
 
-from .model import BreastCancerModel
+from ai.batching import MicroBatcher
+from ai.registry import registry
+from .backends import BACKENDS, get_classifier
 from .gradcam import GradCAM
+from .preprocessing import load_image
 
 
-def load_image(path, size=(224, 224)):
-    ext = os.path.splitext(path)[1].lower()
+MODEL_NAME = BACKENDS["eager"]
 
-    # ---- DICOM ----
-    if ext == ".dcm":
-        ds = pydicom.dcmread(path)
-        image = ds.pixel_array.astype(np.float32)
+_batchers = {}
+_batchers_lock = threading.Lock()
 
-        image *= float(getattr(ds, "RescaleSlope", 1.0))
-        image += float(getattr(ds, "RescaleIntercept", 0.0))
 
-        if hasattr(ds, "WindowCenter") and hasattr(ds, "WindowWidth"):
-            wc = ds.WindowCenter[0] if isinstance(ds.WindowCenter, list) else ds.WindowCenter
-            ww = ds.WindowWidth[0] if isinstance(ds.WindowWidth, list) else ds.WindowWidth
-            image = np.clip(image, wc - ww / 2, wc + ww / 2)
-
-    # ---- PNG / JPG ----
-    else:
-        image = cv2.imread(path, cv2.IMREAD_GRAYSCALE).astype(np.float32)
+def warm_up(model_path, device="cpu", backend="eager"):
+    """
+    Load the model into the registry and run one dummy forward pass so the
+    first real request does not pay for model construction.
+    """
+    model = get_classifier(backend, model_path, device)
+    with torch.no_grad():
+        model(torch.zeros(1, 3, 224, 224, device=torch.device(device)))
+    return model
 
-    image = (image - image.min()) / (image.max() - image.min() + 1e-6)
-    image = cv2.resize(image, size)
-    return image
 
+def get_batcher(model_path, device="cpu", max_batch_size=8, max_delay_ms=10, backend="eager"):
+    """
+    Return the shared micro-batcher for this checkpoint, device and backend.
 
-def predict_breast_cancer(dicom_or_image_path, model_path, device="cpu"):
-    device = torch.device(device)
+    The batcher resolves the model through the registry on every batch, so a
+    hot-reloaded checkpoint is used without restarting the batching thread.
+    """
+    key = (backend, os.path.abspath(model_path), str(torch.device(device)))
 
-    image = load_image(dicom_or_image_path)
-    tensor = torch.tensor(image).unsqueeze(0).repeat(3, 1, 1).unsqueeze(0).to(device)
+    with _batchers_lock:
+        if key not in _batchers:
+            def run(batch):
+                model = get_classifier(backend, model_path, device)
+                return torch.softmax(model(batch.to(device)), dim=1)
 
-    model = BreastCancerModel(num_classes=2).to(device)
-    checkpoint = torch.load(model_path, map_location=device)
+            _batchers[key] = MicroBatcher(
+                run,
+                max_batch_size=max_batch_size,
+                max_delay_ms=max_delay_ms,
+                name=f"{MODEL_NAME}-{backend}-batcher",
+            )
+        return _batchers[key]
 
-    state_dict = {k.replace("model.", ""): v for k, v in checkpoint["model_state_dict"].items()}
-    model.model.load_state_dict(state_dict, strict=False)
-    model.eval()
 
-    with torch.no_grad():
-        logits = model(tensor)
-        probs = torch.softmax(logits, dim=1)
-        pred_class = int(torch.argmax(probs))
-        confidence = float(probs[0, pred_class])
+def _to_tensor(image, device):
+    return torch.tensor(image).unsqueeze(0).repeat(3, 1, 1).unsqueeze(0).to(device)
 
-    gradcam = GradCAM(model, model.model.conv_head)
-    cam = gradcam.generate(tensor, pred_class)
 
+def render_overlay(image, cam):
     # Resize CAM to image size
     cam_resized = cv2.resize(cam, (image.shape[1], image.shape[0]))
 
@@ -70,10 +72,74 @@ def predict_breast_cancer(dicom_or_image_path, model_path, device="cpu"):
         + 0.4 * heatmap / 255.0
     )
 
-    overlay = np.clip(overlay, 0, 1)
+    return np.clip(overlay, 0, 1)
+
+
+def _load(path, cache):
+    if cache is None:
+        return load_image(path)
+    return cache.load(path, (224, 224), load_image)
+
+
+def predict_breast_cancer(dicom_or_image_path, model_path, device="cpu", batcher=None,
+                          with_heatmap=False, backend="eager", cache=None):
+    """
+    Classify one image.
+
+    ``model_path`` is the artifact for ``backend`` (the checkpoint for eager,
+    an exported .pt or .onnx file otherwise). By default only the risk score
+    is computed and the Grad-CAM overlay is left to generate_heatmap(). With
+    ``with_heatmap=True`` the prediction and the overlay come from the same
+    grad-enabled forward pass, which needs the eager checkpoint. ``cache`` is
+    an optional TensorCache for the preprocessed image.
+    """
+    device = torch.device(device)
 
-    return {
+    image = _load(dicom_or_image_path, cache)
+    tensor = _to_tensor(image, device)
+
+    if with_heatmap:
+        if backend != "eager":
+            raise ValueError("Grad-CAM needs the eager PyTorch backend")
+        model = registry.get(MODEL_NAME, model_path, device)
+        with GradCAM(model, model.model.conv_head) as gradcam:
+            result = gradcam.run(tensor)
+        probs = result["probs"]
+    elif batcher is not None:
+        probs = batcher(tensor[0]).unsqueeze(0)
+    else:
+        model = get_classifier(backend, model_path, device)
+        with torch.no_grad():
+            probs = torch.softmax(model(tensor), dim=1)
+
+    pred_class = int(torch.argmax(probs))
+    confidence = float(probs[0, pred_class])
+
+    prediction = {
         "prediction": "Malignant" if pred_class == 1 else "Benign",
+        "class_idx": pred_class,
         "confidence": confidence,
-        "overlay": overlay,
-    }
\ No newline at end of file
+    }
+    if with_heatmap:
+        prediction["overlay"] = render_overlay(image, result["cams"][0])
+    return prediction
+
+
+def generate_heatmaps(images, model_path, class_idx, device="cpu"):
+    """
+    Compute Grad-CAM overlays for a list of preprocessed images in one
+    forward/backward pass. ``class_idx`` is an int or one class per image.
+    """
+    device = torch.device(device)
+    batch = torch.cat([_to_tensor(image, device) for image in images])
+
+    model = registry.get(MODEL_NAME, model_path, device)
+    with GradCAM(model, model.model.conv_head) as gradcam:
+        cams = gradcam.run(batch, class_idx)["cams"]
+
+    return [render_overlay(image, cam) for image, cam in zip(images, cams)]
+
+
+def generate_heatmap(dicom_or_image_path, model_path, class_idx, device="cpu", cache=None):
+    image = _load(dicom_or_image_path, cache)
+    return generate_heatmaps([image], model_path, [class_idx], device)[0]
\ No newline at end of file
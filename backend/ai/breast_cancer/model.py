@@ -1,3 +1,4 @@
+import torch
 import torch.nn as nn
 import timm
 
@@ -11,4 +12,14 @@ class BreastCancerModel(nn.Module):
         )
 
     def forward(self, x):
-        return self.model(x)
\ No newline at end of file
+        return self.model(x)
+
+
+def load_breast_cancer_model(path, device):
+    model = BreastCancerModel(num_classes=2).to(device)
+    checkpoint = torch.load(path, map_location=device)
+
+    state_dict = {k.replace("model.", ""): v for k, v in checkpoint["model_state_dict"].items()}
+    model.model.load_state_dict(state_dict, strict=False)
+    model.eval()
+    return model
\ No newline at end of file
@@ -0,0 +1,159 @@
+import os
+
+import cv2
+import numpy as np
+import pydicom
+from PIL import Image
+from pydicom.multival import MultiValue
+
+try:
+    # pydicom >= 3 can decode a single frame without decoding the rest
+    from pydicom.pixels import iter_pixels, pixel_array as read_pixel_array
+except ImportError:
+    iter_pixels = read_pixel_array = None
+
+
+# Bump whenever load_image() output changes so cached tensors are not reused.
+PREPROCESS_VERSION = "2"
+
+# cv2.resize works on these dtypes directly; anything else is widened first.
+RESIZABLE_DTYPES = (np.uint8, np.uint16, np.int16, np.float32, np.float64)
+
+REDUCED_GRAYSCALE_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_GRAYSCALE_8),
+    (4, cv2.IMREAD_REDUCED_GRAYSCALE_4),
+    (2, cv2.IMREAD_REDUCED_GRAYSCALE_2),
+)
+
+
+def _first(value):
+    if isinstance(value, (list, tuple, MultiValue)):
+        return value[0]
+    return value
+
+
+def _to_grayscale(pixels):
+    if pixels.ndim == 3 and pixels.shape[-1] in (3, 4):
+        pixels = cv2.cvtColor(pixels, cv2.COLOR_RGB2GRAY if pixels.shape[-1] == 3 else cv2.COLOR_RGBA2GRAY)
+    return pixels
+
+
+def _downsample(pixels, size):
+    """
+    Area-average down to ``size`` on the native dtype, so the float32 copy
+    made afterwards is only target-sized.
+    """
+    if pixels.dtype.type not in RESIZABLE_DTYPES:
+        pixels = pixels.astype(np.float32)
+
+    height, width = pixels.shape[:2]
+    if width > size[0] or height > size[1]:
+        pixels = cv2.resize(pixels, size, interpolation=cv2.INTER_AREA)
+    return pixels
+
+
+def _normalize(pixels, size, slope=1.0, intercept=0.0, window=None):
+    """
+    Rescale, window and min-max normalize in place on the downsampled frame.
+
+    Rescaling is linear, so applying it after area downsampling gives the
+    same result as before; windowing and min-max now see area-averaged
+    values, which only differs at window edges.
+    """
+    image = _downsample(pixels, size).astype(np.float32, copy=True)
+
+    if slope != 1.0:
+        image *= slope
+    if intercept != 0.0:
+        image += intercept
+
+    if window is not None:
+        center, width = window
+        np.clip(image, center - width / 2, center + width / 2, out=image)
+
+    low = image.min()
+    image -= low
+    image /= image.max() + 1e-6
+
+    if image.shape[1] != size[0] or image.shape[0] != size[1]:
+        image = cv2.resize(image, size)
+    return image
+
+
+def _dicom_params(ds):
+    slope = float(getattr(ds, "RescaleSlope", 1.0))
+    intercept = float(getattr(ds, "RescaleIntercept", 0.0))
+
+    window = None
+    if hasattr(ds, "WindowCenter") and hasattr(ds, "WindowWidth"):
+        window = (float(_first(ds.WindowCenter)), float(_first(ds.WindowWidth)))
+
+    return slope, intercept, window
+
+
+def dicom_frame_count(path):
+    ds = pydicom.dcmread(path, stop_before_pixels=True)
+    return int(getattr(ds, "NumberOfFrames", 1) or 1)
+
+
+def _read_dicom_frame(path, frame):
+    # Element values above 1 KB (i.e. the pixel data) are only read when
+    # accessed, so the header is parsed without pulling the image into memory.
+    ds = pydicom.dcmread(path, defer_size="1 KB")
+    frames = int(getattr(ds, "NumberOfFrames", 1) or 1)
+
+    if frame >= frames:
+        raise IndexError(f"{path} has {frames} frame(s), frame {frame} requested")
+
+    if frames == 1:
+        pixels = ds.pixel_array
+    elif read_pixel_array is not None:
+        pixels = read_pixel_array(path, index=frame)
+    else:
+        pixels = ds.pixel_array[frame]
+
+    return ds, pixels
+
+
+def _read_raster(path, size):
+    """
+    Decode a PNG/JPEG at the largest power-of-two reduction that still
+    covers ``size``; JPEG is then scaled inside the decoder.
+    """
+    with Image.open(path) as header:
+        width, height = header.size
+
+    for factor, flag in REDUCED_GRAYSCALE_FLAGS:
+        if width // factor >= size[0] and height // factor >= size[1]:
+            return cv2.imread(path, flag)
+    return cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+
+
+def load_image(path, size=(224, 224), frame=0):
+    ext = os.path.splitext(path)[1].lower()
+
+    # ---- DICOM ----
+    if ext == ".dcm":
+        ds, pixels = _read_dicom_frame(path, frame)
+        slope, intercept, window = _dicom_params(ds)
+        return _normalize(_to_grayscale(pixels), size, slope, intercept, window)
+
+    # ---- PNG / JPG ----
+    pixels = _read_raster(path, size)
+    if pixels is None:
+        raise ValueError(f"Could not decode image {path}")
+    return _normalize(pixels, size)
+
+
+def iter_frames(path, size=(224, 224)):
+    """Yield each frame of a (multi-frame) DICOM, decoding one at a time."""
+    ds = pydicom.dcmread(path, stop_before_pixels=True)
+    slope, intercept, window = _dicom_params(ds)
+
+    if iter_pixels is not None:
+        for pixels in iter_pixels(path):
+            yield _normalize(_to_grayscale(pixels), size, slope, intercept, window)
+        return
+
+    for frame in range(int(getattr(ds, "NumberOfFrames", 1) or 1)):
+        yield load_image(path, size, frame=frame)
\ No newline at end of file
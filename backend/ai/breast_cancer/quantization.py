@@ -0,0 +1,120 @@
+import copy
+import io
+import logging
+import time
+
+import torch
+import torch.nn as nn
+
+from .backends import INPUT_SHAPE
+
+
+logger = logging.getLogger(__name__)
+
+
+def quantize_dynamic(model):
+    """INT8 weights for the Linear classifier head, activations stay fp32."""
+    return torch.ao.quantization.quantize_dynamic(
+        copy.deepcopy(model).eval(), {nn.Linear}, dtype=torch.qint8
+    )
+
+
+def quantize_static(model, calibration_batches, engine="x86"):
+    """
+    Post-training static INT8 quantization (FX graph mode).
+
+    Activation ranges are observed on ``calibration_batches``, which should
+    be real preprocessed scans rather than random tensors.
+    """
+    from torch.ao.quantization import get_default_qconfig_mapping
+    from torch.ao.quantization.quantize_fx import convert_fx, prepare_fx
+
+    torch.backends.quantized.engine = engine
+    example = (torch.zeros(INPUT_SHAPE),)
+
+    prepared = prepare_fx(
+        copy.deepcopy(model).eval(),
+        get_default_qconfig_mapping(engine),
+        example,
+    )
+    with torch.no_grad():
+        for batch in calibration_batches:
+            prepared(batch)
+
+    return convert_fx(prepared)
+
+
+def quantize(model, mode, calibration_batches=()):
+    """
+    Quantize ``model`` with ``mode`` ("static" or "dynamic").
+
+    Static quantization falls back to dynamic when the graph cannot be
+    traced or no calibration data is available. Returns (model, mode used).
+    """
+    if mode == "static":
+        calibration_batches = list(calibration_batches)
+        if not calibration_batches:
+            logger.warning("No calibration images, falling back to dynamic quantization")
+        else:
+            try:
+                return quantize_static(model, calibration_batches), "static"
+            except Exception:
+                logger.exception("Static quantization failed, falling back to dynamic")
+
+    return quantize_dynamic(model), "dynamic"
+
+
+def save_quantized(model, path):
+    example = torch.zeros(INPUT_SHAPE)
+    with torch.no_grad():
+        traced = torch.jit.trace(model, example)
+    torch.jit.freeze(traced).save(path)
+    return path
+
+
+def serialized_size_mb(model):
+    buffer = io.BytesIO()
+    if isinstance(model, torch.jit.ScriptModule):
+        torch.jit.save(model, buffer)
+    else:
+        torch.save(model.state_dict(), buffer)
+    return buffer.tell() / (1024 * 1024)
+
+
+def seconds_per_image(model, batches):
+    images = 0
+    start = time.perf_counter()
+    with torch.no_grad():
+        for batch in batches:
+            model(batch)
+            images += batch.shape[0]
+    return (time.perf_counter() - start) / max(images, 1)
+
+
+def compare_predictions(reference, candidate, batches):
+    """
+    Accuracy drift of ``candidate`` against ``reference`` on held-out
+    batches: predicted-class agreement and confidence deltas.
+    """
+    total = agree = 0
+    deltas = []
+
+    with torch.no_grad():
+        for batch in batches:
+            ref = torch.softmax(reference(batch), dim=1)
+            cand = torch.softmax(candidate(batch), dim=1)
+
+            ref_class = ref.argmax(dim=1)
+            cand_class = cand.argmax(dim=1)
+
+            total += batch.shape[0]
+            agree += int((ref_class == cand_class).sum())
+            deltas.append((ref.gather(1, ref_class.view(-1, 1)) - cand.gather(1, ref_class.view(-1, 1))).abs().view(-1))
+
+    deltas = torch.cat(deltas) if deltas else torch.zeros(0)
+    return {
+        "images": total,
+        "class_agreement": agree / total if total else 0.0,
+        "mean_confidence_delta": float(deltas.mean()) if total else 0.0,
+        "max_confidence_delta": float(deltas.max()) if total else 0.0,
+    }
\ No newline at end of file
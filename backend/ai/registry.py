@@ -0,0 +1,57 @@
+import os
+import threading
+
+import torch
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of ready-to-run models.
+
+    Loaders are registered by model name and called with (path, device).
+    Loaded modules are kept per (name, path, device) together with the
+    checkpoint mtime, so a replaced checkpoint is reloaded on the next get().
+    """
+
+    def __init__(self):
+        self._loaders = {}
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, loader):
+        self._loaders[name] = loader
+
+    def get(self, name, path, device="cpu"):
+        if name not in self._loaders:
+            raise KeyError(f"No loader registered for model '{name}'")
+
+        device = torch.device(device)
+        key = (name, os.path.abspath(path), str(device))
+        mtime = os.stat(path).st_mtime_ns
+
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] == mtime:
+            return entry[0]
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] != mtime:
+                model = self._loaders[name](path, device)
+                model.eval()
+                entry = (model, mtime)
+                self._entries[key] = entry
+
+        return entry[0]
+
+    def is_loaded(self, name, path, device="cpu"):
+        key = (name, os.path.abspath(path), str(torch.device(device)))
+        return key in self._entries
+
+    def evict(self, name=None):
+        with self._lock:
+            for key in list(self._entries):
+                if name is None or key[0] == name:
+                    del self._entries[key]
+
+
+registry = ModelRegistry()
\ No newline at end of file
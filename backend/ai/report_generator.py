@@ -1,36 +1,97 @@
+import io
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image
 from reportlab.lib.pagesizes import A4
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfgen import canvas
 from django.core.files.base import ContentFile
-import os
 
 
-def generate_report(test, ai_result):
-    path = f"/tmp/report_{test.id}.pdf"
-    c = canvas.Canvas(path, pagesize=A4)
+TITLE_FONT = ("Helvetica-Bold", 16)
+BODY_FONT = ("Helvetica", 11)
+
+HEATMAP_WIDTH = 400
+
+
+@lru_cache(maxsize=None)
+def _fonts():
+    # Resolving a standard font parses its AFM metrics; do it once per process
+    return tuple(pdfmetrics.getFont(name) for name, _ in (TITLE_FONT, BODY_FONT))
+
+
+@lru_cache(maxsize=None)
+def _summary_template():
+    """Static text of the summary page as (font, x, y, text) draw calls."""
+    _, height = A4
+    return (
+        (TITLE_FONT, 50, height - 50, "AI-Assisted Diagnostic Report"),
+        (BODY_FONT, 50, height - 200, "Disclaimer:"),
+        (BODY_FONT, 50, height - 220, "AI output is assistive and must be reviewed by a doctor."),
+    )
+
+
+def _heatmap_reader(ai_result, heatmap):
+    """
+    ImageReader for the heatmap page. ``heatmap`` is the in-memory RGB
+    overlay from ``render_overlay``; without it the stored PNG is read
+    through the storage backend.
+    """
+    if heatmap is not None:
+        overlay = np.asarray(heatmap)
+        if overlay.dtype != np.uint8:
+            overlay = (overlay * 255).astype(np.uint8)
+        return ImageReader(Image.fromarray(overlay))
+
+    if ai_result.heatmap_image:
+        with ai_result.heatmap_image.open("rb") as f:
+            return ImageReader(io.BytesIO(f.read()))
+
+    return None
+
+
+def render_report(test, ai_result, heatmap=None, risk_level=None, doctor_signed=False):
+    """
+    Render the report PDF and return its bytes. ``risk_level`` and
+    ``doctor_signed`` come from the DiagnosticReport; the risk level falls
+    back to the AI result's.
+    """
+    _fonts()
     width, height = A4
 
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(50, height - 50, "AI-Assisted Diagnostic Report")
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A4)
 
-    c.setFont("Helvetica", 11)
+    for font, x, y, text in _summary_template():
+        c.setFont(*font)
+        c.drawString(x, y, text)
+
+    c.setFont(*BODY_FONT)
     c.drawString(50, height - 100, f"Patient: {test.patient.user.full_name}")
     c.drawString(50, height - 120, f"Test Type: {test.test_type}")
-    c.drawString(50, height - 140, f"Risk Level: {ai_result.risk_level}")
+    c.drawString(50, height - 140, f"Risk Level: {risk_level or ai_result.risk_level}")
     c.drawString(50, height - 160, f"Confidence: {ai_result.confidence:.2f}")
-
-    c.drawString(50, height - 200, "Disclaimer:")
-    c.drawString(50, height - 220, "AI output is assistive and must be reviewed by a doctor.")
+    c.drawString(
+        50, height - 180,
+        "Reviewed and signed by a doctor" if doctor_signed else "Awaiting doctor review"
+    )
 
     c.showPage()
 
-    if ai_result.heatmap_image:
-        c.drawImage(ai_result.heatmap_image.path, 50, height - 450, width=400)
+    image = _heatmap_reader(ai_result, heatmap)
+    if image is not None:
+        c.drawImage(image, 50, height - 450, width=HEATMAP_WIDTH)
 
     c.showPage()
     c.save()
 
-    with open(path, "rb") as f:
-        pdf = ContentFile(f.read(), name=f"report_{test.id}.pdf")
+    return buffer.getvalue()
+
 
-    os.remove(path)
-    return pdf
\ No newline at end of file
+def generate_report(test, ai_result, heatmap=None, risk_level=None, doctor_signed=False):
+    return ContentFile(
+        render_report(test, ai_result, heatmap, risk_level=risk_level, doctor_signed=doctor_signed),
+        name=f"report_{test.id}.pdf"
+    )
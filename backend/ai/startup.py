@@ -0,0 +1,63 @@
+import logging
+import os
+
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
+
+_tensor_cache = None
+
+
+def breast_cancer_backend_path(backend=None):
+    backend = backend or settings.BREAST_CANCER_BACKEND
+    return {
+        "eager": settings.BREAST_CANCER_MODEL_PATH,
+        "torchscript": settings.BREAST_CANCER_TORCHSCRIPT_PATH,
+        "onnxruntime": settings.BREAST_CANCER_ONNX_PATH,
+        "quantized": settings.BREAST_CANCER_QUANTIZED_PATH,
+    }[backend]
+
+
+def get_tensor_cache():
+    """The process-wide preprocessed-image cache, or None when disabled."""
+    global _tensor_cache
+
+    if not settings.AI_TENSOR_CACHE_ENABLED:
+        return None
+
+    if _tensor_cache is None:
+        from ai.breast_cancer.preprocessing import PREPROCESS_VERSION
+        from ai.tensor_cache import TensorCache
+        from core.storage import stored_content_hash
+
+        _tensor_cache = TensorCache(
+            settings.AI_TENSOR_CACHE_DIR,
+            max_bytes=settings.AI_TENSOR_CACHE_MAX_BYTES,
+            memory_items=settings.AI_TENSOR_CACHE_MEMORY_ITEMS,
+            version=PREPROCESS_VERSION,
+            hasher=stored_content_hash,
+        )
+    return _tensor_cache
+
+
+def warm_up_models():
+    """
+    Populate the model registry for this worker process.
+
+    A missing checkpoint only logs a warning so development servers without
+    model weights still start.
+    """
+    if not getattr(settings, "AI_WARMUP_ON_STARTUP", False):
+        return
+
+    from ai.breast_cancer.inference import warm_up
+
+    models = {("eager", settings.BREAST_CANCER_MODEL_PATH)}
+    models.add((settings.BREAST_CANCER_BACKEND, breast_cancer_backend_path()))
+
+    for backend, path in sorted(models):
+        if not os.path.exists(path):
+            logger.warning("Skipping breast cancer %s warm-up, %s not found", backend, path)
+            continue
+        warm_up(path, backend=backend)
\ No newline at end of file
@@ -0,0 +1,145 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TensorCache:
+    """
+    Content-addressed cache of preprocessed images.
+
+    Keys are the SHA-256 of the uploaded file combined with the
+    preprocessing version and target size, so a changed loader never serves
+    stale tensors. Arrays live on disk as ``.npy`` files sharded by key
+    prefix and are memory-mapped on read; a small in-memory LRU sits in
+    front. When the directory grows past ``max_bytes`` the least recently
+    used files are removed.
+
+    ``hasher`` maps a path to its content hash; pass one that reads the
+    hash from the file name when files are stored content-addressed.
+    """
+
+    def __init__(self, directory, max_bytes, memory_items=256, version="1", hasher=file_sha256):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.memory_items = memory_items
+        self.version = version
+        self.hasher = hasher
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes = None
+
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, content_hash, size):
+        raw = f"{content_hash}:{self.version}:{size[0]}x{size[1]}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key[2:4], f"{key}.npy")
+
+    def get(self, key):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+
+        path = self._path(key)
+        try:
+            array = np.load(path, mmap_mode="r")
+            os.utime(path)
+        except (FileNotFoundError, ValueError, OSError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return self._remember(key, array)
+
+    def put(self, key, array):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write to a temp file and rename so readers never see a partial .npy
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, np.ascontiguousarray(array, dtype=np.float32))
+        os.replace(tmp_path, path)
+
+        array = self._remember(key, array)
+        self._account(os.path.getsize(path))
+        return array
+
+    def load(self, path, size, loader):
+        """Return ``loader(path, size)``, decoding only on a cache miss."""
+        key = self.key(self.hasher(path), size)
+        array = self.get(key)
+        if array is None:
+            array = self.put(key, loader(path, size))
+        return array
+
+    def _remember(self, key, array):
+        array = array.view()
+        array.flags.writeable = False
+        with self._lock:
+            self._memory[key] = array
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+        return array
+
+    def _files(self):
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith(".npy"):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    yield stat.st_mtime, stat.st_size, path
+
+    def _account(self, added):
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(size for _, size, _ in self._files())
+            else:
+                self._disk_bytes += added
+            over_budget = self._disk_bytes > self.max_bytes
+
+        if over_budget:
+            self.evict()
+
+    def evict(self, target_ratio=0.9):
+        """Delete least recently used files until under ``target_ratio`` of the budget."""
+        files = sorted(self._files())
+        total = sum(size for _, size, _ in files)
+        target = self.max_bytes * target_ratio
+
+        for _, size, path in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+        with self._lock:
+            self._disk_bytes = total
+        return total
\ No newline at end of file
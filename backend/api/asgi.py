@@ -14,3 +14,7 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api.settings')
 
 application = get_asgi_application()
+
+from ai.startup import warm_up_models
+
+warm_up_models()
\ No newline at end of file
@@ -19,6 +19,70 @@ BREAST_CANCER_MODEL_PATH = os.path.join(
     "breast_model.pkl"
 )
 
+# Recorded on every AIInferenceResult so re-scored rows can be told apart.
+BREAST_CANCER_MODEL_VERSION = os.getenv("BREAST_CANCER_MODEL_VERSION", "v1")
+
+# Classification backend for breast cancer screening: "eager" (PyTorch),
+# "torchscript", "onnxruntime" or "quantized" (INT8). The exported artifacts
+# are produced by `python manage.py export_breast_cancer_model` and
+# `python manage.py quantize_breast_cancer_model`. Grad-CAM heatmaps always
+# use the eager checkpoint.
+BREAST_CANCER_BACKEND = os.getenv("BREAST_CANCER_BACKEND", "eager")
+BREAST_CANCER_TORCHSCRIPT_PATH = os.path.join(BASE_DIR, "core", "model", "breast_model.torchscript.pt")
+BREAST_CANCER_ONNX_PATH = os.path.join(BASE_DIR, "core", "model", "breast_model.onnx")
+BREAST_CANCER_QUANTIZED_PATH = os.path.join(BASE_DIR, "core", "model", "breast_model.int8.pt")
+
+# Load AI checkpoints into the model registry when a WSGI/ASGI worker boots
+# instead of on the first inference request.
+AI_WARMUP_ON_STARTUP = os.getenv("AI_WARMUP_ON_STARTUP", "true").lower() == "true"
+
+# Concurrent breast cancer requests within one worker are stacked into a
+# single forward pass of up to AI_BATCH_MAX_SIZE images, waiting at most
+# AI_BATCH_MAX_DELAY_MS for the batch to fill.
+AI_BATCHING_ENABLED = os.getenv("AI_BATCHING_ENABLED", "true").lower() == "true"
+AI_BATCH_MAX_SIZE = int(os.getenv("AI_BATCH_MAX_SIZE", "8"))
+AI_BATCH_MAX_DELAY_MS = int(os.getenv("AI_BATCH_MAX_DELAY_MS", "10"))
+
+# Content-addressed cache of preprocessed 224x224 scans, so re-runs and
+# re-scoring skip image decoding.
+AI_TENSOR_CACHE_ENABLED = os.getenv("AI_TENSOR_CACHE_ENABLED", "true").lower() == "true"
+AI_TENSOR_CACHE_DIR = os.getenv("AI_TENSOR_CACHE_DIR", os.path.join(BASE_DIR, "cache", "tensors"))
+AI_TENSOR_CACHE_MAX_BYTES = int(os.getenv("AI_TENSOR_CACHE_MAX_BYTES", str(2 * 1024 ** 3)))
+AI_TENSOR_CACHE_MEMORY_ITEMS = int(os.getenv("AI_TENSOR_CACHE_MEMORY_ITEMS", "256"))
+
+# Background AI jobs (`python manage.py run_ai_worker`). Failed jobs are
+# retried with exponential backoff starting at AI_JOB_RETRY_DELAY_SECONDS;
+# jobs held by a worker for longer than AI_JOB_STALE_AFTER_SECONDS are
+# considered abandoned and handed to another worker.
+AI_WORKER_CONCURRENCY = int(os.getenv("AI_WORKER_CONCURRENCY", "2"))
+AI_WORKER_POLL_SECONDS = float(os.getenv("AI_WORKER_POLL_SECONDS", "1.0"))
+AI_JOB_MAX_ATTEMPTS = int(os.getenv("AI_JOB_MAX_ATTEMPTS", "3"))
+AI_JOB_RETRY_DELAY_SECONDS = int(os.getenv("AI_JOB_RETRY_DELAY_SECONDS", "30"))
+AI_JOB_STALE_AFTER_SECONDS = int(os.getenv("AI_JOB_STALE_AFTER_SECONDS", "900"))
+
+# Report PDFs are rendered off the request path (`python manage.py
+# render_reports`) in batches of REPORT_RENDER_BATCH_SIZE. A report held for
+# longer than REPORT_RENDER_LOCK_SECONDS may be taken over; a download that
+# finds its report being rendered elsewhere is answered 202 with Retry-After.
+REPORT_RENDER_BATCH_SIZE = int(os.getenv("REPORT_RENDER_BATCH_SIZE", "16"))
+REPORT_RENDER_CONCURRENCY = int(os.getenv("REPORT_RENDER_CONCURRENCY", "2"))
+REPORT_RENDER_POLL_SECONDS = float(os.getenv("REPORT_RENDER_POLL_SECONDS", "2.0"))
+REPORT_RENDER_LOCK_SECONDS = int(os.getenv("REPORT_RENDER_LOCK_SECONDS", "60"))
+
+# Chunked scan uploads: partial files live in UPLOAD_TMP_DIR until the last
+# chunk arrives. Each PUT may carry at most UPLOAD_CHUNK_MAX_BYTES.
+UPLOAD_TMP_DIR = os.getenv("UPLOAD_TMP_DIR", os.path.join(BASE_DIR, "cache", "uploads"))
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(2 * 1024 ** 3)))
+UPLOAD_CHUNK_MAX_BYTES = int(os.getenv("UPLOAD_CHUNK_MAX_BYTES", str(8 * 1024 ** 2)))
+
+# File downloads (reports, scans, heatmaps). Set DOWNLOAD_ACCEL_REDIRECT_PREFIX
+# to an nginx `internal` location aliased to MEDIA_ROOT, or
+# DOWNLOAD_SENDFILE_HEADER (e.g. "X-Sendfile") for Apache/lighttpd, to let
+# the web server send the bytes after Django has checked access.
+DOWNLOAD_ACCEL_REDIRECT_PREFIX = os.getenv("DOWNLOAD_ACCEL_REDIRECT_PREFIX", "")
+DOWNLOAD_SENDFILE_HEADER = os.getenv("DOWNLOAD_SENDFILE_HEADER", "")
+DOWNLOAD_CACHE_SECONDS = int(os.getenv("DOWNLOAD_CACHE_SECONDS", "300"))
+
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/6.0/howto/deployment/checklist/
 
@@ -40,6 +104,8 @@ CORS_ALLOWED_ORIGINS = [
 
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True 
+# List endpoints link their next page from this header (core.pagination)
+CORS_EXPOSE_HEADERS = ["Link"]
 
 AUTH_USER_MODEL = 'core.User'
 
@@ -111,13 +177,116 @@ REST_FRAMEWORK = {
     ],
     
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'core.authentication.CachedJWTAuthentication',
     ),
 }
 
+# Authenticated users (with their role profile) are kept in a per-process
+# LRU of AUTH_USER_CACHE_SIZE entries for AUTH_USER_CACHE_SECONDS; changes
+# made by other processes become visible once an entry expires.
+AUTH_USER_CACHE_SIZE = int(os.getenv("AUTH_USER_CACHE_SIZE", "4096"))
+AUTH_USER_CACHE_SECONDS = int(os.getenv("AUTH_USER_CACHE_SECONDS", "30"))
+
+# List endpoints are cursor-paginated; clients may ask for up to
+# LIST_MAX_PAGE_SIZE rows with ?page_size=.
+LIST_PAGE_SIZE = int(os.getenv("LIST_PAGE_SIZE", "50"))
+LIST_MAX_PAGE_SIZE = int(os.getenv("LIST_MAX_PAGE_SIZE", "200"))
+
+# Doctor work queue: a claim not acted on within REFERRAL_CLAIM_TTL_SECONDS
+# goes back to the queue; one request claims at most REFERRAL_CLAIM_MAX cases.
+REFERRAL_CLAIM_TTL_SECONDS = int(os.getenv("REFERRAL_CLAIM_TTL_SECONDS", "1800"))
+REFERRAL_CLAIM_MAX = int(os.getenv("REFERRAL_CLAIM_MAX", "20"))
+
+# Refresh tokens are rotated on use and revoked on logout. Revoked JTIs are
+# kept in RevokedToken until they expire (`python manage.py
+# prune_revoked_tokens` deletes the rest) and mirrored in a per-process Bloom
+# filter sized for TOKEN_DENYLIST_BLOOM_CAPACITY entries, which picks up
+# other processes' revocations every TOKEN_DENYLIST_SYNC_SECONDS. For
+# TOKEN_REFRESH_GRACE_SECONDS after a rotation the old refresh token yields
+# the same successor, so parallel refreshes from one client all succeed.
+# The successor is kept in the default cache, so with several processes the
+# grace window needs REDIS_URL or CACHE_DIR; on the per-process default a
+# parallel refresh that lands on another worker gets 401.
+TOKEN_DENYLIST_BLOOM_CAPACITY = int(os.getenv("TOKEN_DENYLIST_BLOOM_CAPACITY", "1000000"))
+TOKEN_DENYLIST_BLOOM_ERROR_RATE = float(os.getenv("TOKEN_DENYLIST_BLOOM_ERROR_RATE", "0.001"))
+TOKEN_DENYLIST_SYNC_SECONDS = float(os.getenv("TOKEN_DENYLIST_SYNC_SECONDS", "5"))
+TOKEN_DENYLIST_REBUILD_SECONDS = float(os.getenv("TOKEN_DENYLIST_REBUILD_SECONDS", "3600"))
+TOKEN_REFRESH_GRACE_SECONDS = int(os.getenv("TOKEN_REFRESH_GRACE_SECONDS", "30"))
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=24),
 }
+# Password hashing: PASSWORD_HASHER picks the hasher for new and re-hashed
+# passwords ("argon2" needs argon2-cffi, "bcrypt" needs bcrypt). The others
+# stay listed so existing hashes still verify; Django upgrades a stored hash
+# to the preferred hasher and work factors on the user's next login.
+PASSWORD_HASHER = os.getenv("PASSWORD_HASHER", "pbkdf2")
+_PASSWORD_HASHERS = {
+    "argon2": "core.hashers.Argon2PasswordHasher",
+    "bcrypt": "core.hashers.BCryptSHA256PasswordHasher",
+    "pbkdf2": "core.hashers.PBKDF2PasswordHasher",
+}
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHER]] + [
+    path for name, path in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER
+]
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "2"))
+ARGON2_MEMORY_COST_KIB = int(os.getenv("ARGON2_MEMORY_COST_KIB", "19456"))
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "1"))
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PBKDF2_ITERATIONS = int(os.getenv("PBKDF2_ITERATIONS", "1200000"))
+
+# Login attempts are rate-limited before any password is hashed: each phone
+# number and each client IP has a token bucket of *_BURST attempts refilled
+# at *_PER_MINUTE, kept in the default cache.
+LOGIN_PHONE_BURST = int(os.getenv("LOGIN_PHONE_BURST", "5"))
+LOGIN_PHONE_PER_MINUTE = float(os.getenv("LOGIN_PHONE_PER_MINUTE", "5"))
+LOGIN_IP_BURST = int(os.getenv("LOGIN_IP_BURST", "50"))
+LOGIN_IP_PER_MINUTE = float(os.getenv("LOGIN_IP_PER_MINUTE", "60"))
+
+# Number of reverse proxies (e.g. nginx) in front of Django. With one or
+# more, the client IP is read from X-Forwarded-For instead of REMOTE_ADDR,
+# which would otherwise be the proxy's address for every request.
+TRUSTED_PROXY_COUNT = int(os.getenv("TRUSTED_PROXY_COUNT", "0"))
+
+# Shared cache for rate limits and API responses. Without REDIS_URL (or
+# CACHE_DIR, a file cache for single-host setups) each process has its own
+# in-memory cache.
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+        }
+    }
+elif os.getenv("CACHE_DIR"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.getenv("CACHE_DIR"),
+        }
+    }
+
+# Patient profile and test responses are cached per user for up to
+# RESPONSE_CACHE_SECONDS; saves of the underlying rows invalidate them sooner.
+# Invalidation only works through a shared cache: with the per-process
+# default, a save in the AI worker or another web worker would not reach
+# this process's cached responses, so response caching is off without one.
+RESPONSE_CACHE_SECONDS = (
+    int(os.getenv("RESPONSE_CACHE_SECONDS", "300"))
+    if os.getenv("REDIS_URL") or os.getenv("CACHE_DIR")
+    else 0
+)
+
+# Server-sent events (/api/events/, needs the ASGI server): each open stream
+# buffers up to EVENT_STREAM_QUEUE_SIZE undelivered events and gets a
+# keep-alive comment after EVENT_STREAM_HEARTBEAT_SECONDS of silence.
+EVENT_STREAM_QUEUE_SIZE = int(os.getenv("EVENT_STREAM_QUEUE_SIZE", "100"))
+EVENT_STREAM_HEARTBEAT_SECONDS = float(os.getenv("EVENT_STREAM_HEARTBEAT_SECONDS", "15"))
+EVENT_STREAM_RETRY_MS = int(os.getenv("EVENT_STREAM_RETRY_MS", "3000"))
+# Browsers open a stream with a ticket from /api/events/ticket/ in the URL;
+# it expires EVENT_STREAM_TICKET_SECONDS after being issued.
+EVENT_STREAM_TICKET_SECONDS = int(os.getenv("EVENT_STREAM_TICKET_SECONDS", "60"))
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -0,0 +1,153 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken, Token
+
+from core.models import User
+from core.revocation import is_revoked
+
+
+PROFILE_FIELDS = {
+    "PATIENT": "patient_profile",
+    "DOCTOR": "doctor_profile",
+    "PRACTITIONER": "practitioner_profile",
+}
+
+
+def profile_of(user):
+    """The role's profile of ``user``, or None if it has not been created."""
+    field = PROFILE_FIELDS.get(user.role)
+    return getattr(user, field, None) if field else None
+
+
+class UserCache:
+    """
+    Small thread-safe LRU of authenticated users (with their profile
+    loaded), each entry valid for ``ttl`` seconds. Lookups return a copy,
+    so a view modifying ``request.user`` never touches the cached object.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires, user = entry
+            if expires < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+        return copy.deepcopy(user)
+
+    def set(self, user_id, user):
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, user)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(settings.AUTH_USER_CACHE_SIZE, settings.AUTH_USER_CACHE_SECONDS)
+
+
+class RoleRefreshToken(RefreshToken):
+    """Refresh token (and derived access tokens) carrying ``role`` and ``profile_id``."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token["role"] = user.role
+        profile = profile_of(user)
+        if profile is not None:
+            token["profile_id"] = profile.pk
+        return token
+
+
+class StreamTicket(Token):
+    """
+    Short-lived token that only opens an event stream. EventSource cannot
+    set headers, so it travels in the URL (and into access logs) instead
+    of the access token, which other endpoints reject it in place of.
+    """
+
+    token_type = "stream"
+    lifetime = timedelta(seconds=settings.EVENT_STREAM_TICKET_SECONDS)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the user, with the profile named by the
+    token's ``role`` claim already joined in, from ``user_cache``. On a hit
+    authentication, role permissions and ``request.user.<role>_profile``
+    cost no queries, and so does checking the token against the revocation
+    denylist. Saving or deleting a user or profile drops its entry in this
+    process (core.signals); other processes see the change once their entry
+    expires after AUTH_USER_CACHE_SECONDS.
+    """
+
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        if is_revoked(validated_token):
+            raise InvalidToken(_("Token has been revoked"))
+        return validated_token
+
+    def get_user(self, validated_token):
+        try:
+            user_id = str(validated_token[api_settings.USER_ID_CLAIM])
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = user_cache.get(user_id)
+        if user is None:
+            role = validated_token.get("role")
+            related = [PROFILE_FIELDS[role]] if role in PROFILE_FIELDS else list(PROFILE_FIELDS.values())
+            try:
+                user = User.objects.select_related(*related).get(
+                    **{api_settings.USER_ID_FIELD: user_id}
+                )
+            except User.DoesNotExist:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            user_cache.set(user_id, user)
+            user = copy.deepcopy(user)
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return user
+
+
+class OptionalJWTAuthentication(CachedJWTAuthentication):
+    """
+    For endpoints that must also work with an expired or revoked access
+    token (logout): such a token counts as no credentials instead of 401.
+    """
+
+    def authenticate(self, request):
+        try:
+            return super().authenticate(request)
+        except (InvalidToken, AuthenticationFailed):
+            return None
@@ -0,0 +1,138 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.http import http_date, quote_etag
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+from core.storage import content_hash
+
+
+RANGE_HEADER = re.compile(r"^bytes=(\d*)-(\d*)$")
+STREAM_BLOCK_SIZE = 64 * 1024
+
+
+def file_etag(field_file, stat):
+    """Strong ETag from the content hash, or size and mtime for legacy names."""
+    digest = content_hash(field_file.name)
+    if digest is None:
+        digest = f"{stat.st_size:x}-{stat.st_mtime_ns:x}"
+    return quote_etag(digest)
+
+
+def parse_range(header, size):
+    """
+    (start, end) inclusive for a single ``bytes=`` range, None to serve the
+    whole file, or ValueError if the range cannot be satisfied. Multiple
+    ranges are answered with the full file.
+    """
+    match = RANGE_HEADER.match(header.strip()) if header else None
+    if match is None:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the final N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError("Empty suffix range")
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError("Range not satisfiable")
+    return start, end
+
+
+def _read_range(path, start, end):
+    remaining = end - start + 1
+    with open(path, "rb") as f:
+        f.seek(start)
+        while remaining > 0:
+            block = f.read(min(STREAM_BLOCK_SIZE, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            yield block
+
+
+def _if_range_matches(request, etag, last_modified):
+    """A Range only applies if If-Range (when sent) still names this version."""
+    if_range = request.headers.get("If-Range")
+    if not if_range:
+        return True
+    if if_range.startswith(('"', "W/")):
+        return if_range == etag
+    return if_range == last_modified
+
+
+def _offloaded(field_file, path):
+    """Let the front-end server send the file, if configured."""
+    if settings.DOWNLOAD_ACCEL_REDIRECT_PREFIX:
+        response = HttpResponse()
+        response["X-Accel-Redirect"] = (
+            settings.DOWNLOAD_ACCEL_REDIRECT_PREFIX.rstrip("/") + "/" + quote(field_file.name)
+        )
+        return response
+    if settings.DOWNLOAD_SENDFILE_HEADER:
+        response = HttpResponse()
+        response[settings.DOWNLOAD_SENDFILE_HEADER] = path
+        return response
+    return None
+
+
+def serve_file(request, field_file, filename=None, as_attachment=False):
+    """
+    Response for a stored file with ETag/Last-Modified revalidation,
+    single byte ranges and private cache headers.
+
+    With DOWNLOAD_ACCEL_REDIRECT_PREFIX (nginx) or DOWNLOAD_SENDFILE_HEADER
+    (Apache/lighttpd) set, Django only checks access and validators and the
+    web server sends the bytes, ranges included. Otherwise full responses go
+    through FileResponse, which uses the server's sendfile file wrapper.
+    """
+    path = field_file.path
+    stat = os.stat(path)
+    etag = file_etag(field_file, stat)
+    last_modified = http_date(stat.st_mtime)
+
+    # 304 / 412 before touching the file
+    response = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if response is None:
+        response = _offloaded(field_file, path)
+
+    if response is None:
+        byte_range = None
+        if _if_range_matches(request, etag, last_modified):
+            try:
+                byte_range = parse_range(request.headers.get("Range"), stat.st_size)
+            except ValueError:
+                response = HttpResponse(status=416)
+                response["Content-Range"] = f"bytes */{stat.st_size}"
+
+        if response is None and byte_range is not None:
+            start, end = byte_range
+            response = StreamingHttpResponse(_read_range(path, start, end), status=206)
+            response["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+            response["Content-Length"] = str(end - start + 1)
+        elif response is None:
+            response = FileResponse(open(path, "rb"))
+
+    download_name = filename or os.path.basename(field_file.name)
+    if response.status_code in (200, 206):
+        content_type, _ = mimetypes.guess_type(download_name)
+        response["Content-Type"] = content_type or "application/octet-stream"
+        disposition = "attachment" if as_attachment else "inline"
+        response["Content-Disposition"] = f'{disposition}; filename="{download_name}"'
+
+    response["ETag"] = etag
+    response["Last-Modified"] = last_modified
+    response["Accept-Ranges"] = "bytes"
+    patch_cache_control(response, private=True, max_age=settings.DOWNLOAD_CACHE_SECONDS)
+    return response
@@ -0,0 +1,182 @@
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+
+try:
+    # The LISTEN connection needs psycopg 3's async API, which psycopg2 lacks
+    import psycopg
+    from psycopg.conninfo import make_conninfo
+except ImportError:
+    psycopg = make_conninfo = None
+
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "swasthya_events"
+
+
+class Broker:
+    """
+    In-process fan-out of events to the event streams open in this process,
+    by user id. Each stream owns a bounded queue; if a client stops reading
+    and its queue fills up, further events for it are dropped.
+    """
+
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id):
+        subscription = (asyncio.get_running_loop(), asyncio.Queue(settings.EVENT_STREAM_QUEUE_SIZE))
+        with self._lock:
+            self._subscribers[str(user_id)].add(subscription)
+        return subscription
+
+    def unsubscribe(self, user_id, subscription):
+        with self._lock:
+            streams = self._subscribers.get(str(user_id))
+            if streams is not None:
+                streams.discard(subscription)
+                if not streams:
+                    del self._subscribers[str(user_id)]
+
+    def dispatch(self, message):
+        with self._lock:
+            targets = [
+                subscription
+                for user_id in message["users"]
+                for subscription in self._subscribers.get(user_id, ())
+            ]
+        for loop, queue in targets:
+            loop.call_soon_threadsafe(_offer, queue, message)
+
+    @property
+    def stream_count(self):
+        with self._lock:
+            return sum(len(streams) for streams in self._subscribers.values())
+
+
+def _offer(queue, message):
+    try:
+        queue.put_nowait(message)
+    except asyncio.QueueFull:
+        pass
+
+
+broker = Broker()
+
+
+def cross_process():
+    """Whether events travel through PostgreSQL NOTIFY to every process."""
+    return connection.vendor == "postgresql" and psycopg is not None
+
+
+def _conninfo():
+    db = settings.DATABASES["default"]
+    # OPTIONS may also hold Django-only keys (pool, isolation_level, ...),
+    # which libpq would reject
+    libpq_keys = {option.keyword.decode() for option in psycopg.pq.Conninfo.get_defaults()}
+    params = {key: value for key, value in db.get("OPTIONS", {}).items() if key in libpq_keys}
+    params.update(
+        dbname=db["NAME"],
+        user=db["USER"],
+        password=db["PASSWORD"],
+        host=db["HOST"],
+        port=db["PORT"],
+    )
+    return make_conninfo(**{key: value for key, value in params.items() if value not in (None, "")})
+
+
+class PostgresListener:
+    """
+    One LISTEN connection per process, feeding NOTIFYs from every worker
+    into ``broker``. Started by the first event stream and reconnected
+    with backoff; events sent while it is reconnecting are missed.
+    """
+
+    def __init__(self, broker):
+        self.broker = broker
+        self._task = None
+        self._warned = False
+
+    def ensure_started(self):
+        if not cross_process():
+            if connection.vendor == "postgresql" and not self._warned:
+                logger.warning(
+                    "psycopg 3 is not installed; event streams only receive events "
+                    "published by their own process"
+                )
+                self._warned = True
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._listen())
+
+    async def _listen(self):
+        delay = 1
+        while True:
+            try:
+                conn = await psycopg.AsyncConnection.connect(_conninfo(), autocommit=True)
+                async with conn:
+                    await conn.execute(f"LISTEN {CHANNEL}")
+                    delay = 1
+                    async for notify in conn.notifies():
+                        self.broker.dispatch(json.loads(notify.payload))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Event listener lost its connection; retrying in %ds", delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30)
+
+
+listener = PostgresListener(broker)
+
+
+def publish(user_ids, event, data):
+    """
+    Send ``event`` to the streams of ``user_ids`` in every process once the
+    current transaction commits (nothing is sent if it rolls back). On
+    PostgreSQL with psycopg 3 installed this is a NOTIFY, which the
+    database itself holds until commit; otherwise only this process's
+    streams are reached.
+    """
+    users = sorted({str(user_id) for user_id in user_ids if user_id})
+    if not users:
+        return
+
+    payload = json.dumps({"users": users, "event": event, "data": data}, cls=DjangoJSONEncoder)
+    if cross_process():
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [CHANNEL, payload])
+    else:
+        transaction.on_commit(lambda: broker.dispatch(json.loads(payload)))
+
+
+def format_event(message):
+    return f"event: {message['event']}\ndata: {json.dumps(message['data'])}\n\n"
+
+
+async def event_stream(user_id):
+    """Server-sent events for ``user_id``, with a comment line as heartbeat."""
+    listener.ensure_started()
+    subscription = broker.subscribe(user_id)
+    _, queue = subscription
+    try:
+        yield f"retry: {settings.EVENT_STREAM_RETRY_MS}\n\n"
+        while True:
+            try:
+                message = await asyncio.wait_for(
+                    queue.get(), timeout=settings.EVENT_STREAM_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield format_event(message)
+    finally:
+        broker.unsubscribe(user_id, subscription)
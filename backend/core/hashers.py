@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+# Work factors come from settings so they can be tuned per deployment.
+# Django re-hashes a password on the next successful login whenever its
+# stored parameters differ from these, or when it was made by a hasher
+# other than the first entry of PASSWORD_HASHERS.
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """Needs ``argon2-cffi``."""
+
+    @property
+    def time_cost(self):
+        return settings.ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.ARGON2_MEMORY_COST_KIB
+
+    @property
+    def parallelism(self):
+        return settings.ARGON2_PARALLELISM
+
+
+class BCryptSHA256PasswordHasher(hashers.BCryptSHA256PasswordHasher):
+    """Needs ``bcrypt``."""
+
+    @property
+    def rounds(self):
+        return settings.BCRYPT_ROUNDS
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+
+    @property
+    def iterations(self):
+        return settings.PBKDF2_ITERATIONS
+
@@ -0,0 +1,121 @@
+import asyncio
+import statistics
+import time
+from urllib.parse import urlparse
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, transaction
+
+from core.authentication import RoleRefreshToken
+from core.events import cross_process, publish
+from core.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Hold many idle event-stream connections open against a running ASGI "
+        "server, then publish events and report fan-out latency to all of them"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://127.0.0.1:8000/api/events/")
+        parser.add_argument("--phone", required=True, help="User the streams connect as")
+        parser.add_argument("--connections", type=int, default=2000)
+        parser.add_argument("--events", type=int, default=5)
+        parser.add_argument("--idle-seconds", type=float, default=30, help="Idle time before publishing")
+        parser.add_argument("--timeout", type=float, default=10)
+
+    def handle(self, *args, **options):
+        if not cross_process():
+            raise CommandError("Cross-process events need PostgreSQL LISTEN/NOTIFY and psycopg 3")
+        try:
+            user = User.objects.get(phone=options["phone"])
+        except User.DoesNotExist:
+            raise CommandError(f"No user with phone {options['phone']}")
+
+        token = str(RoleRefreshToken.for_user(user).access_token)
+        asyncio.run(self._run(user.pk, token, options))
+
+    async def _run(self, user_id, token, options):
+        url = urlparse(options["url"])
+        request = (
+            f"GET {url.path} HTTP/1.1\r\n"
+            f"Host: {url.netloc}\r\n"
+            f"Authorization: Bearer {token}\r\n"
+            "Accept: text/event-stream\r\n\r\n"
+        ).encode()
+
+        arrivals = {}
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(self._connect(url, request) for _ in range(options["connections"])),
+            return_exceptions=True,
+        )
+        streams = [r for r in results if not isinstance(r, BaseException)]
+        failed = len(results) - len(streams)
+        self.stdout.write(
+            f"Connected {len(streams)} stream(s) in {time.perf_counter() - start:.1f}s, {failed} failed"
+        )
+        if not streams:
+            return
+
+        readers = [
+            asyncio.create_task(self._read(reader, i, arrivals))
+            for i, (reader, _) in enumerate(streams)
+        ]
+        await asyncio.sleep(options["idle_seconds"])
+        alive = sum(not task.done() for task in readers)
+        self.stdout.write(f"Still open after {options['idle_seconds']:.0f}s idle: {alive}")
+
+        for seq in range(options["events"]):
+            sent = time.perf_counter()
+            await asyncio.to_thread(self._publish, user_id, seq)
+            deadline = sent + options["timeout"]
+            while time.perf_counter() < deadline:
+                received = [t for (_, s), t in arrivals.items() if s == seq]
+                if len(received) >= alive:
+                    break
+                await asyncio.sleep(0.01)
+
+            latencies = sorted(t - sent for (_, s), t in arrivals.items() if s == seq)
+            if latencies:
+                self.stdout.write(
+                    f"Event {seq}: delivered to {len(latencies)}/{alive}, "
+                    f"p50 {statistics.median(latencies) * 1000:.0f} ms, "
+                    f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.0f} ms, "
+                    f"last {latencies[-1] * 1000:.0f} ms"
+                )
+            else:
+                self.stdout.write(f"Event {seq}: not delivered within {options['timeout']:.0f}s")
+
+        for task in readers:
+            task.cancel()
+        for _, writer in streams:
+            writer.close()
+
+    async def _connect(self, url, request):
+        reader, writer = await asyncio.open_connection(url.hostname, url.port or 80)
+        writer.write(request)
+        await writer.drain()
+        status_line = await reader.readline()
+        if b" 200 " not in status_line:
+            writer.close()
+            raise ConnectionError(status_line.decode(errors="replace").strip())
+        return reader, writer
+
+    async def _read(self, reader, stream, arrivals):
+        marker = b'"seq": '
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            if line.startswith(b"data: ") and marker in line:
+                seq = int(line.split(marker, 1)[1].split(b"}", 1)[0])
+                arrivals[(stream, seq)] = time.perf_counter()
+
+    def _publish(self, user_id, seq):
+        try:
+            with transaction.atomic():
+                publish([user_id], "benchmark", {"seq": seq})
+        finally:
+            close_old_connections()
@@ -0,0 +1,141 @@
+import statistics
+import time
+from urllib.parse import parse_qs, urlparse
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.models import (
+    User,
+    PatientProfile,
+    DoctorProfile,
+    DiagnosticTest,
+    AIInferenceResult,
+    Appointment,
+    Referral,
+)
+from doctor.views import DoctorReferralListView
+from patient.views import (
+    PatientTestListView,
+    PatientAppointmentListView,
+    PatientReferralListView,
+)
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed N rows per user inside a rolled-back transaction and report "
+        "first-page latency, payload size and full-walk time of list endpoints"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--fields", default="id,status", help="Sparse fieldset to compare")
+
+    def handle(self, *args, **options):
+        try:
+            # Measure the queries and pagination, not response cache hits
+            with transaction.atomic(), override_settings(RESPONSE_CACHE_SECONDS=0):
+                patient, doctor = self._seed(options["rows"])
+                self._run(patient, doctor, options)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _seed(self, rows):
+        stamp = int(time.time())
+        patient_user = User.objects.create(
+            phone=f"b{stamp}"[:15], full_name="Benchmark Patient", role="PATIENT"
+        )
+        patient = PatientProfile.objects.create(user=patient_user, emergency_contact="0", address="-")
+        doctor_user = User.objects.create(
+            phone=f"d{stamp}"[:15], full_name="Benchmark Doctor", role="DOCTOR"
+        )
+        doctor = DoctorProfile.objects.create(
+            user=doctor_user,
+            specialization="GENERAL",
+            hospital_name="-",
+            registration_number=f"BENCH{stamp}",
+            years_of_experience=1,
+        )
+
+        tests = DiagnosticTest.objects.bulk_create(
+            DiagnosticTest(patient=patient, test_type="TB", status="AI_DONE") for _ in range(rows)
+        )
+        AIInferenceResult.objects.bulk_create(
+            AIInferenceResult(test=test, model_name="TB", risk_score=0.5, risk_level="LOW", confidence=0.5)
+            for test in tests
+        )
+        Referral.objects.bulk_create(
+            Referral(test=test, referred_to=doctor, urgency="ROUTINE", reason="-") for test in tests
+        )
+        now = timezone.now()
+        Appointment.objects.bulk_create(
+            Appointment(
+                patient=patient,
+                doctor=doctor,
+                appointment_type="CONSULTATION",
+                mode="ONLINE",
+                scheduled_time=now,
+                status="BOOKED",
+            )
+            for _ in range(rows)
+        )
+        self.stdout.write(f"Seeded {rows} tests, referrals and appointments")
+        return patient, doctor
+
+    def _run(self, patient, doctor, options):
+        endpoints = [
+            ("patient tests", PatientTestListView, patient.user),
+            ("patient appointments", PatientAppointmentListView, patient.user),
+            ("patient referrals", PatientReferralListView, patient.user),
+            ("doctor referrals", DoctorReferralListView, doctor.user),
+        ]
+
+        self.stdout.write(
+            f"{'endpoint':<22} {'page ms':>8} {'page KB':>8} {'fields KB':>9} {'pages':>6} {'walk s':>7}"
+        )
+        for label, view, user in endpoints:
+            timings = []
+            for _ in range(options["repeat"]):
+                start = time.perf_counter()
+                response = self._get(view, user, {})
+                timings.append(time.perf_counter() - start)
+            page_kb = len(response.content) / 1024
+
+            sparse_kb = len(self._get(view, user, {"fields": options["fields"]}).content) / 1024
+
+            pages, start = 0, time.perf_counter()
+            params = {"page_size": 200}
+            while params is not None:
+                response = self._get(view, user, params)
+                pages += 1
+                params = self._next_params(response)
+            walk = time.perf_counter() - start
+
+            self.stdout.write(
+                f"{label:<22} {1000 * statistics.median(timings):>8.1f} {page_kb:>8.1f} "
+                f"{sparse_kb:>9.1f} {pages:>6} {walk:>7.2f}"
+            )
+
+    def _get(self, view, user, params):
+        request = APIRequestFactory().get("/", params)
+        force_authenticate(request, user=user)
+        response = view.as_view()(request)
+        response.render()
+        return response
+
+    def _next_params(self, response):
+        for link in response.get("Link", "").split(","):
+            if 'rel="next"' in link:
+                url = link.split(";")[0].strip()[1:-1]
+                return {key: values[0] for key, values in parse_qs(urlparse(url).query).items()}
+        return None
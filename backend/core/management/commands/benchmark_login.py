@@ -0,0 +1,89 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import override_settings
+from django.utils.module_loading import import_string
+from rest_framework.test import APIRequestFactory
+
+from core.models import User
+from core.views import LoginView
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Successful logins/sec on one core for each configured password "
+        "hasher, and the cost of a throttled attempt"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--logins", type=int, default=20)
+        parser.add_argument("--phone", default="0000000000", help="Phone number of the throwaway user")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'hasher':<16} {'params':<32} {'ms/login':>9} {'logins/s':>9}")
+        for path in settings.PASSWORD_HASHERS:
+            hasher = import_string(path)()
+            if hasher.library:
+                try:
+                    hasher._load_library()
+                except ValueError as exc:
+                    self.stdout.write(f"{hasher.algorithm:<16} skipped: {exc}")
+                    continue
+
+            with override_settings(PASSWORD_HASHERS=[path]):
+                elapsed = self._time_logins(options["phone"], options["logins"], allow=True)
+                params = self._params(make_password("benchmark"))
+
+            per_login = elapsed / options["logins"]
+            self.stdout.write(
+                f"{hasher.algorithm:<16} {params:<32} {per_login * 1000:>9.1f} {1 / per_login:>9.1f}"
+            )
+
+        elapsed = self._time_logins(options["phone"], options["logins"], allow=False)
+        self.stdout.write(f"{'throttled':<16} {'':<32} {elapsed / options['logins'] * 1000:>9.2f}")
+
+    def _params(self, encoded):
+        # algorithm$params...$salt$hash: drop the salt and hash
+        return "$".join(encoded.split("$")[1:-2])[:32]
+
+    def _time_logins(self, phone, logins, allow):
+        burst = logins + 1 if allow else 0
+        factory = APIRequestFactory()
+        view = LoginView.as_view()
+        expected = 200 if allow else 429
+        buckets = ["ratelimit:login-ip:127.0.0.1", f"ratelimit:login-phone:{phone}"]
+
+        try:
+            with transaction.atomic(), override_settings(
+                LOGIN_PHONE_BURST=burst, LOGIN_IP_BURST=burst
+            ):
+                User.objects.create_user(
+                    phone=phone, password="benchmark", full_name="Benchmark", role="PATIENT"
+                )
+                cache.delete_many(buckets)
+
+                start = time.perf_counter()
+                for _ in range(logins):
+                    request = factory.post(
+                        "/", {"phone": phone, "password": "benchmark"},
+                        format="json", REMOTE_ADDR="127.0.0.1"
+                    )
+                    response = view(request)
+                    if response.status_code != expected:
+                        raise CommandError(f"Login returned {response.status_code}")
+                elapsed = time.perf_counter() - start
+                raise Rollback
+        except Rollback:
+            pass
+        finally:
+            cache.delete_many(buckets)
+
+        return elapsed
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from core.models import content_storage
+from core.storage import collect_garbage
+
+
+class Command(BaseCommand):
+    help = "Fix content-addressed blob reference counts and delete unreferenced blobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace-seconds",
+            type=int,
+            default=3600,
+            help="Keep blobs younger than this (uploads may not be committed yet)",
+        )
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        stats = collect_garbage(
+            content_storage,
+            grace_seconds=options["grace_seconds"],
+            dry_run=options["dry_run"],
+        )
+
+        prefix = "Would delete" if options["dry_run"] else "Deleted"
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix} {stats['deleted']} blob(s), "
+            f"{stats['freed_bytes'] / (1024 * 1024):.1f} MB; "
+            f"{stats['recounted']} refcount(s) corrected."
+        ))
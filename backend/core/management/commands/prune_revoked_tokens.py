@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.revocation import prune_expired
+
+
+class Command(BaseCommand):
+    help = "Delete denylist entries for tokens that have expired"
+
+    def handle(self, *args, **options):
+        deleted = prune_expired()
+        self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} expired token(s)."))
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_alter_diagnostictest_raw_image'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='diagnostictest',
+            name='status',
+            field=models.CharField(choices=[('UPLOADED', 'Uploaded'), ('QUEUED', 'Queued for AI'), ('RUNNING', 'AI Running'), ('AI_FAILED', 'AI Failed'), ('AI_DONE', 'AI Processed'), ('REFERRED', 'Referred'), ('CLOSED', 'Closed')], max_length=20),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-18 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_alter_diagnostictest_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aiinferenceresult',
+            name='model_version',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 6.0 on 2026-10-18 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_aiinferenceresult_model_version'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='diagnosticreport',
+            name='report_pdf',
+            field=models.FileField(blank=True, upload_to='reports/'),
+        ),
+        # Reports that exist already were rendered synchronously.
+        migrations.AddField(
+            model_name='diagnosticreport',
+            name='status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('RENDERING', 'Rendering'), ('READY', 'Ready'), ('FAILED', 'Failed')], default='READY', max_length=20),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name='diagnosticreport',
+            name='status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('RENDERING', 'Rendering'), ('READY', 'Ready'), ('FAILED', 'Failed')], default='PENDING', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='diagnosticreport',
+            name='revision',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='diagnosticreport',
+            name='render_started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='diagnosticreport',
+            name='rendered_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='diagnosticreport',
+            index=models.Index(fields=['status', 'render_started_at'], name='report_status_started_idx'),
+        ),
+    ]
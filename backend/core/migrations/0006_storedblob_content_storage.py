@@ -0,0 +1,35 @@
+# Generated by Django 6.0 on 2026-10-18 14:20
+
+import core.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_diagnosticreport_render_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('sha256', models.CharField(db_index=True, max_length=64)),
+                ('size', models.BigIntegerField()),
+                ('refcount', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='diagnostictest',
+            name='raw_image',
+            field=models.FileField(storage=core.storage.ContentAddressedStorage(), upload_to='diagnostic_images/'),
+        ),
+        migrations.AlterField(
+            model_name='aiinferenceresult',
+            name='heatmap_image',
+            field=models.ImageField(blank=True, null=True, storage=core.storage.ContentAddressedStorage(), upload_to='heatmaps/'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-10-18 16:05
+
+import core.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_storedblob_content_storage'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='diagnosticreport',
+            name='report_pdf',
+            field=models.FileField(blank=True, storage=core.storage.ContentAddressedStorage(), upload_to='reports/'),
+        ),
+    ]
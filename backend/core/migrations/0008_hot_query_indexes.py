@@ -0,0 +1,29 @@
+# Generated by Django 6.0 on 2026-10-18 17:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_alter_diagnosticreport_report_pdf'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='diagnostictest',
+            index=models.Index(fields=['patient', '-test_date'], name='test_patient_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='referral',
+            index=models.Index(fields=['referred_to', 'status', '-created_at'], name='referral_doctor_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='referral',
+            index=models.Index(condition=models.Q(('status', 'PENDING')), fields=['referred_to', '-created_at'], name='referral_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='appointment',
+            index=models.Index(fields=['patient', '-scheduled_time'], name='appointment_patient_time_idx'),
+        ),
+    ]
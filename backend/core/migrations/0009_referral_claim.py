@@ -0,0 +1,28 @@
+# Generated by Django 6.0 on 2026-10-18 18:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='referral',
+            name='claimed_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='claimed_referrals', to='core.doctorprofile'),
+        ),
+        migrations.AddField(
+            model_name='referral',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='referral',
+            index=models.Index(condition=models.Q(('status', 'PENDING')), fields=['claimed_by', 'claimed_at'], name='referral_claim_idx'),
+        ),
+    ]
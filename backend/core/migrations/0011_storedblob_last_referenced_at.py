@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-10-18 21:10
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_revokedtoken'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='storedblob',
+            name='last_referenced_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0 on 2026-10-18 22:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_storedblob_last_referenced_at'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='referral',
+            name='referral_doctor_status_idx',
+        ),
+        migrations.AddIndex(
+            model_name='referral',
+            index=models.Index(fields=['test', '-created_at'], name='referral_test_created_idx'),
+        ),
+    ]
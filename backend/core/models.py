@@ -1,7 +1,12 @@
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager
 from django.db import models
+from django.utils import timezone
 import uuid
 
+from core.storage import ContentAddressedStorage
+
+content_storage = ContentAddressedStorage()
+
 class UserManager(BaseUserManager):
     def create_user(self, phone, password=None, **extra_fields):
         if not phone:
@@ -129,6 +134,9 @@ class DiagnosticTest(models.Model):
 
     STATUS_CHOICES = (
         ('UPLOADED', 'Uploaded'),
+        ('QUEUED', 'Queued for AI'),
+        ('RUNNING', 'AI Running'),
+        ('AI_FAILED', 'AI Failed'),
         ('AI_DONE', 'AI Processed'),
         ('REFERRED', 'Referred'),
         ('CLOSED', 'Closed'),
@@ -140,13 +148,19 @@ class DiagnosticTest(models.Model):
     practitioner = models.ForeignKey(PractitionerProfile, on_delete=models.SET_NULL, null=True)
 
     test_type = models.CharField(max_length=50, choices=TEST_TYPE_CHOICES)
-    raw_image = models.FileField(upload_to='diagnostic_images/')
+    raw_image = models.FileField(upload_to='diagnostic_images/', storage=content_storage)
 
     test_date = models.DateTimeField(auto_now_add=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES)
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Patient test history, newest first (cursor-paginated)
+            models.Index(fields=['patient', '-test_date'], name='test_patient_date_idx'),
+        ]
+
     def __str__(self):
         return f"{self.test_type} Test - {self.patient.user.full_name}"
 
@@ -178,11 +192,12 @@ class AIInferenceResult(models.Model):
     test = models.OneToOneField(DiagnosticTest, on_delete=models.CASCADE)
 
     model_name = models.CharField(max_length=100)
+    model_version = models.CharField(max_length=100, blank=True, default='')
     risk_score = models.FloatField()
     risk_level = models.CharField(max_length=20, choices=RISK_LEVEL_CHOICES)
     confidence = models.FloatField()
 
-    heatmap_image = models.ImageField(upload_to='heatmaps/', null=True, blank=True)
+    heatmap_image = models.ImageField(upload_to='heatmaps/', storage=content_storage, null=True, blank=True)
 
     generated_at = models.DateTimeField(auto_now_add=True)
 
@@ -213,8 +228,32 @@ class Referral(models.Model):
 
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
 
+    # Work-queue claim; a claim older than REFERRAL_CLAIM_TTL_SECONDS is free again
+    claimed_by = models.ForeignKey(
+        DoctorProfile, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='claimed_referrals'
+    )
+    claimed_at = models.DateTimeField(null=True, blank=True)
+
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # A patient's referrals, reached through their tests, newest first
+            models.Index(fields=['test', '-created_at'], name='referral_test_created_idx'),
+            models.Index(
+                fields=['claimed_by', 'claimed_at'],
+                name='referral_claim_idx',
+                condition=models.Q(status='PENDING'),
+            ),
+            # The doctor work queue only ever reads pending referrals
+            models.Index(
+                fields=['referred_to', '-created_at'],
+                name='referral_pending_idx',
+                condition=models.Q(status='PENDING'),
+            ),
+        ]
+
     def __str__(self):
         return f"Referral - {self.urgency}"
 
@@ -248,18 +287,73 @@ class Appointment(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['patient', '-scheduled_time'], name='appointment_patient_time_idx'),
+        ]
+
     def __str__(self):
         return f"{self.appointment_type} - {self.scheduled_time}"
 
 
 class DiagnosticReport(models.Model):
+    STATUS_CHOICES = (
+        ('PENDING', 'Pending'),
+        ('RENDERING', 'Rendering'),
+        ('READY', 'Ready'),
+        ('FAILED', 'Failed'),
+    )
+
     test = models.OneToOneField(DiagnosticTest, on_delete=models.CASCADE)
 
-    report_pdf = models.FileField(upload_to='reports/')
+    report_pdf = models.FileField(upload_to='reports/', storage=content_storage, blank=True)
     final_risk_level = models.CharField(max_length=20)
     doctor_signed = models.BooleanField(default=False)
 
+    # Bumped whenever the report content changes; a render only becomes
+    # READY if no newer revision was requested while it was running.
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
+    revision = models.PositiveIntegerField(default=0)
+    render_started_at = models.DateTimeField(null=True, blank=True)
+    rendered_at = models.DateTimeField(null=True, blank=True)
+
     generated_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'render_started_at'], name='report_status_started_idx'),
+        ]
+
+    def __str__(self):
+        return f"Report for Test {self.test.id}"
+
+
+class StoredBlob(models.Model):
+    """A file in ContentAddressedStorage and how many fields point at it."""
+
+    name = models.CharField(max_length=255, unique=True)
+    sha256 = models.CharField(max_length=64, db_index=True)
+    size = models.BigIntegerField()
+    refcount = models.PositiveIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Set whenever a save adds a reference; garbage collection waits out its
+    # grace period from here, since the referencing row may not be committed yet
+    last_referenced_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.name} ({self.refcount} refs)"
+
+
+class RevokedToken(models.Model):
+    """
+    A refresh or access token that may no longer be used, by JTI. Rows are
+    only needed until the token would have expired anyway and are deleted
+    by ``manage.py prune_revoked_tokens``.
+    """
+    jti = models.UUIDField(primary_key=True)
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
     def __str__(self):
-        return f"Report for Test {self.test.id}"
\ No newline at end of file
+        return f"Revoked {self.jti}"
@@ -0,0 +1,39 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+
+
+class LinkHeaderCursorPagination(CursorPagination):
+    """
+    Keyset pagination that keeps list responses as plain JSON arrays and
+    advertises the neighbouring pages in an RFC 8288 ``Link`` header, so
+    existing clients keep working and simply see the first page.
+    """
+
+    page_size_query_param = "page_size"
+
+    def __init__(self, ordering):
+        self.ordering = ordering
+        self.page_size = settings.LIST_PAGE_SIZE
+        self.max_page_size = settings.LIST_MAX_PAGE_SIZE
+
+    def get_paginated_response(self, data):
+        links = [
+            f'<{url}>; rel="{rel}"'
+            for rel, url in (("next", self.get_next_link()), ("prev", self.get_previous_link()))
+            if url
+        ]
+        headers = {"Link": ", ".join(links)} if links else None
+        return Response(data, headers=headers)
+
+
+def paginated_response(request, queryset, serializer_class, ordering):
+    """
+    Serialize one cursor page of ``queryset`` ordered by ``ordering`` (an
+    indexed column; "-" for descending). Serializers get the request in
+    their context, which SparseFieldsetMixin reads ``fields=`` from.
+    """
+    paginator = LinkHeaderCursorPagination(ordering)
+    page = paginator.paginate_queryset(queryset, request)
+    serializer = serializer_class(page, many=True, context={"request": request})
+    return paginator.get_paginated_response(serializer.data)
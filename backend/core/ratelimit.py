@@ -0,0 +1,65 @@
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+class TokenBucket:
+    """
+    Token bucket kept in the Django cache: up to ``burst`` attempts at once,
+    refilled at ``per_minute``. The read-modify-write is not atomic across
+    processes, so a concurrent burst may get a few attempts more than
+    ``burst``; that is acceptable for throttling brute force.
+    """
+
+    def __init__(self, prefix, burst, per_minute):
+        self.prefix = prefix
+        self.burst = burst
+        self.rate = per_minute / 60.0
+
+    def _state(self, key):
+        cache_key = f"ratelimit:{self.prefix}:{key}"
+        now = time.time()
+        tokens, updated = cache.get(cache_key, (self.burst, now))
+        return cache_key, min(self.burst, tokens + (now - updated) * self.rate), now
+
+    def _wait(self, tokens):
+        if tokens >= 1:
+            return 0
+        return math.ceil((1 - tokens) / self.rate) if self.rate > 0 else 60
+
+    def retry_after(self, key):
+        """Seconds until ``key`` may take a token (0 if now), without consuming one."""
+        return self._wait(self._state(key)[1])
+
+    def take(self, key):
+        """Consume one token for ``key``; 0 if allowed, else seconds until the next token."""
+        cache_key, tokens, now = self._state(key)
+
+        if tokens < 1:
+            return self._wait(tokens)
+
+        # Keep the entry until the bucket would be full again
+        timeout = math.ceil((self.burst - tokens + 1) / self.rate) if self.rate > 0 else None
+        cache.set(cache_key, (tokens - 1, now), timeout)
+        return 0
+
+
+def client_ip(request):
+    """
+    The client's address as seen by the outermost of TRUSTED_PROXY_COUNT
+    reverse proxies. Each proxy appends the address it received the request
+    from to X-Forwarded-For, so entries further left are client-supplied
+    and are not trusted.
+    """
+    proxies = settings.TRUSTED_PROXY_COUNT
+    if proxies > 0:
+        forwarded = [
+            address.strip()
+            for address in request.META.get("HTTP_X_FORWARDED_FOR", "").split(",")
+            if address.strip()
+        ]
+        if forwarded:
+            return forwarded[-min(proxies, len(forwarded))]
+    return request.META.get("REMOTE_ADDR", "")
@@ -0,0 +1,90 @@
+import functools
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from rest_framework.response import Response
+
+
+def _version_key(patient_id):
+    return f"patient-data:{patient_id}"
+
+
+def data_version(patient_id):
+    """
+    Current version of everything cached for a patient. A missing version
+    starts from the clock, so a version evicted from the cache can never
+    come back as one that older entries were stored under.
+    """
+    key = _version_key(patient_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_versions(patient_ids):
+    """
+    Invalidate cached responses of ``patient_ids``: now, and again once the
+    current transaction commits, so a response rendered from the
+    not-yet-committed state in between is not served afterwards.
+    """
+    patient_ids = set(patient_ids)
+
+    def bump():
+        for patient_id in patient_ids:
+            try:
+                cache.incr(_version_key(patient_id))
+            except ValueError:
+                cache.set(_version_key(patient_id), time.time_ns(), None)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def cache_patient_response(view_method):
+    """
+    Cache a patient GET handler's successful responses per user and URL
+    (query string included) under the patient's data version, which the
+    signals in core.signals bump on every relevant save.
+
+    The ETag is derived from the version and URL alone, so a matching
+    If-None-Match gets 304 before the cache or the database is read.
+    Disabled when RESPONSE_CACHE_SECONDS is 0.
+    """
+
+    @functools.wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        if settings.RESPONSE_CACHE_SECONDS <= 0:
+            return view_method(self, request, *args, **kwargs)
+
+        version = data_version(request.user.patient_profile.pk)
+        path = request.get_full_path()
+        digest = hashlib.sha256(f"{request.user.pk}:{version}:{path}".encode()).hexdigest()[:32]
+        etag = quote_etag(digest)
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            key = f"response:{digest}"
+            cached = cache.get(key)
+            if cached is not None:
+                data, headers = cached
+                response = Response(data, headers=headers)
+            else:
+                response = view_method(self, request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+                headers = {name: response[name] for name in ("Link",) if response.has_header(name)}
+                cache.set(key, (response.data, headers), settings.RESPONSE_CACHE_SECONDS)
+
+        response["ETag"] = etag
+        # Clients must revalidate, which is what makes polling cheap
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    return wrapper
@@ -0,0 +1,216 @@
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+from core.bloom import BloomFilter
+from core.models import RevokedToken, User
+
+
+# Rows committed slightly out of revoked_at order are picked up by
+# re-reading this much before the last sync point.
+SYNC_OVERLAP = timedelta(seconds=5)
+
+
+def _jti(token_or_jti):
+    value = token_or_jti if isinstance(token_or_jti, str) else token_or_jti.get("jti")
+    try:
+        return uuid.UUID(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class Denylist:
+    """
+    Per-process Bloom filter of revoked JTIs in front of the RevokedToken
+    table. A JTI not in the filter is not revoked, so the common case needs
+    no query; a hit (or false positive) is confirmed against the table.
+
+    The filter is rebuilt from unexpired rows every
+    TOKEN_DENYLIST_REBUILD_SECONDS, which drops expired tokens, and picks up
+    tokens revoked by other processes every TOKEN_DENYLIST_SYNC_SECONDS.
+    One request does the reading, outside the lock; the others keep using
+    the current filter meanwhile, or the table while there is none yet.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._built_at = 0.0
+        self._checked_at = 0.0
+        self._synced_to = None
+        self._refreshing = False
+        # JTIs revoked in this process while a refresh is reading the table
+        self._added = []
+
+    def _rebuild(self):
+        now = timezone.now()
+        live = RevokedToken.objects.filter(expires_at__gt=now)
+        bloom = BloomFilter(
+            max(settings.TOKEN_DENYLIST_BLOOM_CAPACITY, live.count() * 2),
+            settings.TOKEN_DENYLIST_BLOOM_ERROR_RATE,
+        )
+        for jti in live.values_list("jti", flat=True).iterator(chunk_size=10000):
+            bloom.add(jti.hex)
+
+        with self._lock:
+            for jti in self._added:
+                bloom.add(jti)
+            self._bloom = bloom
+            self._synced_to = now
+            self._built_at = self._checked_at = time.monotonic()
+
+    def _sync(self):
+        now = timezone.now()
+        recent = RevokedToken.objects.filter(revoked_at__gte=self._synced_to - SYNC_OVERLAP)
+        jtis = [jti.hex for jti in recent.values_list("jti", flat=True).iterator()]
+
+        with self._lock:
+            for jti in jtis:
+                self._bloom.add(jti)
+            self._synced_to = now
+            self._checked_at = time.monotonic()
+
+    def _bloom_filter(self):
+        with self._lock:
+            if self._refreshing:
+                return self._bloom
+            elapsed = time.monotonic()
+            if self._bloom is None or elapsed - self._built_at >= settings.TOKEN_DENYLIST_REBUILD_SECONDS:
+                refresh = self._rebuild
+            elif elapsed - self._checked_at >= settings.TOKEN_DENYLIST_SYNC_SECONDS:
+                refresh = self._sync
+            else:
+                return self._bloom
+            self._refreshing = True
+            self._added = []
+
+        try:
+            refresh()
+        finally:
+            with self._lock:
+                self._refreshing = False
+                self._added = []
+        return self._bloom
+
+    def add(self, jti):
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti.hex)
+            if self._refreshing:
+                self._added.append(jti.hex)
+
+    def __contains__(self, jti):
+        bloom = self._bloom_filter()
+        if bloom is not None and jti.hex not in bloom:
+            return False
+        return RevokedToken.objects.filter(jti=jti).exists()
+
+    def reset(self):
+        with self._lock:
+            self._bloom = None
+
+
+denylist = Denylist()
+
+
+def is_revoked(token):
+    jti = _jti(token)
+    return jti is not None and jti in denylist
+
+
+def revoke(token):
+    """
+    Deny ``token`` until it expires. Returns False if it was already
+    revoked, which makes the insert the atomic "use once" check for rotation.
+    """
+    jti = _jti(token)
+    if jti is None:
+        return False
+
+    expires_at = datetime.fromtimestamp(token["exp"], tz=dt_timezone.utc)
+    try:
+        with transaction.atomic():
+            RevokedToken.objects.create(jti=jti, expires_at=expires_at)
+    except IntegrityError:
+        return False
+
+    denylist.add(jti)
+    return True
+
+
+def _successor_key(jti):
+    return f"refresh-successor:{jti}"
+
+
+def _live_successor(token_class, rotated):
+    """
+    The unrevoked end of the rotation chain starting at ``rotated``. A
+    successor that has been revoked without being rotated in turn was
+    logged out, which ends the grace window for its predecessors too.
+    """
+    while rotated is not None:
+        successor = token_class(rotated)
+        if not is_revoked(successor):
+            return successor
+        rotated = cache.get(_successor_key(_jti(successor)))
+    raise TokenError("Token has been revoked")
+
+
+def rotate(refresh):
+    """
+    Exchange a validated refresh token for a new one with the same claims.
+    The old token is revoked in the same step, so it can be used once: a
+    replayed refresh token raises TokenError.
+
+    Within TOKEN_REFRESH_GRACE_SECONDS of a rotation, presenting the old
+    token again returns the same successor, so concurrent refreshes by one
+    client (e.g. every request of a page that just reloaded) all succeed,
+    unless the session has since been logged out. The successor is shared
+    through the default cache, so the grace window only spans processes
+    when that cache is shared.
+    """
+    jti = _jti(refresh)
+    if jti is None:
+        raise TokenError("Token has no valid jti")
+    key = _successor_key(jti)
+
+    rotated = cache.get(key)
+    if rotated is not None:
+        return _live_successor(refresh.__class__, rotated)
+
+    # Known-revoked tokens are refused without attempting the insert
+    if is_revoked(refresh):
+        raise TokenError("Token has been revoked")
+
+    user_id = refresh.get(api_settings.USER_ID_CLAIM)
+    if not User.objects.filter(**{api_settings.USER_ID_FIELD: user_id, "is_active": True}).exists():
+        raise TokenError("User is inactive or deleted")
+
+    successor = refresh.__class__(str(refresh))
+    successor.set_jti()
+    successor.set_exp()
+    successor.set_iat()
+
+    # Publish the successor before revoking, so a concurrent refresh that
+    # loses the insert below finds it
+    if not cache.add(key, str(successor), settings.TOKEN_REFRESH_GRACE_SECONDS):
+        return _live_successor(refresh.__class__, cache.get(key))
+
+    if not revoke(refresh):
+        cache.delete(key)
+        raise TokenError("Token has been revoked")
+    return successor
+
+
+def prune_expired():
+    """Delete rows for tokens that have expired; they can no longer be presented."""
+    deleted, _ = RevokedToken.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted
@@ -28,3 +28,24 @@ class RegisterSerializer(serializers.ModelSerializer):
 
         return user
 
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin honouring ``?fields=a,b,c`` on the request in the
+    context: only the listed fields are rendered. Unknown names are ignored.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        request = self.context.get("request")
+        requested = request.query_params.get("fields") if request is not None else None
+        if not requested:
+            return
+
+        keep = {name.strip() for name in requested.split(",")}
+        if not keep & set(self.fields):
+            return
+        for name in set(self.fields) - keep:
+            self.fields.pop(name)
@@ -0,0 +1,83 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.authentication import user_cache
+from core.events import publish
+from core.models import (
+    AIInferenceResult,
+    Appointment,
+    DiagnosticTest,
+    DoctorProfile,
+    PatientProfile,
+    PractitionerProfile,
+    Referral,
+    User,
+)
+from core.response_cache import bump_versions
+
+
+@receiver([post_save, post_delete], sender=User)
+def drop_cached_user(sender, instance, **kwargs):
+    user_cache.invalidate(instance.pk)
+    if instance.role == "PATIENT":
+        bump_versions(PatientProfile.objects.filter(user_id=instance.pk).values_list("pk", flat=True))
+
+
+@receiver([post_save, post_delete], sender=PatientProfile)
+@receiver([post_save, post_delete], sender=DoctorProfile)
+@receiver([post_save, post_delete], sender=PractitionerProfile)
+def drop_cached_profile_owner(sender, instance, **kwargs):
+    user_cache.invalidate(instance.user_id)
+
+
+# Cached patient responses (core.response_cache) are keyed by a per-patient
+# version; any change to data those responses show moves it on.
+
+@receiver([post_save, post_delete], sender=PatientProfile)
+def bump_profile_version(sender, instance, **kwargs):
+    bump_versions([instance.pk])
+
+
+@receiver([post_save, post_delete], sender=DiagnosticTest)
+@receiver([post_save, post_delete], sender=Appointment)
+def bump_patient_version(sender, instance, **kwargs):
+    bump_versions([instance.patient_id])
+
+
+@receiver([post_save, post_delete], sender=AIInferenceResult)
+@receiver([post_save, post_delete], sender=Referral)
+def bump_test_patient_version(sender, instance, **kwargs):
+    bump_versions(
+        DiagnosticTest.objects.filter(pk=instance.test_id).values_list("patient_id", flat=True)
+    )
+
+
+# Live updates for the event streams (core.events)
+
+@receiver(post_save, sender=DiagnosticTest)
+def publish_test_status(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and "status" not in update_fields:
+        return
+    users = DiagnosticTest.objects.filter(pk=instance.pk).values_list(
+        "patient__user_id",
+        "practitioner__user_id",
+        "referral__referred_to__user_id",
+        "referral__claimed_by__user_id",
+    ).first()
+    publish(users or (), "test.status", {"test_id": instance.pk, "status": instance.status})
+
+
+@receiver(post_save, sender=Referral)
+def publish_referral(sender, instance, **kwargs):
+    users = Referral.objects.filter(pk=instance.pk).values_list(
+        "test__patient__user_id",
+        "referred_by__user_id",
+        "referred_to__user_id",
+        "claimed_by__user_id",
+    ).first()
+    publish(users or (), "referral", {
+        "referral_id": instance.pk,
+        "test_id": instance.test_id,
+        "status": instance.status,
+        "urgency": instance.urgency,
+    })
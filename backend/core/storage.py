@@ -0,0 +1,216 @@
+import hashlib
+import os
+import re
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils.deconstruct import deconstructible
+
+
+SHA256_NAME = re.compile(r"^[0-9a-f]{64}$")
+
+
+def content_hash(name):
+    """SHA-256 encoded in a content-addressed file name, or None."""
+    stem = os.path.splitext(os.path.basename(name or ""))[0]
+    return stem if SHA256_NAME.match(stem) else None
+
+
+def stored_content_hash(path):
+    """Content hash of a stored file, read from its name when possible."""
+    from ai.tensor_cache import file_sha256
+
+    return content_hash(path) or file_sha256(path)
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File system storage that names every file after the SHA-256 of its
+    bytes, sharded as ``<upload_to>/ab/cd/<sha256><ext>``.
+
+    Saving bytes that are already stored only adds a reference (a
+    ``StoredBlob`` row counts them); ``delete()`` drops a reference and
+    removes the file with the last one. References that are lost without
+    ``delete()`` (rows removed by cascade, fields reassigned) are
+    reconciled by ``manage.py gc_blobs``.
+    """
+
+    chunk_size = 1024 * 1024
+
+    def get_available_name(self, name, max_length=None):
+        # The final name is derived from the content in _save(), and equal
+        # names mean equal bytes, so there is nothing to disambiguate.
+        return name
+
+    def _save(self, name, content):
+        directory, basename = os.path.split(name)
+        ext = os.path.splitext(basename)[1].lower()
+
+        tmp_dir = self.path(directory)
+        os.makedirs(tmp_dir, exist_ok=True)
+
+        # Hash while spooling to a temp file, so the upload is read once
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                if hasattr(content, "seek"):
+                    content.seek(0)
+                for chunk in content.chunks(self.chunk_size):
+                    digest.update(chunk)
+                    size += len(chunk)
+                    f.write(chunk)
+
+            sha256 = digest.hexdigest()
+            name = "/".join(filter(None, [directory, sha256[:2], sha256[2:4], sha256 + ext]))
+            full_path = self.path(name)
+
+            # Taking the reference locks the blob's row, so a concurrent
+            # delete() of the last reference either finishes unlinking
+            # before the check below or sees this reference and keeps it
+            with transaction.atomic():
+                self._add_reference(name, sha256, size)
+                if os.path.exists(full_path):
+                    os.remove(tmp_path)
+                else:
+                    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                    if self.file_permissions_mode is not None:
+                        os.chmod(tmp_path, self.file_permissions_mode)
+                    # Concurrent writers of the same blob write identical bytes,
+                    # so whichever rename lands last is equally correct.
+                    os.replace(tmp_path, full_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        return name
+
+    def _add_reference(self, name, sha256, size):
+        from django.utils import timezone
+
+        from core.models import StoredBlob
+
+        blobs = StoredBlob.objects.filter(name=name)
+        if blobs.update(refcount=F("refcount") + 1, last_referenced_at=timezone.now()):
+            return
+        try:
+            with transaction.atomic():
+                StoredBlob.objects.create(name=name, sha256=sha256, size=size, refcount=1)
+        except IntegrityError:
+            blobs.update(refcount=F("refcount") + 1, last_referenced_at=timezone.now())
+
+    def delete(self, name):
+        from core.models import StoredBlob
+
+        with transaction.atomic():
+            blob = StoredBlob.objects.select_for_update().filter(name=name).first()
+            if blob is not None and blob.refcount > 1:
+                StoredBlob.objects.filter(pk=blob.pk).update(refcount=F("refcount") - 1)
+                return
+            if blob is not None:
+                blob.delete()
+
+            # Last reference, or a file stored before content addressing.
+            # Unlinked while the row is still locked, so a _save() waiting
+            # on the lock finds the file gone and writes it again.
+            super().delete(name)
+
+
+def content_addressed_fields():
+    from django.apps import apps
+    from django.db.models import FileField
+
+    for model in apps.get_models():
+        for field in model._meta.get_fields():
+            if isinstance(field, FileField) and isinstance(field.storage, ContentAddressedStorage):
+                yield model, field
+
+
+def referenced_names():
+    """How many rows point at each stored name, across all content-addressed fields."""
+    counts = {}
+    for model, field in content_addressed_fields():
+        names = model.objects.exclude(**{field.name: ""}).exclude(**{f"{field.name}__isnull": True})
+        for name in names.values_list(field.name, flat=True).iterator():
+            counts[name] = counts.get(name, 0) + 1
+    return counts
+
+
+def collect_garbage(storage, grace_seconds=3600, dry_run=False):
+    """
+    Reconcile StoredBlob refcounts with the database and delete blobs that
+    nothing references. Blobs referenced, and files written, within the
+    last ``grace_seconds`` are kept, since an upload may be stored (or
+    deduplicated onto an old blob) before the row pointing at it is
+    committed.
+    """
+    import time
+    from datetime import timedelta
+
+    from django.utils import timezone
+
+    from core.models import StoredBlob
+
+    refs = referenced_names()
+    cutoff = timezone.now() - timedelta(seconds=grace_seconds)
+    stats = {"recounted": 0, "deleted": 0, "freed_bytes": 0}
+
+    to_recount = []
+    for blob in StoredBlob.objects.iterator():
+        actual = refs.get(blob.name, 0)
+        if actual == 0 and blob.last_referenced_at < cutoff:
+            if not dry_run:
+                # As in delete(), unlink before the row lock is released
+                with transaction.atomic():
+                    # Skip the blob if a save referenced it since it was read
+                    deleted, _ = StoredBlob.objects.filter(
+                        pk=blob.pk, last_referenced_at__lt=cutoff
+                    ).delete()
+                    if not deleted:
+                        continue
+                    if storage.exists(blob.name):
+                        FileSystemStorage.delete(storage, blob.name)
+            stats["deleted"] += 1
+            stats["freed_bytes"] += blob.size
+        elif actual != blob.refcount:
+            blob.refcount = actual
+            to_recount.append(blob)
+
+    stats["recounted"] = len(to_recount)
+    if to_recount and not dry_run:
+        StoredBlob.objects.bulk_update(to_recount, ["refcount"])
+
+    # Files with no StoredBlob row: interrupted writes and blobs whose row was lost
+    known = set(StoredBlob.objects.values_list("name", flat=True))
+    file_cutoff = time.time() - grace_seconds
+    directories = {
+        field.upload_to for _, field in content_addressed_fields()
+        if field.storage is storage and isinstance(field.upload_to, str)
+    }
+    for root, _, files in (
+        entry for directory in sorted(directories) for entry in os.walk(storage.path(directory))
+    ):
+        for filename in files:
+            if not (filename.endswith(".tmp") or content_hash(filename)):
+                continue
+            full_path = os.path.join(root, filename)
+            name = os.path.relpath(full_path, storage.location).replace(os.sep, "/")
+            if name in known or name in refs:
+                continue
+            try:
+                stat = os.stat(full_path)
+            except FileNotFoundError:
+                continue
+            if stat.st_mtime >= file_cutoff:
+                continue
+            stats["deleted"] += 1
+            stats["freed_bytes"] += stat.st_size
+            if not dry_run:
+                os.remove(full_path)
+
+    return stats
@@ -0,0 +1,37 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from core.authentication import user_cache
+from core.revocation import denylist
+
+
+class QueryCountAssertionsMixin:
+    """TestCase mixin for checking that list endpoints do not issue N+1 queries."""
+
+    def _capture_queries(self, fetch):
+        # Authentication caches users and the revocation filter across
+        # requests; start each measurement cold so both pay for the same lookups
+        user_cache.clear()
+        denylist.reset()
+        with CaptureQueriesContext(connection) as queries:
+            fetch()
+        return queries
+
+    def assertConstantQueries(self, fetch, add_rows, small=1, large=10):
+        """
+        Run ``fetch()`` with ``small`` rows and again with ``large`` rows
+        (``add_rows(n)`` creates ``n`` more) and fail if the number of
+        queries grew with the list.
+        """
+        add_rows(small)
+        few = self._capture_queries(fetch)
+
+        add_rows(large - small)
+        many = self._capture_queries(fetch)
+
+        if len(many) != len(few):
+            queries = "\n".join(query["sql"] for query in many.captured_queries)
+            self.fail(
+                f"{len(few)} queries for {small} row(s) but {len(many)} for "
+                f"{large}; queries for {large}:\n{queries}"
+            )
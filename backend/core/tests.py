@@ -1,10 +1,31 @@
 from rest_framework.test import APITestCase
 from rest_framework import status
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from asgiref.sync import async_to_sync
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
 from PIL import Image
+import asyncio
 import io
-
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import timedelta
+from unittest import mock
+
+from core.authentication import CachedJWTAuthentication, RoleRefreshToken, StreamTicket, user_cache
+from core.bloom import BloomFilter
+from core.downloads import parse_range
+from core.events import broker, format_event
 from core.models import (
     User,
     PatientProfile,
@@ -12,8 +33,13 @@ from core.models import (
     DoctorProfile,
     DiagnosticTest,
     AIInferenceResult,
-    Referral
+    Referral,
+    Appointment,
+    StoredBlob,
+    RevokedToken,
+    content_storage
 )
+from core.revocation import prune_expired
 from doctor.models import DoctorReview
 
 def get_test_image():
@@ -153,7 +179,9 @@ class PractitionerDiagnosticIntegrationTest(APITestCase):
         res = self.client.post(
             f"/api/practitioner/tests/{self.test.id}/run-ai/"
         )
-        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.status_code, 202)
+
+        call_command("run_ai_worker", burst=True, concurrency=1)
 
         self.assertTrue(
             AIInferenceResult.objects.filter(test=self.test).exists()
@@ -436,8 +464,15 @@ class FullSystemEndToEndTest(APITestCase):
         res = self.client.post(
             f"/api/practitioner/tests/{test_id}/run-ai/"
         )
+        self.assertEqual(res.status_code, 202)
+        job_id = res.data["job_id"]
+
+        call_command("run_ai_worker", burst=True, concurrency=1)
+
+        res = self.client.get(f"/api/practitioner/jobs/{job_id}/")
         self.assertEqual(res.status_code, 200)
-        self.assertEqual(res.data["risk_level"], "HIGH")
+        self.assertEqual(res.data["status"], "DONE")
+        self.assertEqual(res.data["ai_result"]["risk_level"], "HIGH")
 
         # Refer to doctor
         res = self.client.post(
@@ -532,4 +567,521 @@ class FullSystemEndToEndTest(APITestCase):
         self.assertTrue(
             DoctorReview.objects.filter(referral=referral).exists()
         )
-        self.assertEqual(test.status, "REFERRED")
\ No newline at end of file
+        self.assertEqual(test.status, "REFERRED")
+
+
+class ContentAddressedStorageTest(TestCase):
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        override = override_settings(MEDIA_ROOT=media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        user = User.objects.create_user(
+            phone="900000099",
+            password="pass",
+            full_name="Patient",
+            email="blob@test.com",
+            role="PATIENT"
+        )
+        self.patient_profile = PatientProfile.objects.create(
+            user=user,
+            address="Addr",
+            emergency_contact="999"
+        )
+
+    def _upload(self, data, filename="scan.png"):
+        test = DiagnosticTest(patient=self.patient_profile, test_type="TB", status="UPLOADED")
+        test.raw_image.save(filename, ContentFile(data), save=True)
+        return test
+
+    def test_identical_uploads_share_one_blob(self):
+        first = self._upload(b"same bytes", "a.png")
+        second = self._upload(b"same bytes", "b.png")
+
+        self.assertEqual(first.raw_image.name, second.raw_image.name)
+        self.assertRegex(first.raw_image.name, r"^diagnostic_images/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.png$")
+        self.assertEqual(StoredBlob.objects.get(name=first.raw_image.name).refcount, 2)
+
+    def test_file_is_removed_with_its_last_reference(self):
+        first = self._upload(b"same bytes")
+        second = self._upload(b"same bytes")
+        path = first.raw_image.path
+
+        first.raw_image.delete(save=False)
+        self.assertTrue(os.path.exists(path))
+
+        second.raw_image.delete(save=False)
+        self.assertFalse(os.path.exists(path))
+        self.assertFalse(StoredBlob.objects.exists())
+
+    def test_gc_removes_blobs_orphaned_by_cascade(self):
+        kept = self._upload(b"kept")
+        orphan = self._upload(b"orphan")
+        orphan_path = orphan.raw_image.path
+        orphan.delete()
+
+        call_command("gc_blobs", grace_seconds=0)
+
+        self.assertFalse(os.path.exists(orphan_path))
+        self.assertTrue(os.path.exists(kept.raw_image.path))
+        self.assertEqual(StoredBlob.objects.get().refcount, 1)
+
+    def test_gc_keeps_old_blob_referenced_again_within_grace(self):
+        orphan = self._upload(b"reused")
+        orphan.delete()
+        long_ago = timezone.now() - timedelta(days=1)
+        StoredBlob.objects.update(created_at=long_ago, last_referenced_at=long_ago)
+
+        # Deduplicated onto the old blob for a row that is not committed yet
+        name = content_storage.save("diagnostic_images/scan.png", ContentFile(b"reused"))
+        call_command("gc_blobs", grace_seconds=3600)
+
+        self.assertTrue(content_storage.exists(name))
+        self.assertTrue(StoredBlob.objects.filter(name=name).exists())
+
+
+class ParseRangeTest(SimpleTestCase):
+
+    def test_single_ranges(self):
+        self.assertEqual(parse_range("bytes=0-99", 1000), (0, 99))
+        self.assertEqual(parse_range("bytes=900-", 1000), (900, 999))
+        self.assertEqual(parse_range("bytes=-100", 1000), (900, 999))
+        self.assertEqual(parse_range("bytes=990-2000", 1000), (990, 999))
+
+    def test_missing_or_multiple_ranges_serve_whole_file(self):
+        self.assertIsNone(parse_range(None, 1000))
+        self.assertIsNone(parse_range("bytes=0-1,5-9", 1000))
+
+    def test_unsatisfiable_range(self):
+        with self.assertRaises(ValueError):
+            parse_range("bytes=1000-", 1000)
+
+
+@unittest.skipUnless(connection.vendor == "postgresql", "EXPLAIN checks need PostgreSQL")
+class QueryPlanTest(APITestCase):
+    """
+    Seeds a large dataset, calls the list endpoints and EXPLAINs every
+    query they run; none may read one of the large tables sequentially.
+    """
+
+    PATIENTS = 20
+    ROWS_PER_PATIENT = 500
+    LARGE_TABLES = ("core_diagnostictest", "core_aiinferenceresult", "core_referral", "core_appointment")
+
+    @classmethod
+    def setUpTestData(cls):
+        patients, doctors = [], []
+        for i in range(cls.PATIENTS):
+            user = User.objects.create_user(
+                phone=f"91{i:08d}", password="pass", full_name=f"Patient {i}", role="PATIENT"
+            )
+            patients.append(PatientProfile.objects.create(user=user, address="-", emergency_contact="0"))
+
+            user = User.objects.create_user(
+                phone=f"92{i:08d}", password="pass", full_name=f"Doctor {i}", role="DOCTOR"
+            )
+            doctors.append(DoctorProfile.objects.create(
+                user=user,
+                specialization="GENERAL",
+                hospital_name="-",
+                registration_number=f"PLAN{i}",
+                years_of_experience=1
+            ))
+
+        cls.practitioner = User.objects.create_user(
+            phone="9300000000", password="pass", full_name="Practitioner", role="PRACTITIONER"
+        )
+        PractitionerProfile.objects.create(
+            user=cls.practitioner,
+            designation="Lab",
+            diagnostic_center_name="-",
+            center_location="-",
+            experience_years=1
+        )
+
+        tests = DiagnosticTest.objects.bulk_create(
+            DiagnosticTest(patient=patient, test_type="TB", status="AI_DONE")
+            for patient in patients for _ in range(cls.ROWS_PER_PATIENT)
+        )
+        AIInferenceResult.objects.bulk_create(
+            AIInferenceResult(test=test, model_name="TB", risk_score=0.5, risk_level="LOW", confidence=0.5)
+            for test in tests
+        )
+        Referral.objects.bulk_create(
+            Referral(
+                test=test,
+                referred_to=doctors[i % len(doctors)],
+                urgency="ROUTINE",
+                reason="-",
+                status="PENDING" if i % 4 == 0 else "CLOSED"
+            )
+            for i, test in enumerate(tests)
+        )
+        Appointment.objects.bulk_create(
+            Appointment(
+                patient=patient,
+                doctor=doctors[0],
+                appointment_type="CONSULTATION",
+                mode="ONLINE",
+                scheduled_time=timezone.now(),
+                status="BOOKED"
+            )
+            for patient in patients for _ in range(cls.ROWS_PER_PATIENT)
+        )
+
+        with connection.cursor() as cursor:
+            for table in cls.LARGE_TABLES:
+                cursor.execute(f"ANALYZE {table}")
+
+        cls.patient = patients[0].user
+        cls.doctor = doctors[0].user
+
+    def assertNoSequentialScans(self, user, url):
+        self.client.force_authenticate(user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with connection.cursor() as cursor:
+            for query in queries.captured_queries:
+                if not query["sql"].lstrip().upper().startswith("SELECT"):
+                    continue
+                cursor.execute(f"EXPLAIN {query['sql']}")
+                plan = "\n".join(row[0] for row in cursor.fetchall())
+                for table in self.LARGE_TABLES:
+                    self.assertNotIn(f"Seq Scan on {table}", plan, f"{url}:\n{query['sql']}\n{plan}")
+
+    def test_patient_lists_use_indexes(self):
+        for url in ("/api/patient/tests/", "/api/patient/appointments/", "/api/patient/referrals/"):
+            self.assertNoSequentialScans(self.patient, url)
+
+    def test_doctor_referral_queue_uses_indexes(self):
+        self.assertNoSequentialScans(self.doctor, "/api/doctor/referrals/")
+
+    def test_patient_lookup_uses_indexes(self):
+        self.assertNoSequentialScans(self.practitioner, "/api/practitioner/patient-search/?phone=9100000000")
+
+
+class EventStreamTest(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            phone="9000000001", password="password123", full_name="Patient", role="PATIENT"
+        )
+        self.patient = PatientProfile.objects.create(
+            user=self.user, address="Address", emergency_contact="0"
+        )
+
+    def test_broker_delivers_only_to_addressed_users(self):
+        async def exchange():
+            mine = broker.subscribe(self.user.pk)
+            other = broker.subscribe("someone-else")
+            try:
+                broker.dispatch({"users": [str(self.user.pk)], "event": "test.status", "data": {}})
+                message = await asyncio.wait_for(mine[1].get(), timeout=1)
+                return message, other[1].qsize()
+            finally:
+                broker.unsubscribe(self.user.pk, mine)
+                broker.unsubscribe("someone-else", other)
+
+        message, others = async_to_sync(exchange)()
+
+        self.assertEqual(message["event"], "test.status")
+        self.assertEqual(others, 0)
+        self.assertEqual(broker.stream_count, 0)
+
+    def test_status_change_is_published_to_patient(self):
+        test = DiagnosticTest.objects.create(patient=self.patient, test_type="TB", status="UPLOADED")
+
+        with mock.patch("core.signals.publish") as publish:
+            test.status = "AI_DONE"
+            test.save(update_fields=["status"])
+            test.raw_image = "diagnostic_images/x.png"
+            test.save(update_fields=["raw_image"])
+
+        publish.assert_called_once()
+        users, event, data = publish.call_args.args
+        self.assertIn(self.user.pk, users)
+        self.assertEqual(event, "test.status")
+        self.assertEqual(data["status"], "AI_DONE")
+
+    def test_event_format(self):
+        self.assertEqual(
+            format_event({"event": "referral", "data": {"status": "REVIEWED"}}),
+            'event: referral\ndata: {"status": "REVIEWED"}\n\n'
+        )
+
+    def test_stream_requires_token(self):
+        response = self.client.get("/api/events/")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_ticket_identifies_user(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post("/api/events/ticket/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        ticket = StreamTicket(response.data["ticket"])
+        self.assertEqual(str(ticket["user_id"]), str(self.user.pk))
+
+    def test_stream_rejects_access_token_in_url(self):
+        access = str(RefreshToken.for_user(self.user).access_token)
+
+        for param in ("ticket", "token"):
+            response = self.client.get(f"/api/events/?{param}={access}")
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_ticket_is_not_an_access_token(self):
+        ticket = str(StreamTicket.for_user(self.user))
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {ticket}")
+
+        response = self.client.post("/api/events/ticket/")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+# Cheap hashing keeps the refill during the failed logins negligible
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class LoginThrottleTest(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            phone="9999999999", password="StrongPassword123", full_name="Test", role="PATIENT"
+        )
+
+    def _login(self, password, phone="9999999999", ip="10.0.0.1", **extra):
+        return self.client.post(
+            '/api/auth/login/', {"phone": phone, "password": password},
+            format='json', REMOTE_ADDR=ip, **extra
+        )
+
+    @override_settings(LOGIN_PHONE_BURST=3, LOGIN_PHONE_PER_MINUTE=1)
+    def test_phone_bucket_rejects_before_hashing(self):
+        for _ in range(3):
+            self.assertEqual(self._login("wrong").status_code, status.HTTP_401_UNAUTHORIZED)
+
+        with self.assertNumQueries(0):
+            response = self._login("StrongPassword123", ip="10.0.0.2")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn(int(response["Retry-After"]), range(55, 61))
+
+    @override_settings(LOGIN_IP_BURST=2, LOGIN_IP_PER_MINUTE=1)
+    def test_ip_bucket_spans_phone_numbers(self):
+        self._login("wrong", phone="1000000001")
+        self._login("wrong", phone="1000000002")
+
+        response = self._login("StrongPassword123")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @override_settings(LOGIN_IP_BURST=1, LOGIN_IP_PER_MINUTE=1, LOGIN_PHONE_BURST=1, LOGIN_PHONE_PER_MINUTE=1)
+    def test_rejected_attempt_costs_no_tokens(self):
+        self._login("wrong", ip="10.0.0.1")
+
+        # Refused by the phone bucket; the fresh IP must keep its token
+        self.assertEqual(self._login("wrong", ip="10.0.0.2").status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        other = self._login("wrong", phone="1000000001", ip="10.0.0.2")
+        self.assertNotEqual(other.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @override_settings(LOGIN_IP_BURST=1, LOGIN_IP_PER_MINUTE=1, TRUSTED_PROXY_COUNT=1)
+    def test_ip_bucket_uses_forwarded_client_behind_proxy(self):
+        self._login("wrong", phone="1000000001", HTTP_X_FORWARDED_FOR="203.0.113.1")
+
+        other = self._login("wrong", phone="1000000002", HTTP_X_FORWARDED_FOR="203.0.113.2")
+        self.assertNotEqual(other.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        # Entries left of the one the proxy appended are client-supplied
+        spoofed = self._login(
+            "wrong", phone="1000000003", HTTP_X_FORWARDED_FOR="198.51.100.9, 203.0.113.1"
+        )
+        self.assertEqual(spoofed.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+
+@override_settings(
+    PASSWORD_HASHERS=["core.hashers.PBKDF2PasswordHasher"],
+    PBKDF2_ITERATIONS=2000,
+)
+class PasswordRehashTest(APITestCase):
+
+    def test_login_upgrades_hash_to_current_work_factor(self):
+        cache.clear()
+        user = User.objects.create_user(phone="9999999998", password="x", full_name="T", role="PATIENT")
+        with override_settings(PBKDF2_ITERATIONS=1000):
+            user.password = make_password("StrongPassword123")
+        user.save()
+
+        response = self.client.post(
+            '/api/auth/login/', {"phone": user.phone, "password": "StrongPassword123"}, format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("pbkdf2_sha256$2000$"))
+
+
+class CachedJWTAuthenticationTest(APITestCase):
+
+    def setUp(self):
+        user_cache.clear()
+        self.user = User.objects.create_user(
+            phone="7777777777",
+            password="password123",
+            full_name="Dr Cache",
+            role="DOCTOR"
+        )
+        self.profile = DoctorProfile.objects.create(
+            user=self.user,
+            specialization="TB",
+            hospital_name="Hospital",
+            registration_number="DOC1",
+            years_of_experience=5
+        )
+        self.auth = CachedJWTAuthentication()
+        self.token = AccessToken(str(RoleRefreshToken.for_user(self.user).access_token))
+
+    def test_token_carries_role_and_profile(self):
+        self.assertEqual(self.token["role"], "DOCTOR")
+        self.assertEqual(self.token["profile_id"], self.profile.pk)
+
+    def test_cached_user_and_profile_cost_no_queries(self):
+        self.auth.get_user(self.token)
+
+        with self.assertNumQueries(0):
+            user = self.auth.get_user(self.token)
+            self.assertEqual(user.doctor_profile.pk, self.profile.pk)
+
+    def test_profile_save_invalidates_entry(self):
+        self.auth.get_user(self.token)
+
+        self.profile.hospital_name = "Elsewhere"
+        self.profile.save()
+
+        user = self.auth.get_user(self.token)
+        self.assertEqual(user.doctor_profile.hospital_name, "Elsewhere")
+
+    def test_deactivated_user_is_rejected(self):
+        self.auth.get_user(self.token)
+
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.get_user(self.token)
+
+    def test_cached_copy_is_isolated(self):
+        self.auth.get_user(self.token).full_name = "Changed"
+
+        self.assertEqual(self.auth.get_user(self.token).full_name, "Dr Cache")
+
+
+class RefreshRotationTest(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        User.objects.create_user(
+            phone="9999999997", password="StrongPassword123", full_name="T", role="PATIENT"
+        )
+        response = self.client.post(
+            '/api/auth/login/',
+            {"phone": "9999999997", "password": "StrongPassword123"},
+            format='json'
+        )
+        self.access = response.data["access"]
+        self.refresh = self.client.cookies["refresh_token"].value
+
+    @override_settings(TOKEN_REFRESH_GRACE_SECONDS=0)
+    def test_refresh_rotates_and_old_token_is_single_use(self):
+        response = self.client.post('/api/auth/refresh-token/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rotated = self.client.cookies["refresh_token"].value
+        self.assertNotEqual(rotated, self.refresh)
+
+        self.client.cookies["refresh_token"] = self.refresh
+        response = self.client.post('/api/auth/refresh-token/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.client.cookies["refresh_token"] = rotated
+        response = self.client.post('/api/auth/refresh-token/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_concurrent_refreshes_share_one_successor(self):
+        self.client.post('/api/auth/refresh-token/')
+        rotated = self.client.cookies["refresh_token"].value
+
+        self.client.cookies["refresh_token"] = self.refresh
+        response = self.client.post('/api/auth/refresh-token/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.cookies["refresh_token"].value, rotated)
+        self.assertEqual(RevokedToken.objects.count(), 1)
+
+    def test_logout_revokes_refresh_and_access_tokens(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+        self.assertEqual(self.client.post('/api/auth/logout/').status_code, status.HTTP_200_OK)
+
+        self.assertEqual(
+            self.client.get('/api/patient/me/').status_code, status.HTTP_401_UNAUTHORIZED
+        )
+        self.client.credentials()
+        self.client.cookies["refresh_token"] = self.refresh
+        response = self.client.post('/api/auth/refresh-token/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_logout_ends_grace_window(self):
+        self.client.post('/api/auth/refresh-token/')
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+        self.assertEqual(self.client.post('/api/auth/logout/').status_code, status.HTTP_200_OK)
+
+        self.client.credentials()
+        self.client.cookies["refresh_token"] = self.refresh
+        response = self.client.post('/api/auth/refresh-token/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_grace_follows_later_rotations(self):
+        self.client.post('/api/auth/refresh-token/')
+        self.client.post('/api/auth/refresh-token/')
+        latest = self.client.cookies["refresh_token"].value
+
+        self.client.cookies["refresh_token"] = self.refresh
+        response = self.client.post('/api/auth/refresh-token/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.cookies["refresh_token"].value, latest)
+
+    def test_logout_with_expired_access_token_clears_session(self):
+        expired = AccessToken(self.access)
+        expired.set_exp(lifetime=-timedelta(minutes=1))
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {expired}")
+
+        response = self.client.post('/api/auth/logout/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.cookies["refresh_token"].value, "")
+        self.client.credentials()
+        self.client.cookies["refresh_token"] = self.refresh
+        response = self.client.post('/api/auth/refresh-token/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_prune_removes_only_expired_entries(self):
+        self.client.post('/api/auth/refresh-token/')
+        RevokedToken.objects.create(
+            jti="00000000-0000-0000-0000-000000000001",
+            expires_at=timezone.now() - timedelta(minutes=1)
+        )
+
+        self.assertEqual(prune_expired(), 1)
+        self.assertEqual(RevokedToken.objects.count(), 1)
+
+
+class BloomFilterTest(SimpleTestCase):
+
+    def test_no_false_negatives_and_bounded_false_positives(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f"in-{i}")
+
+        self.assertTrue(all(f"in-{i}" in bloom for i in range(1000)))
+        false_positives = sum(f"out-{i}" in bloom for i in range(10000))
+        self.assertLess(false_positives, 300)
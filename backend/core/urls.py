@@ -1,4 +1,4 @@
-from core.views import RegisterView, LoginView, RefreshTokenView, LogoutView
+from core.views import RegisterView, LoginView, RefreshTokenView, LogoutView, EventStreamTicketView, event_stream_view
 from django.urls import path
 
 urlpatterns = [
@@ -6,5 +6,7 @@ urlpatterns = [
     path('auth/login/', LoginView.as_view(), name='login'),
     path('auth/refresh-token/', RefreshTokenView.as_view(), name='refresh_token'),
     path('auth/logout/', LogoutView.as_view(), name='logout'),
+    path('events/', event_stream_view, name='events'),
+    path('events/ticket/', EventStreamTicketView.as_view(), name='events_ticket'),
 ]
 
@@ -1,10 +1,29 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.views import APIView, Response, status
 from core.serializers import RegisterSerializer
 from core.models import User
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import TokenError
+from core.authentication import CachedJWTAuthentication, OptionalJWTAuthentication, RoleRefreshToken, StreamTicket
+from core.events import event_stream
+from core.ratelimit import TokenBucket, client_ip
+from core.revocation import revoke, rotate
 from rest_framework.permissions import AllowAny
 
 
+def set_refresh_cookie(response, token):
+    response.set_cookie(
+        key='refresh_token',
+        value=str(token),
+        httponly=True,
+        secure=True,
+        samesite='None',
+    )
+
+
 class RegisterView(APIView):
     permission_classes = [AllowAny]
     def post(self, request):
@@ -33,11 +52,27 @@ class LoginView(APIView):
         
         if not phone_number or not password:
             return Response({'error': 'Phone number and password are required'}, status=status.HTTP_400_BAD_REQUEST)
-        
+
+        # Throttle before the user lookup and password hash, the expensive part.
+        # Both buckets are checked first so a rejected attempt costs neither.
+        buckets = [
+            (TokenBucket('login-ip', settings.LOGIN_IP_BURST, settings.LOGIN_IP_PER_MINUTE), client_ip(request)),
+            (TokenBucket('login-phone', settings.LOGIN_PHONE_BURST, settings.LOGIN_PHONE_PER_MINUTE), phone_number),
+        ]
+        retry_after = max(bucket.retry_after(key) for bucket, key in buckets)
+        if not retry_after:
+            retry_after = max(bucket.take(key) for bucket, key in buckets)
+        if retry_after:
+            return Response(
+                {'error': 'Too many login attempts'},
+                status=status.HTTP_429_TOO_MANY_REQUESTS,
+                headers={'Retry-After': str(retry_after)},
+            )
+
         try:
             user = User.objects.get(phone=phone_number)
             if user.check_password(password):
-                token = RefreshToken.for_user(user)
+                token = RoleRefreshToken.for_user(user)
                 response = Response(
                     {
                         'message': 'Login successful',
@@ -47,13 +82,7 @@ class LoginView(APIView):
                         'phone': user.phone,
                     },
                 )
-                response.set_cookie(
-                    key='refresh_token',
-                    value=str(token),
-                    httponly=True,
-                    secure=True,
-                    samesite='None',
-                )
+                set_refresh_cookie(response, token)
                 return response
             else:
                 return Response({'error': 'Invalid credentials'}, status=status.HTTP_401_UNAUTHORIZED)
@@ -73,25 +102,92 @@ class RefreshTokenView(APIView):
             return Response({'error': 'Refresh token not provided'}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            token = RefreshToken(refresh_token)
-            new_access_token = str(token.access_token)
-
-            return Response(
-                {
-                    'access': new_access_token
-                },
-                status=status.HTTP_200_OK
-            )
-
-        except Exception as e:
+            # Each refresh token works once; the response carries its successor
+            token = rotate(RoleRefreshToken(refresh_token))
+        except TokenError:
             return Response({'error': 'Invalid refresh token'}, status=status.HTTP_401_UNAUTHORIZED)
 
+        response = Response(
+            {
+                'access': str(token.access_token)
+            },
+            status=status.HTTP_200_OK
+        )
+        set_refresh_cookie(response, token)
+        return response
+
 
 class LogoutView(APIView):
+    # An expired access token must not keep the refresh cookie alive
+    authentication_classes = [OptionalJWTAuthentication]
+    permission_classes = [AllowAny]
+
     def post(self, request):
+        refresh_token = request.COOKIES.get('refresh_token')
+        if refresh_token:
+            try:
+                revoke(RoleRefreshToken(refresh_token))
+            except TokenError:
+                pass
+        if request.auth is not None:
+            revoke(request.auth)
+
         response = Response(
             {'message': 'Logout successful'},
             status=status.HTTP_200_OK
         )
         response.delete_cookie('refresh_token')
-        return response
\ No newline at end of file
+        return response
+
+
+class EventStreamTicketView(APIView):
+    def post(self, request):
+        return Response(
+            {
+                'ticket': str(StreamTicket.for_user(request.user)),
+                'expires_in': settings.EVENT_STREAM_TICKET_SECONDS,
+            },
+            status=status.HTTP_200_OK
+        )
+
+
+def _stream_user(request):
+    """
+    The user of an event stream request. Browsers' EventSource cannot set
+    headers, so it passes a stream ticket as ``?ticket=`` instead.
+    """
+    auth = CachedJWTAuthentication()
+    header = auth.get_header(request)
+    try:
+        if header:
+            raw_token = auth.get_raw_token(header)
+            if not raw_token:
+                raise AuthenticationFailed('Access token not provided')
+            return auth.get_user(auth.get_validated_token(raw_token))
+
+        ticket = request.GET.get('ticket')
+        if not ticket:
+            raise AuthenticationFailed('Stream ticket not provided')
+        try:
+            validated = StreamTicket(ticket)
+        except TokenError:
+            raise AuthenticationFailed('Stream ticket is invalid or expired')
+        return auth.get_user(validated)
+    finally:
+        # A stream stays open for hours; it must not hold a database
+        # connection, unless the caller's transaction still needs it
+        if not connection.in_atomic_block:
+            connection.close()
+
+
+async def event_stream_view(request):
+    try:
+        user = await sync_to_async(_stream_user)(request)
+    except AuthenticationFailed as e:
+        return JsonResponse({'error': str(e.detail)}, status=status.HTTP_401_UNAUTHORIZED)
+
+    response = StreamingHttpResponse(event_stream(user.pk), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Keep nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
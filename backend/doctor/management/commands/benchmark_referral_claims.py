@@ -0,0 +1,72 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from core.models import DoctorProfile, Referral
+from doctor.services.referral_queue import claim_referrals
+
+
+def _drain(doctor, batch_size):
+    """Claim batches until the doctor's queue is empty; returns (ids, latencies)."""
+    claimed, latencies = [], []
+    try:
+        while True:
+            start = time.perf_counter()
+            referrals = claim_referrals(doctor, batch_size)
+            latencies.append(time.perf_counter() - start)
+            if not referrals:
+                return claimed, latencies
+            claimed.extend(r.id for r in referrals)
+    finally:
+        close_old_connections()
+
+
+class Command(BaseCommand):
+    help = (
+        "Drain the pending referral queue with concurrent reviewers, report "
+        "claims/sec and check no case was handed out twice. Claims are "
+        "restored afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--specialization", default="TB")
+        parser.add_argument("--reviewers", type=int, default=8, help="Concurrent claiming threads")
+        parser.add_argument("--batch-size", type=int, default=5)
+
+    def handle(self, *args, **options):
+        doctors = list(DoctorProfile.objects.filter(specialization=options["specialization"]))
+        if not doctors:
+            raise CommandError(f"No {options['specialization']} doctors")
+
+        before = {
+            r["id"]: (r["claimed_by"], r["claimed_at"])
+            for r in Referral.objects.filter(status="PENDING").values("id", "claimed_by", "claimed_at")
+        }
+
+        reviewers = [doctors[i % len(doctors)] for i in range(options["reviewers"])]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(reviewers)) as pool:
+            results = list(pool.map(lambda d: _drain(d, options["batch_size"]), reviewers))
+        elapsed = time.perf_counter() - start
+
+        claimed = [i for ids, _ in results for i in ids]
+        try:
+            latencies = sorted(t for _, ts in results for t in ts)
+            duplicates = len(claimed) - len(set(claimed))
+
+            self.stdout.write(f"Reviewers:        {len(reviewers)} ({len(doctors)} doctor(s))")
+            self.stdout.write(f"Cases claimed:    {len(claimed)}")
+            self.stdout.write(f"Claims/sec:       {len(claimed) / elapsed:.1f}")
+            if latencies:
+                self.stdout.write(f"p50 claim:        {latencies[len(latencies) // 2] * 1000:.1f} ms")
+                self.stdout.write(f"p99 claim:        {latencies[int(len(latencies) * 0.99)] * 1000:.1f} ms")
+            if duplicates:
+                self.stdout.write(self.style.ERROR(f"Claimed twice:    {duplicates}"))
+        finally:
+            restored = [
+                Referral(id=i, claimed_by_id=before[i][0], claimed_at=before[i][1])
+                for i in set(claimed) if i in before
+            ]
+            Referral.objects.bulk_update(restored, ["claimed_by", "claimed_at"])
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from doctor.services.referral_queue import release_stale_claims
+
+
+class Command(BaseCommand):
+    help = "Return referrals whose work-queue claim has expired to the queue"
+
+    def handle(self, *args, **options):
+        released = release_stale_claims()
+        self.stdout.write(self.style.SUCCESS(f"Released {released} stale claim(s)."))
@@ -1,15 +1,22 @@
+from django.db.models import Prefetch
 from rest_framework import serializers
 from core.models import (
     Referral,
-    
+    PatientProfile,
+    DiagnosticTest,
+    PastMedicalHistory,
 )
 from doctor.models import DoctorReview
+from core.serializers import SparseFieldsetMixin
 
-class DoctorReferralListSerializer(serializers.ModelSerializer):
+class DoctorReferralListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     patient_name = serializers.CharField(
         source="test.patient.user.full_name"
     )
     test_type = serializers.CharField(source="test.test_type")
+    risk_score = serializers.FloatField(
+        source="test.aiinferenceresult.risk_score", read_only=True, default=None
+    )
 
     class Meta:
         model = Referral
@@ -18,12 +25,15 @@ class DoctorReferralListSerializer(serializers.ModelSerializer):
             "patient_name",
             "test_type",
             "urgency",
+            "risk_score",
             "status",
+            "claimed_at",
             "created_at",
         ]
 
 
-from core.models import DiagnosticTest
+class DoctorClaimSerializer(serializers.Serializer):
+    count = serializers.IntegerField(min_value=1, default=1)
 
 
 class DoctorCaseDetailSerializer(serializers.ModelSerializer):
@@ -51,8 +61,137 @@ class DoctorCaseDetailSerializer(serializers.ModelSerializer):
             "risk_level": ai.risk_level,
             "risk_score": ai.risk_score,
             "confidence": ai.confidence,
+            "heatmap_url": ai.heatmap_image.url if ai.heatmap_image else None,
+        }
+
+
+class PastMedicalHistorySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PastMedicalHistory
+        fields = ["condition_name", "diagnosed_on", "status", "notes"]
+
+
+class DoctorPatientSerializer(serializers.ModelSerializer):
+    name = serializers.CharField(source="user.full_name")
+    medical_history = PastMedicalHistorySerializer(many=True)
+
+    class Meta:
+        model = PatientProfile
+        fields = [
+            "id",
+            "name",
+            "date_of_birth",
+            "blood_group",
+            "known_allergies",
+            "chronic_conditions",
+            "medical_history",
+        ]
+
+
+class DoctorCaseBundleSerializer(DoctorCaseDetailSerializer):
+    """
+    Everything the review screen shows for one case. Must be given a
+    queryset from ``setup_eager_loading``; nothing here queries lazily.
+    """
+
+    PRIOR_TESTS = 10
+
+    patient = DoctorPatientSerializer()
+    clinical_context = serializers.SerializerMethodField()
+    report = serializers.SerializerMethodField()
+    referral = serializers.SerializerMethodField()
+    prior_tests = serializers.SerializerMethodField()
+
+    class Meta(DoctorCaseDetailSerializer.Meta):
+        fields = DoctorCaseDetailSerializer.Meta.fields + [
+            "patient",
+            "clinical_context",
+            "report",
+            "referral",
+            "prior_tests",
+        ]
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        # One query for the case and its one-to-one rows, one for medical
+        # history and one for prior tests, however many cases are loaded.
+        prior = (
+            DiagnosticTest.objects.select_related("aiinferenceresult")
+            .only(
+                "id", "patient_id", "test_type", "test_date", "status",
+                "aiinferenceresult__risk_level",
+            )
+            .order_by("-test_date")
+        )
+        return queryset.select_related(
+            "patient__user",
+            "aiinferenceresult",
+            "clinicalcontext",
+            "diagnosticreport",
+            "referral",
+        ).prefetch_related(
+            Prefetch(
+                "patient__medical_history",
+                queryset=PastMedicalHistory.objects.order_by("-diagnosed_on"),
+            ),
+            # One extra row in case the window includes the case itself
+            Prefetch(
+                "patient__diagnostictest_set",
+                queryset=prior[:cls.PRIOR_TESTS + 1],
+                to_attr="recent_tests",
+            ),
+        )
+
+    def get_clinical_context(self, obj):
+        if not hasattr(obj, "clinicalcontext"):
+            return None
+        context = obj.clinicalcontext
+        return {
+            "symptoms": context.symptoms,
+            "vitals": context.vitals,
+            "history_snapshot": context.auto_history_snapshot,
+            "created_at": context.created_at,
+        }
+
+    def get_report(self, obj):
+        if not hasattr(obj, "diagnosticreport"):
+            return None
+        report = obj.diagnosticreport
+        return {
+            "status": report.status,
+            "final_risk_level": report.final_risk_level,
+            "doctor_signed": report.doctor_signed,
+            "rendered_at": report.rendered_at,
+        }
+
+    def get_referral(self, obj):
+        if not hasattr(obj, "referral"):
+            return None
+        referral = obj.referral
+        return {
+            "id": referral.id,
+            "urgency": referral.urgency,
+            "reason": referral.reason,
+            "status": referral.status,
+            "created_at": referral.created_at,
         }
 
+    def get_prior_tests(self, obj):
+        prior = [t for t in obj.patient.recent_tests if t.pk != obj.pk][:self.PRIOR_TESTS]
+        return [
+            {
+                "id": test.id,
+                "test_type": test.test_type,
+                "test_date": test.test_date,
+                "status": test.status,
+                "risk_level": (
+                    test.aiinferenceresult.risk_level
+                    if hasattr(test, "aiinferenceresult") else None
+                ),
+            }
+            for test in prior
+        ]
+
 
 class DoctorReviewSerializer(serializers.ModelSerializer):
     class Meta:
@@ -0,0 +1,108 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Q, Value, When
+from django.utils import timezone
+
+from core.models import Referral
+
+
+# Unassigned referrals (no referred_to) are shared by every doctor whose
+# specialization covers the test type.
+SPECIALIZATION_TEST_TYPES = {
+    "TB": ["TB"],
+    "ONCOLOGY": ["BREAST_CANCER"],
+    "GENERAL": ["TB", "BREAST_CANCER"],
+}
+
+
+def _stale_before(now):
+    return now - timedelta(seconds=settings.REFERRAL_CLAIM_TTL_SECONDS)
+
+
+def assigned_to(doctor, prefix=""):
+    """
+    Referrals ``doctor`` may act on: referred to them, or claimed by them
+    with a live claim. A pending referral's claim lapses after
+    REFERRAL_CLAIM_TTL_SECONDS; once reviewed or closed it can no longer be
+    claimed by anyone else, so the claim stands.
+    """
+    live_claim = Q(**{f"{prefix}claimed_at__gte": _stale_before(timezone.now())}) | Q(
+        **{f"{prefix}status__in": ["REVIEWED", "CLOSED"]}
+    )
+    return Q(**{f"{prefix}referred_to": doctor}) | (Q(**{f"{prefix}claimed_by": doctor}) & live_claim)
+
+
+def prioritized(referrals):
+    """High urgency first, then highest AI risk score, then oldest."""
+    return referrals.annotate(
+        urgency_rank=Case(
+            When(urgency="HIGH", then=Value(0)),
+            default=Value(1),
+            output_field=IntegerField(),
+        )
+    ).order_by(
+        "urgency_rank",
+        F("test__aiinferenceresult__risk_score").desc(nulls_last=True),
+        "created_at",
+        "id",
+    )
+
+
+def _claimable(doctor, now):
+    test_types = SPECIALIZATION_TEST_TYPES.get(doctor.specialization, [])
+    in_pool = Q(referred_to=doctor) | Q(referred_to__isnull=True, test__test_type__in=test_types)
+    unclaimed = Q(claimed_by__isnull=True) | Q(claimed_at__lt=_stale_before(now))
+    return Q(status="PENDING") & in_pool & unclaimed
+
+
+def claim_referrals(doctor, limit):
+    """
+    Claim the next ``limit`` referrals of the doctor's queue. Rows another
+    reviewer is claiming at the same moment are skipped rather than waited
+    on, so concurrent claims never block each other or hand out a case twice.
+    """
+    now = timezone.now()
+
+    with transaction.atomic():
+        # of=("self",): the AI result join is an outer join, which cannot be locked
+        ids = list(
+            prioritized(Referral.objects.filter(_claimable(doctor, now)))
+            .select_for_update(skip_locked=True, of=("self",))
+            .values_list("id", flat=True)[:limit]
+        )
+        if not ids:
+            return []
+
+        Referral.objects.filter(id__in=ids).update(claimed_by=doctor, claimed_at=now)
+
+    return list(
+        prioritized(claimed_queryset(doctor).filter(id__in=ids))
+    )
+
+
+def claimed_queryset(doctor):
+    """The doctor's live claims, with what the queue listing displays."""
+    return Referral.objects.filter(
+        claimed_by=doctor,
+        status="PENDING",
+        claimed_at__gte=_stale_before(timezone.now()),
+    ).select_related("test__patient__user", "test__aiinferenceresult")
+
+
+def release_claim(doctor, referral_id):
+    """Hand a claimed referral back to the queue. True if it was claimed by ``doctor``."""
+    return Referral.objects.filter(
+        id=referral_id, claimed_by=doctor, status="PENDING"
+    ).update(claimed_by=None, claimed_at=None) == 1
+
+
+def release_stale_claims():
+    """
+    Clear claims older than REFERRAL_CLAIM_TTL_SECONDS. Claiming already
+    treats them as free; this keeps ``claimed_by`` honest for reporting.
+    """
+    return Referral.objects.filter(
+        status="PENDING", claimed_at__lt=_stale_before(timezone.now())
+    ).update(claimed_by=None, claimed_at=None)
@@ -1,7 +1,12 @@
 from rest_framework.test import APITestCase
 from rest_framework import status
 from rest_framework_simplejwt.tokens import RefreshToken
+from datetime import timedelta
 
+from django.test import override_settings
+from django.utils import timezone
+
+from core.testing import QueryCountAssertionsMixin
 from core.models import (
     User,
     PatientProfile,
@@ -9,9 +14,13 @@ from core.models import (
     DoctorProfile,
     DiagnosticTest,
     AIInferenceResult,
+    DiagnosticReport,
+    ClinicalContext,
+    PastMedicalHistory,
     Referral
 )
 from doctor.models import DoctorReview
+from doctor.services.referral_queue import claim_referrals, release_stale_claims
 
 
 class DoctorBaseTestCase(APITestCase):
@@ -104,6 +113,111 @@ class DoctorReferralListTest(DoctorBaseTestCase):
         self.assertEqual(response.data[0]["urgency"], "HIGH")
 
 
+class DoctorQueueTest(DoctorBaseTestCase):
+
+    def _pooled_referral(self, urgency, risk_score, test_type="TB"):
+        test = DiagnosticTest.objects.create(
+            patient=self.patient_profile,
+            practitioner=self.practitioner_profile,
+            test_type=test_type,
+            status="AI_DONE"
+        )
+        AIInferenceResult.objects.create(
+            test=test, model_name=test_type, risk_score=risk_score,
+            risk_level="HIGH", confidence=0.9
+        )
+        return Referral.objects.create(
+            test=test,
+            referred_by=self.practitioner_profile,
+            urgency=urgency,
+            status="PENDING"
+        )
+
+    def _other_doctor(self, specialization="TB"):
+        user = User.objects.create_user(
+            phone="5555555555",
+            password="password123",
+            full_name="Dr Other",
+            email="other@test.com",
+            role="DOCTOR"
+        )
+        return DoctorProfile.objects.create(
+            user=user,
+            specialization=specialization,
+            hospital_name="Test Hospital",
+            registration_number="DOC456",
+            years_of_experience=3
+        )
+
+    def test_claims_by_urgency_then_risk_then_age(self):
+        routine = self._pooled_referral("ROUTINE", 0.95)
+        high_low_risk = self._pooled_referral("HIGH", 0.40)
+        self._pooled_referral("HIGH", 0.70, test_type="BREAST_CANCER")
+
+        response = self.client.post("/api/doctor/queue/claim/", {"count": 5}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [r["id"] for r in response.data],
+            [self.referral.id, high_low_risk.id, routine.id]
+        )
+
+        queue = self.client.get("/api/doctor/queue/")
+        self.assertEqual(len(queue.data), 3)
+
+    def test_claimed_referral_is_not_handed_out_twice(self):
+        pooled = self._pooled_referral("HIGH", 0.9)
+        other = self._other_doctor()
+
+        self.assertEqual([r.id for r in claim_referrals(other, 5)], [pooled.id])
+        self.assertEqual([r.id for r in claim_referrals(self.doctor_profile, 5)], [self.referral.id])
+        self.assertEqual(claim_referrals(self.doctor_profile, 5), [])
+
+    @override_settings(REFERRAL_CLAIM_TTL_SECONDS=60)
+    def test_stale_claim_returns_to_queue(self):
+        pooled = self._pooled_referral("HIGH", 0.9)
+        other = self._other_doctor()
+        claim_referrals(other, 1)
+        Referral.objects.filter(pk=pooled.pk).update(
+            claimed_at=timezone.now() - timedelta(seconds=120)
+        )
+
+        self.assertIn(pooled.id, [r.id for r in claim_referrals(self.doctor_profile, 5)])
+
+        Referral.objects.filter(pk=pooled.pk).update(
+            claimed_at=timezone.now() - timedelta(seconds=120)
+        )
+        self.assertEqual(release_stale_claims(), 1)
+        pooled.refresh_from_db()
+        self.assertIsNone(pooled.claimed_by)
+
+    def test_claim_grants_access_and_release_revokes_it(self):
+        pooled = self._pooled_referral("HIGH", 0.9)
+        url = f"/api/doctor/cases/{pooled.test_id}/"
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+        self.client.post("/api/doctor/queue/claim/", {"count": 2}, format="json")
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+        response = self.client.post(f"/api/doctor/referrals/{pooled.id}/release/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.client.post(f"/api/doctor/referrals/{pooled.id}/release/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(REFERRAL_CLAIM_TTL_SECONDS=60)
+    def test_stale_claim_revokes_access(self):
+        pooled = self._pooled_referral("HIGH", 0.9)
+        claim_referrals(self.doctor_profile, 2)
+        Referral.objects.filter(pk=pooled.pk).update(
+            claimed_at=timezone.now() - timedelta(seconds=120)
+        )
+
+        response = self.client.get(f"/api/doctor/cases/{pooled.test_id}/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
 class DoctorCaseDetailTest(DoctorBaseTestCase):
 
     def test_doctor_can_view_case_details(self):
@@ -118,6 +232,80 @@ class DoctorCaseDetailTest(DoctorBaseTestCase):
         )
 
 
+class DoctorCaseBundleTest(QueryCountAssertionsMixin, DoctorBaseTestCase):
+
+    def _url(self, test, prefetch=0):
+        return f"/api/doctor/cases/{test.id}/bundle/?prefetch={prefetch}"
+
+    def _add_history(self, n):
+        for i in range(n):
+            PastMedicalHistory.objects.create(
+                patient=self.patient_profile,
+                condition_name=f"Condition {i}",
+                diagnosed_on="2024-01-01",
+                status="RESOLVED"
+            )
+            prior = DiagnosticTest.objects.create(
+                patient=self.patient_profile, test_type="TB", status="AI_DONE"
+            )
+            AIInferenceResult.objects.create(
+                test=prior, model_name="TB", risk_score=0.2,
+                risk_level="LOW", confidence=0.9
+            )
+
+    def _claimed_case(self):
+        test = DiagnosticTest.objects.create(
+            patient=self.patient_profile, test_type="TB", status="AI_DONE"
+        )
+        Referral.objects.create(
+            test=test, urgency="ROUTINE", status="PENDING",
+            claimed_by=self.doctor_profile, claimed_at=timezone.now()
+        )
+        return test
+
+    def test_bundle_contains_full_case(self):
+        ClinicalContext.objects.create(
+            test=self.test, symptoms={"cough": True}, auto_history_snapshot={}
+        )
+        DiagnosticReport.objects.create(test=self.test, final_risk_level="HIGH")
+        self._add_history(2)
+
+        response = self.client.get(self._url(self.test))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        case = response.data["case"]
+        self.assertEqual(case["ai_result"]["risk_level"], "HIGH")
+        self.assertEqual(case["clinical_context"]["symptoms"], {"cough": True})
+        self.assertEqual(case["report"]["status"], "PENDING")
+        self.assertEqual(case["referral"]["urgency"], "HIGH")
+        self.assertEqual(len(case["patient"]["medical_history"]), 2)
+        self.assertEqual(len(case["prior_tests"]), 2)
+        self.assertNotIn(str(self.test.id), [str(t["id"]) for t in case["prior_tests"]])
+        self.assertEqual(response.data["next_cases"], [])
+
+    def test_query_count_independent_of_history(self):
+        self.assertConstantQueries(
+            lambda: self.client.get(self._url(self.test)), self._add_history
+        )
+
+    def test_prefetches_next_claimed_cases(self):
+        self.assertConstantQueries(
+            lambda: self.client.get(self._url(self.test, prefetch=5)),
+            lambda n: [self._claimed_case() for _ in range(n)],
+            small=1, large=5
+        )
+
+        response = self.client.get(self._url(self.test, prefetch=2))
+        self.assertEqual(len(response.data["next_cases"]), 2)
+
+    def test_other_doctors_case_is_not_found(self):
+        self.referral.referred_to = None
+        self.referral.save()
+
+        response = self.client.get(self._url(self.test))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
 class DoctorReviewTest(DoctorBaseTestCase):
 
     def test_doctor_can_submit_review(self):
@@ -140,6 +328,22 @@ class DoctorReviewTest(DoctorBaseTestCase):
         self.referral.refresh_from_db()
         self.assertEqual(self.referral.status, "REVIEWED")
 
+    def test_review_queues_signed_report(self):
+        DiagnosticReport.objects.create(
+            test=self.test, final_risk_level="HIGH", status="READY"
+        )
+
+        self.client.post(
+            f"/api/doctor/referrals/{self.referral.id}/review/",
+            {"decision": "CONFIRM", "notes": ""},
+            format="json"
+        )
+
+        report = DiagnosticReport.objects.get(test=self.test)
+        self.assertTrue(report.doctor_signed)
+        self.assertEqual(report.status, "PENDING")
+        self.assertEqual(report.revision, 1)
+
 
 class DoctorCloseReferralTest(DoctorBaseTestCase):
 
@@ -1,14 +1,27 @@
 from django.urls import path
 from doctor.views import (
     DoctorReferralListView,
+    DoctorQueueView,
+    DoctorQueueClaimView,
+    DoctorReleaseClaimView,
     DoctorCaseDetailView,
+    DoctorCaseBundleView,
+    DoctorCaseFileView,
+    DoctorCaseReportView,
     DoctorReviewCreateView,
     DoctorCloseReferralView
 )
 
 urlpatterns = [
     path("referrals/", DoctorReferralListView.as_view()),
+    path("queue/", DoctorQueueView.as_view()),
+    path("queue/claim/", DoctorQueueClaimView.as_view()),
     path("cases/<uuid:test_id>/", DoctorCaseDetailView.as_view()),
+    path("cases/<uuid:test_id>/bundle/", DoctorCaseBundleView.as_view()),
+    path("cases/<uuid:test_id>/image/", DoctorCaseFileView.as_view(), {"kind": "image"}),
+    path("cases/<uuid:test_id>/heatmap/", DoctorCaseFileView.as_view(), {"kind": "heatmap"}),
+    path("cases/<uuid:test_id>/report/", DoctorCaseReportView.as_view()),
     path("referrals/<int:referral_id>/review/", DoctorReviewCreateView.as_view()),
     path("referrals/<int:referral_id>/close/", DoctorCloseReferralView.as_view()),
+    path("referrals/<int:referral_id>/release/", DoctorReleaseClaimView.as_view()),
 ]
\ No newline at end of file
@@ -1,18 +1,33 @@
 from rest_framework.views import APIView, Response, status
 from rest_framework.permissions import IsAuthenticated
+from django.conf import settings
 from django.shortcuts import get_object_or_404
 
 from doctor.permissions import IsDoctor
 from doctor.serializers import (
     DoctorReferralListSerializer,
+    DoctorClaimSerializer,
     DoctorCaseDetailSerializer,
+    DoctorCaseBundleSerializer,
     DoctorReviewSerializer
 )
 from core.models import (
     Referral,
-    DiagnosticTest
+    DiagnosticTest,
+    DiagnosticReport
 )
+from core.downloads import serve_file
+from core.pagination import paginated_response
 from doctor.models import DoctorReview
+from doctor.services.referral_queue import (
+    assigned_to,
+    claim_referrals,
+    claimed_queryset,
+    prioritized,
+    release_claim,
+)
+from practitioner.services.ai_service import ensure_heatmap, test_file
+from practitioner.services.report_service import ensure_report
 
 
 class DoctorReferralListView(APIView):
@@ -22,14 +37,51 @@ class DoctorReferralListView(APIView):
         referrals = Referral.objects.filter(
             referred_to=request.user.doctor_profile,
             status="PENDING"
-        ).select_related("test", "test__patient", "test__patient__user")
+        ).select_related("test", "test__patient", "test__patient__user", "test__aiinferenceresult")
+
+        return paginated_response(request, referrals, DoctorReferralListSerializer, "-created_at")
+
+
+class DoctorQueueView(APIView):
+    """The doctor's claimed cases, most urgent first."""
+    permission_classes = [IsAuthenticated, IsDoctor]
 
-        serializer = DoctorReferralListSerializer(referrals, many=True)
+    def get(self, request):
+        referrals = prioritized(claimed_queryset(request.user.doctor_profile))
+        serializer = DoctorReferralListSerializer(
+            referrals, many=True, context={"request": request}
+        )
         return Response(serializer.data)
 
 
+class DoctorQueueClaimView(APIView):
+    permission_classes = [IsAuthenticated, IsDoctor]
 
+    def post(self, request):
+        serializer = DoctorClaimSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
 
+        count = min(serializer.validated_data["count"], settings.REFERRAL_CLAIM_MAX)
+        referrals = claim_referrals(request.user.doctor_profile, count)
+
+        return Response(
+            DoctorReferralListSerializer(
+                referrals, many=True, context={"request": request}
+            ).data
+        )
+
+
+class DoctorReleaseClaimView(APIView):
+    permission_classes = [IsAuthenticated, IsDoctor]
+
+    def post(self, request, referral_id):
+        if not release_claim(request.user.doctor_profile, referral_id):
+            return Response(
+                {"error": "Referral is not claimed by you"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        return Response({"message": "Referral released"})
 
 class DoctorCaseDetailView(APIView):
     permission_classes = [IsAuthenticated, IsDoctor]
@@ -37,14 +89,107 @@ class DoctorCaseDetailView(APIView):
     def get(self, request, test_id):
         test = get_object_or_404(
             DiagnosticTest,
-            id=test_id,
-            referral__referred_to=request.user.doctor_profile
+            assigned_to(request.user.doctor_profile, "referral__"),
+            id=test_id
         )
 
+        if hasattr(test, "aiinferenceresult"):
+            ensure_heatmap(test.aiinferenceresult)
+
         serializer = DoctorCaseDetailSerializer(test)
         return Response(serializer.data)
 
 
+class DoctorCaseBundleView(APIView):
+    """
+    The case with its patient, history, clinical context, AI result, report
+    and prior tests in a fixed number of queries. ``?prefetch=N`` also
+    returns the next N cases of the doctor's claimed queue, loaded in the
+    same batched queries, so the client can open them without a round trip.
+    """
+    permission_classes = [IsAuthenticated, IsDoctor]
+
+    MAX_PREFETCH = 5
+
+    def get(self, request, test_id):
+        doctor = request.user.doctor_profile
+        cases = DoctorCaseBundleSerializer.setup_eager_loading(DiagnosticTest.objects.all())
+
+        test = get_object_or_404(cases, assigned_to(doctor, "referral__"), id=test_id)
+        if hasattr(test, "aiinferenceresult"):
+            ensure_heatmap(test.aiinferenceresult)
+
+        try:
+            prefetch = min(int(request.query_params.get("prefetch", 0)), self.MAX_PREFETCH)
+        except ValueError:
+            return Response(
+                {"error": "prefetch must be an integer"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        next_cases = []
+        if prefetch > 0:
+            next_ids = list(
+                prioritized(claimed_queryset(doctor).exclude(test_id=test_id))
+                .values_list("test_id", flat=True)[:prefetch]
+            )
+            if next_ids:
+                by_id = {case.id: case for case in cases.filter(id__in=next_ids)}
+                next_cases = [by_id[i] for i in next_ids if i in by_id]
+
+        context = {"request": request}
+        return Response({
+            "case": DoctorCaseBundleSerializer(test, context=context).data,
+            "next_cases": DoctorCaseBundleSerializer(next_cases, many=True, context=context).data,
+        })
+
+
+class DoctorCaseFileView(APIView):
+    """The uploaded scan (``image``) or Grad-CAM overlay (``heatmap``) of a case."""
+    permission_classes = [IsAuthenticated, IsDoctor]
+
+    def get(self, request, test_id, kind):
+        test = get_object_or_404(
+            DiagnosticTest.objects.select_related("aiinferenceresult"),
+            assigned_to(request.user.doctor_profile, "referral__"),
+            id=test_id
+        )
+
+        field_file = test_file(test, kind)
+        if not field_file:
+            return Response(
+                {"error": f"No {kind} for this case"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return serve_file(request, field_file)
+
+
+class DoctorCaseReportView(APIView):
+    permission_classes = [IsAuthenticated, IsDoctor]
+
+    def get(self, request, test_id):
+        report = get_object_or_404(
+            DiagnosticReport,
+            assigned_to(request.user.doctor_profile, "test__referral__"),
+            test__id=test_id
+        )
+
+        report = ensure_report(report)
+        if report.status == "FAILED":
+            return Response(
+                {"status": report.status, "message": "Report could not be generated"},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        if report.status != "READY":
+            return Response(
+                {"status": report.status, "message": "Report is being generated"},
+                status=status.HTTP_202_ACCEPTED,
+                headers={"Retry-After": "5"}
+            )
+
+        return serve_file(request, report.report_pdf, filename=f"report_{test_id}.pdf")
+
+
 class DoctorReviewCreateView(APIView):
     permission_classes = [IsAuthenticated, IsDoctor]
 
@@ -54,8 +199,8 @@ class DoctorReviewCreateView(APIView):
 
         referral = get_object_or_404(
             Referral,
-            id=referral_id,
-            referred_to=request.user.doctor_profile
+            assigned_to(request.user.doctor_profile),
+            id=referral_id
         )
 
         DoctorReview.objects.create(
@@ -76,8 +221,8 @@ class DoctorCloseReferralView(APIView):
     def post(self, request, referral_id):
         referral = get_object_or_404(
             Referral,
-            id=referral_id,
-            referred_to=request.user.doctor_profile
+            assigned_to(request.user.doctor_profile),
+            id=referral_id
         )
 
         referral.status = "CLOSED"
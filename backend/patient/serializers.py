@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from core.models import PatientProfile, DiagnosticTest, AIInferenceResult, Appointment, Referral
+from core.serializers import SparseFieldsetMixin
 
 class PatientProfileSerializer(serializers.ModelSerializer):
     # User-level fields
@@ -26,7 +27,7 @@ class PatientProfileSerializer(serializers.ModelSerializer):
         ]
 
 
-class PatientTestListSerializer(serializers.ModelSerializer):
+class PatientTestListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     risk_level = serializers.SerializerMethodField()
 
     class Meta:
@@ -39,6 +40,13 @@ class PatientTestListSerializer(serializers.ModelSerializer):
             'risk_level',
         ]
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related('aiinferenceresult').only(
+            'id', 'test_type', 'test_date', 'status',
+            'aiinferenceresult__risk_level',
+        )
+
     def get_risk_level(self, obj):
         if hasattr(obj, 'aiinferenceresult'):
             return obj.aiinferenceresult.risk_level
@@ -58,6 +66,10 @@ class PatientTestDetailSerializer(serializers.ModelSerializer):
             'ai_result',
         ]
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related('aiinferenceresult')
+
     def get_ai_result(self, obj):
         if not hasattr(obj, 'aiinferenceresult'):
             return None
@@ -71,7 +83,7 @@ class PatientTestDetailSerializer(serializers.ModelSerializer):
         }
 
 
-class PatientAppointmentSerializer(serializers.ModelSerializer):
+class PatientAppointmentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     doctor_name = serializers.SerializerMethodField()
 
     class Meta:
@@ -85,6 +97,13 @@ class PatientAppointmentSerializer(serializers.ModelSerializer):
             'doctor_name',
         ]
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related('doctor__user').only(
+            'id', 'appointment_type', 'mode', 'scheduled_time', 'status',
+            'doctor__user__full_name',
+        )
+
     def get_doctor_name(self, obj):
         if obj.doctor:
             return obj.doctor.user.full_name
@@ -96,7 +115,7 @@ class PatientAppointmentCreateSerializer(serializers.Serializer):
     scheduled_time = serializers.DateTimeField()
     
 
-class PatientReferralSerializer(serializers.ModelSerializer):
+class PatientReferralSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     doctor_name = serializers.SerializerMethodField()
 
     class Meta:
@@ -109,6 +128,13 @@ class PatientReferralSerializer(serializers.ModelSerializer):
             'created_at',
         ]
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related('referred_to__user').only(
+            'id', 'urgency', 'status', 'created_at',
+            'referred_to__user__full_name',
+        )
+
     def get_doctor_name(self, obj):
         if obj.referred_to:
             return obj.referred_to.user.full_name
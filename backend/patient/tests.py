@@ -1,5 +1,6 @@
 from rest_framework.test import APITestCase
 from rest_framework import status
+from django.test import override_settings
 from django.utils import timezone
 from datetime import timedelta
 
@@ -7,13 +8,17 @@ from core.models import (
     User,
     PatientProfile,
     PractitionerProfile,
+    DoctorProfile,
     DiagnosticTest,
     AIInferenceResult,
+    DiagnosticReport,
     Appointment,
     Referral
 )
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from core.testing import QueryCountAssertionsMixin
+
 
 class PatientBaseTestCase(APITestCase):
 
@@ -101,6 +106,122 @@ class PatientTestDetailTest(PatientBaseTestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["ai_result"]["risk_level"], "LOW")
 
+    def test_pending_report_is_rendered_on_download(self):
+        DiagnosticReport.objects.create(test=self.test, final_risk_level="LOW")
+
+        response = self.client.get(f"/api/patient/reports/{self.test.id}/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(b"".join(response.streaming_content).startswith(b"%PDF"))
+        self.assertEqual(DiagnosticReport.objects.get(test=self.test).status, "READY")
+
+    def test_report_download_revalidates_with_etag(self):
+        DiagnosticReport.objects.create(test=self.test, final_risk_level="LOW")
+        url = f"/api/patient/reports/{self.test.id}/"
+
+        first = self.client.get(url)
+        b"".join(first.streaming_content)
+        self.assertIn("private", first["Cache-Control"])
+
+        second = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+
+        self.assertEqual(second.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_report_download_serves_byte_ranges(self):
+        DiagnosticReport.objects.create(test=self.test, final_risk_level="LOW")
+        url = f"/api/patient/reports/{self.test.id}/"
+        full = b"".join(self.client.get(url).streaming_content)
+
+        response = self.client.get(url, HTTP_RANGE="bytes=0-3")
+
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(b"".join(response.streaming_content), b"%PDF")
+        self.assertEqual(response["Content-Range"], f"bytes 0-3/{len(full)}")
+
+    def test_heatmap_is_404_until_available(self):
+        response = self.client.get(f"/api/patient/tests/{self.test.id}/heatmap/")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_report_rendered_elsewhere_returns_accepted(self):
+        DiagnosticReport.objects.create(
+            test=self.test,
+            final_risk_level="LOW",
+            status="RENDERING",
+            render_started_at=timezone.now()
+        )
+
+        response = self.client.get(f"/api/patient/reports/{self.test.id}/")
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response["Retry-After"], "5")
+
+
+@override_settings(RESPONSE_CACHE_SECONDS=300)
+class PatientResponseCacheTest(PatientBaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        self.test = DiagnosticTest.objects.create(
+            patient=self.patient_profile,
+            test_type="TB",
+            status="AI_DONE"
+        )
+        AIInferenceResult.objects.create(
+            test=self.test,
+            model_name="TB_MODEL",
+            risk_score=0.82,
+            risk_level="HIGH",
+            confidence=0.9
+        )
+
+    def test_repeat_poll_is_served_from_cache(self):
+        first = self.client.get("/api/patient/tests/")
+
+        with self.assertNumQueries(0):
+            second = self.client.get("/api/patient/tests/")
+
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_unchanged_poll_returns_not_modified(self):
+        etag = self.client.get(f"/api/patient/tests/{self.test.id}/")["ETag"]
+
+        response = self.client.get(
+            f"/api/patient/tests/{self.test.id}/", HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_save_invalidates_cached_responses(self):
+        etag = self.client.get("/api/patient/tests/")["ETag"]
+
+        result = self.test.aiinferenceresult
+        result.risk_level = "LOW"
+        result.save()
+
+        response = self.client.get("/api/patient/tests/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]["risk_level"], "LOW")
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_profile_is_cached_per_user(self):
+        self.client.get("/api/patient/me/")
+
+        self.patient_user.full_name = "Renamed"
+        self.patient_user.save()
+
+        self.assertEqual(self.client.get("/api/patient/me/").data["name"], "Renamed")
+
+    @override_settings(RESPONSE_CACHE_SECONDS=0)
+    def test_disabled_without_shared_cache(self):
+        response = self.client.get("/api/patient/tests/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.has_header("ETag"))
+
 
 class PatientAppointmentTest(PatientBaseTestCase):
 
@@ -167,4 +288,115 @@ class PatientReferralTest(PatientBaseTestCase):
         response = self.client.get("/api/patient/referrals/")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
\ No newline at end of file
+        self.assertEqual(len(response.data), 1)
+
+
+class PatientListQueryCountTest(QueryCountAssertionsMixin, PatientBaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.created = 0
+
+    def _doctor(self):
+        self.created += 1
+        user = User.objects.create_user(
+            phone=f"70000{self.created:05d}",
+            password="password123",
+            full_name=f"Dr {self.created}",
+            email=f"doctor{self.created}@test.com",
+            role="DOCTOR"
+        )
+        return DoctorProfile.objects.create(
+            user=user,
+            specialization="GENERAL",
+            hospital_name="Hospital",
+            registration_number=f"REG{self.created}",
+            years_of_experience=5
+        )
+
+    def _tests(self, n):
+        for _ in range(n):
+            test = DiagnosticTest.objects.create(
+                patient=self.patient_profile,
+                test_type="TB",
+                status="AI_DONE"
+            )
+            AIInferenceResult.objects.create(
+                test=test,
+                model_name="TB",
+                risk_score=0.5,
+                risk_level="LOW",
+                confidence=0.5
+            )
+            yield test
+
+    def _get(self, url):
+        return lambda: self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+    def test_test_list(self):
+        self.assertConstantQueries(
+            self._get("/api/patient/tests/"),
+            lambda n: list(self._tests(n))
+        )
+
+    def test_appointment_list(self):
+        def add(n):
+            for _ in range(n):
+                Appointment.objects.create(
+                    patient=self.patient_profile,
+                    doctor=self._doctor(),
+                    appointment_type="CONSULTATION",
+                    mode="ONLINE",
+                    scheduled_time=timezone.now(),
+                    status="BOOKED"
+                )
+
+        self.assertConstantQueries(self._get("/api/patient/appointments/"), add)
+
+    def test_referral_list(self):
+        def add(n):
+            for test in self._tests(n):
+                Referral.objects.create(
+                    test=test,
+                    referred_to=self._doctor(),
+                    urgency="ROUTINE",
+                    reason="Follow-up"
+                )
+
+        self.assertConstantQueries(self._get("/api/patient/referrals/"), add)
+
+
+class PatientListPaginationTest(PatientBaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        for _ in range(5):
+            DiagnosticTest.objects.create(
+                patient=self.patient_profile,
+                test_type="TB",
+                status="AI_DONE"
+            )
+
+    def test_cursor_pages_cover_every_row_once(self):
+        seen = []
+        url = "/api/patient/tests/?page_size=2"
+
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data), 2)
+            seen.extend(row["id"] for row in response.data)
+
+            link = response.headers.get("Link", "")
+            url = next(
+                (part.split(";")[0].strip()[1:-1] for part in link.split(",") if 'rel="next"' in part),
+                None
+            )
+
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(len(set(seen)), 5)
+
+    def test_sparse_fieldset(self):
+        response = self.client.get("/api/patient/tests/?fields=id,status")
+
+        self.assertEqual(set(response.data[0]), {"id", "status"})
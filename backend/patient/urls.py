@@ -4,6 +4,7 @@ from patient.views import (
     PatientTestListView,
     PatientTestDetailView,
     PatientReportDownloadView,
+    PatientTestImageView,
     PatientAppointmentListView,
     PatientAppointmentCreateView,
     PatientReferralListView
@@ -13,6 +14,8 @@ urlpatterns = [
     path('me/', PatientMeView.as_view()),
     path('tests/', PatientTestListView.as_view()),
     path('tests/<test_id>/', PatientTestDetailView.as_view()),
+    path('tests/<test_id>/image/', PatientTestImageView.as_view(), {'kind': 'image'}),
+    path('tests/<test_id>/heatmap/', PatientTestImageView.as_view(), {'kind': 'heatmap'}),
     path('reports/<test_id>/', PatientReportDownloadView.as_view()),
     path('appointments/', PatientAppointmentListView.as_view()),
     path('appointments/book/', PatientAppointmentCreateView.as_view()),
@@ -1,7 +1,6 @@
 from rest_framework.views import APIView, Response, status
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
-from django.http import FileResponse
 
 from patient.permissions import IsPatient
 from patient.serializers import (
@@ -18,11 +17,17 @@ from core.models import (
     Appointment,
     Referral
 )
+from core.downloads import serve_file
+from core.pagination import paginated_response
+from core.response_cache import cache_patient_response
+from practitioner.services.ai_service import ensure_heatmap, test_file
+from practitioner.services.report_service import ensure_report
 
 
 class PatientMeView(APIView):
     permission_classes = [IsAuthenticated, IsPatient]
 
+    @cache_patient_response
     def get(self, request):
         profile = request.user.patient_profile
         serializer = PatientProfileSerializer(profile)
@@ -32,25 +37,31 @@ class PatientMeView(APIView):
 class PatientTestListView(APIView):
     permission_classes = [IsAuthenticated, IsPatient]
 
+    @cache_patient_response
     def get(self, request):
-        tests = DiagnosticTest.objects.filter(
-            patient=request.user.patient_profile
-        ).order_by('-test_date')
+        tests = PatientTestListSerializer.setup_eager_loading(
+            DiagnosticTest.objects.filter(
+                patient=request.user.patient_profile
+            )
+        )
 
-        serializer = PatientTestListSerializer(tests, many=True)
-        return Response(serializer.data)
+        return paginated_response(request, tests, PatientTestListSerializer, '-test_date')
     
 
 class PatientTestDetailView(APIView):
     permission_classes = [IsAuthenticated, IsPatient]
 
+    @cache_patient_response
     def get(self, request, test_id):
         test = get_object_or_404(
-            DiagnosticTest,
+            PatientTestDetailSerializer.setup_eager_loading(DiagnosticTest.objects),
             id=test_id,
             patient=request.user.patient_profile
         )
 
+        if hasattr(test, 'aiinferenceresult'):
+            ensure_heatmap(test.aiinferenceresult)
+
         serializer = PatientTestDetailSerializer(test)
         return Response(serializer.data)
 
@@ -65,22 +76,59 @@ class PatientReportDownloadView(APIView):
             test__patient=request.user.patient_profile
         )
 
-        return FileResponse(
-            report.report_pdf.open(),
-            as_attachment=True,
-            filename=f"report_{test_id}.pdf"
+        report = ensure_report(report)
+        if report.status == "FAILED":
+            return Response(
+                {"status": report.status, "message": "Report could not be generated"},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        if report.status != "READY":
+            return Response(
+                {"status": report.status, "message": "Report is being generated"},
+                status=status.HTTP_202_ACCEPTED,
+                headers={"Retry-After": "5"}
+            )
+
+        return serve_file(
+            request,
+            report.report_pdf,
+            filename=f"report_{test_id}.pdf",
+            as_attachment=True
+        )
+
+
+class PatientTestImageView(APIView):
+    """The uploaded scan (``image``) or its Grad-CAM overlay (``heatmap``)."""
+    permission_classes = [IsAuthenticated, IsPatient]
+
+    def get(self, request, test_id, kind):
+        test = get_object_or_404(
+            DiagnosticTest.objects.select_related("aiinferenceresult"),
+            id=test_id,
+            patient=request.user.patient_profile
         )
 
+        field_file = test_file(test, kind)
+        if not field_file:
+            return Response(
+                {"error": f"No {kind} for this test"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return serve_file(request, field_file)
+
 class PatientAppointmentListView(APIView):
     permission_classes = [IsAuthenticated, IsPatient]
 
     def get(self, request):
-        appointments = Appointment.objects.filter(
-            patient=request.user.patient_profile
-        ).order_by('-scheduled_time')
+        appointments = PatientAppointmentSerializer.setup_eager_loading(
+            Appointment.objects.filter(
+                patient=request.user.patient_profile
+            )
+        )
 
-        serializer = PatientAppointmentSerializer(appointments, many=True)
-        return Response(serializer.data)
+        return paginated_response(
+            request, appointments, PatientAppointmentSerializer, '-scheduled_time'
+        )
     
 
 class PatientAppointmentCreateView(APIView):
@@ -105,9 +153,10 @@ class PatientReferralListView(APIView):
     permission_classes = [IsAuthenticated, IsPatient]
 
     def get(self, request):
-        referrals = Referral.objects.filter(
-            test__patient=request.user.patient_profile
+        referrals = PatientReferralSerializer.setup_eager_loading(
+            Referral.objects.filter(
+                test__patient=request.user.patient_profile
+            )
         )
 
-        serializer = PatientReferralSerializer(referrals, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        return paginated_response(request, referrals, PatientReferralSerializer, '-created_at')
\ No newline at end of file
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class PractitionerConfig(AppConfig):
     name = 'practitioner'
+
+    def ready(self):
+        from practitioner import signals  # noqa: F401
@@ -0,0 +1,57 @@
+import os
+import time
+
+import torch
+from django.core.management.base import BaseCommand
+
+from ai.breast_cancer.backends import get_classifier
+from ai.startup import breast_cancer_backend_path
+
+
+class Command(BaseCommand):
+    help = "Report per-image latency and throughput of each breast cancer backend"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--backends",
+            nargs="+",
+            default=["eager", "torchscript", "onnxruntime", "quantized"],
+        )
+        parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 8])
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=3)
+        parser.add_argument("--threads", type=int, default=None)
+
+    def handle(self, *args, **options):
+        if options["threads"]:
+            torch.set_num_threads(options["threads"])
+
+        self.stdout.write(
+            f"{'backend':<12} {'batch':>5} {'ms/image':>10} {'images/s':>10}"
+        )
+
+        for backend in options["backends"]:
+            path = breast_cancer_backend_path(backend)
+            if not os.path.exists(path):
+                self.stdout.write(self.style.WARNING(f"{backend:<12} skipped, {path} not found"))
+                continue
+
+            model = get_classifier(backend, path)
+
+            for batch_size in options["batch_sizes"]:
+                batch = torch.rand(batch_size, 3, 224, 224)
+
+                with torch.no_grad():
+                    for _ in range(options["warmup"]):
+                        model(batch)
+
+                    start = time.perf_counter()
+                    for _ in range(options["iterations"]):
+                        model(batch)
+                    elapsed = time.perf_counter() - start
+
+                images = batch_size * options["iterations"]
+                self.stdout.write(
+                    f"{backend:<12} {batch_size:>5} "
+                    f"{1000 * elapsed / images:>10.2f} {images / elapsed:>10.1f}"
+                )
\ No newline at end of file
@@ -0,0 +1,45 @@
+import resource
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ai.breast_cancer.preprocessing import load_image
+from core.models import DiagnosticTest
+
+
+class Command(BaseCommand):
+    help = "Report decode latency and peak memory per image of the scan loader"
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="*", help="Image files (defaults to stored scans)")
+        parser.add_argument("--limit", type=int, default=20)
+        parser.add_argument("--iterations", type=int, default=3)
+
+    def handle(self, *args, **options):
+        paths = options["paths"] or [
+            test.raw_image.path
+            for test in DiagnosticTest.objects.exclude(raw_image="")
+            .only("id", "raw_image")[:options["limit"]]
+        ]
+        if not paths:
+            raise CommandError("No images to benchmark")
+
+        self.stdout.write(f"{'ms/image':>10} {'peak MB':>10}  path")
+
+        for path in paths:
+            load_image(path)
+
+            tracemalloc.start()
+            start = time.perf_counter()
+            for _ in range(options["iterations"]):
+                load_image(path)
+            elapsed = (time.perf_counter() - start) / options["iterations"]
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            self.stdout.write(f"{1000 * elapsed:>10.1f} {peak / (1024 * 1024):>10.1f}  {path}")
+
+        # ru_maxrss is reported in kilobytes on Linux
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        self.stdout.write(f"Process peak RSS: {maxrss:.1f} MB")
\ No newline at end of file
@@ -0,0 +1,46 @@
+import resource
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ai.report_generator import render_report
+from core.models import AIInferenceResult
+
+
+class Command(BaseCommand):
+    help = "Report PDF rendering throughput (reports/sec) and peak memory"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=50)
+        parser.add_argument("--iterations", type=int, default=3)
+
+    def handle(self, *args, **options):
+        results = list(
+            AIInferenceResult.objects.select_related("test__patient__user")[:options["limit"]]
+        )
+        if not results:
+            raise CommandError("No AI results to render reports for")
+
+        # Warm-up: font metrics and the page template are cached after this
+        render_report(results[0].test, results[0])
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        total_bytes = 0
+        for _ in range(options["iterations"]):
+            for ai_result in results:
+                total_bytes += len(render_report(ai_result.test, ai_result))
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        reports = len(results) * options["iterations"]
+        self.stdout.write(f"Reports rendered:  {reports}")
+        self.stdout.write(f"Reports/sec:       {reports / elapsed:.1f}")
+        self.stdout.write(f"Mean PDF size:     {total_bytes / reports / 1024:.1f} KB")
+        self.stdout.write(f"Peak traced alloc: {peak / (1024 * 1024):.1f} MB")
+
+        # ru_maxrss is reported in kilobytes on Linux
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        self.stdout.write(f"Process peak RSS:  {maxrss:.1f} MB")
@@ -0,0 +1,35 @@
+import torch
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ai.breast_cancer.backends import export_onnx, export_torchscript
+from ai.breast_cancer.model import load_breast_cancer_model
+
+
+class Command(BaseCommand):
+    help = "Export the breast cancer checkpoint to TorchScript and ONNX"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--checkpoint", default=settings.BREAST_CANCER_MODEL_PATH)
+        parser.add_argument("--torchscript", default=settings.BREAST_CANCER_TORCHSCRIPT_PATH)
+        parser.add_argument("--onnx", default=settings.BREAST_CANCER_ONNX_PATH)
+        parser.add_argument("--opset", type=int, default=17)
+        parser.add_argument(
+            "--format",
+            choices=["all", "torchscript", "onnx"],
+            default="all",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            model = load_breast_cancer_model(options["checkpoint"], torch.device("cpu"))
+        except FileNotFoundError as exc:
+            raise CommandError(f"Checkpoint not found: {options['checkpoint']}") from exc
+
+        if options["format"] in ("all", "torchscript"):
+            export_torchscript(model, options["torchscript"])
+            self.stdout.write(self.style.SUCCESS(f"TorchScript written to {options['torchscript']}"))
+
+        if options["format"] in ("all", "onnx"):
+            export_onnx(model, options["onnx"], opset=options["opset"])
+            self.stdout.write(self.style.SUCCESS(f"ONNX written to {options['onnx']}"))
\ No newline at end of file
@@ -0,0 +1,90 @@
+import random
+
+import torch
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ai.breast_cancer.inference import load_image
+from ai.breast_cancer.model import load_breast_cancer_model
+from ai.breast_cancer.quantization import (
+    compare_predictions,
+    quantize,
+    save_quantized,
+    seconds_per_image,
+    serialized_size_mb,
+)
+from core.models import DiagnosticTest
+
+
+def _batches(paths, batch_size):
+    images = [torch.tensor(load_image(path)).unsqueeze(0).repeat(3, 1, 1) for path in paths]
+    return [torch.stack(images[i:i + batch_size]) for i in range(0, len(images), batch_size)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Build an INT8 breast cancer model calibrated on stored scans and "
+        "report accuracy drift, latency and size against fp32"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--mode", choices=["static", "dynamic"], default="static")
+        parser.add_argument("--checkpoint", default=settings.BREAST_CANCER_MODEL_PATH)
+        parser.add_argument("--output", default=settings.BREAST_CANCER_QUANTIZED_PATH)
+        parser.add_argument("--calibration-size", type=int, default=64)
+        parser.add_argument("--holdout-size", type=int, default=64)
+        parser.add_argument("--batch-size", type=int, default=8)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        try:
+            fp32 = load_breast_cancer_model(options["checkpoint"], torch.device("cpu"))
+        except FileNotFoundError as exc:
+            raise CommandError(f"Checkpoint not found: {options['checkpoint']}") from exc
+
+        paths = [
+            test.raw_image.path
+            for test in DiagnosticTest.objects.filter(test_type="BREAST_CANCER")
+            .exclude(raw_image="")
+            .only("id", "raw_image")
+            .iterator()
+        ]
+        random.Random(options["seed"]).shuffle(paths)
+
+        calibration = paths[:options["calibration_size"]]
+        holdout = paths[options["calibration_size"]:options["calibration_size"] + options["holdout_size"]]
+        self.stdout.write(
+            f"Using {len(calibration)} calibration and {len(holdout)} held-out scans"
+        )
+
+        calibration_batches = _batches(calibration, options["batch_size"])
+        holdout_batches = _batches(holdout, options["batch_size"])
+
+        int8, mode = quantize(fp32, options["mode"], calibration_batches)
+        if mode != options["mode"]:
+            self.stdout.write(self.style.WARNING(f"Fell back to {mode} quantization"))
+
+        save_quantized(int8, options["output"])
+        int8 = torch.jit.load(options["output"])
+        self.stdout.write(self.style.SUCCESS(f"{mode} INT8 model written to {options['output']}"))
+
+        if not holdout_batches:
+            self.stdout.write(self.style.WARNING("No held-out scans, skipping drift report"))
+            return
+
+        drift = compare_predictions(fp32, int8, holdout_batches)
+        self.stdout.write(
+            f"Class agreement: {drift['class_agreement']:.2%} over {drift['images']} images\n"
+            f"Confidence delta: mean {drift['mean_confidence_delta']:.4f}, "
+            f"max {drift['max_confidence_delta']:.4f}"
+        )
+
+        fp32_latency = seconds_per_image(fp32, holdout_batches)
+        int8_latency = seconds_per_image(int8, holdout_batches)
+        self.stdout.write(
+            f"Latency: fp32 {1000 * fp32_latency:.2f} ms/image, "
+            f"int8 {1000 * int8_latency:.2f} ms/image "
+            f"({fp32_latency / int8_latency:.2f}x)\n"
+            f"Size: fp32 {serialized_size_mb(fp32):.1f} MB, "
+            f"int8 {serialized_size_mb(int8):.1f} MB"
+        )
\ No newline at end of file
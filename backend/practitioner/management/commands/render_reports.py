@@ -0,0 +1,70 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from practitioner.services.report_service import claim_reports, render
+
+
+def _render_in_thread(report):
+    try:
+        return render(report)
+    finally:
+        close_old_connections()
+
+
+class Command(BaseCommand):
+    help = "Render pending diagnostic report PDFs in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.REPORT_RENDER_BATCH_SIZE,
+            help="Number of reports claimed per round",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=settings.REPORT_RENDER_CONCURRENCY,
+            help="Reports rendered in parallel",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.REPORT_RENDER_POLL_SECONDS,
+            help="Seconds to sleep when nothing is pending",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once no report is pending instead of polling forever",
+        )
+
+    def handle(self, *args, **options):
+        concurrency = max(1, options["concurrency"])
+        rendered = failed = 0
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            while True:
+                reports = claim_reports(options["batch_size"])
+                if not reports:
+                    if options["burst"]:
+                        break
+                    time.sleep(options["poll_interval"])
+                    continue
+
+                if concurrency == 1:
+                    results = [render(report) for report in reports]
+                else:
+                    results = list(pool.map(_render_in_thread, reports))
+
+                for report in results:
+                    if report.status == "FAILED":
+                        failed += 1
+                    else:
+                        rendered += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Rendered {rendered} report(s), {failed} failed."))
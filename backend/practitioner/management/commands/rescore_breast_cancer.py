@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ai.breast_cancer.backends import BACKENDS
+from ai.startup import breast_cancer_backend_path
+from practitioner.services.rescoring import rescore_breast_cancer
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-score stored breast cancer tests with the current model. "
+        "Resumable: tests already scored with --model-version are skipped"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model-version", default=settings.BREAST_CANCER_MODEL_VERSION)
+        parser.add_argument("--checkpoint-path", default=None,
+                            help="Model weights (defaults to the path for --backend)")
+        parser.add_argument("--backend", choices=sorted(BACKENDS), default=settings.BREAST_CANCER_BACKEND)
+        parser.add_argument("--batch-size", type=int, default=32)
+        parser.add_argument("--workers", type=int, default=4,
+                            help="Decode processes (0 decodes in this process)")
+        parser.add_argument("--state-file", default="rescore_breast_cancer.json",
+                            help="Progress file used to resume an interrupted run")
+        parser.add_argument("--limit", type=int, default=None)
+
+    def handle(self, *args, **options):
+        model_path = options["checkpoint_path"] or breast_cancer_backend_path(options["backend"])
+
+        def progress(stats, elapsed):
+            rate = stats["processed"] / elapsed if elapsed else 0.0
+            self.stdout.write(f"{stats['processed']} rescored, {stats['failed']} failed, {rate:.1f} images/sec")
+
+        try:
+            stats = rescore_breast_cancer(
+                model_path,
+                options["model_version"],
+                backend=options["backend"],
+                batch_size=options["batch_size"],
+                workers=options["workers"],
+                checkpoint=options["state_file"],
+                limit=options["limit"],
+                progress=progress,
+            )
+        except FileNotFoundError as exc:
+            raise CommandError(f"Model not found: {model_path}") from exc
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rescored {stats['processed']} test(s) with {options['model_version']} "
+            f"({stats['updated']} updated, {stats['created']} created, {stats['failed']} failed) "
+            f"at {stats['images_per_second']:.1f} images/sec"
+        ))
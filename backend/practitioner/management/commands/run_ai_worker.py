@@ -0,0 +1,104 @@
+import os
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from practitioner.services.job_queue import claim_jobs, run_job
+
+
+def _run_in_thread(job):
+    try:
+        return run_job(job)
+    finally:
+        close_old_connections()
+
+
+class Command(BaseCommand):
+    help = "Process queued AI jobs (inference, heatmaps, reports)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=settings.AI_WORKER_CONCURRENCY,
+            help="Maximum number of jobs this worker runs at once",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.AI_WORKER_POLL_SECONDS,
+            help="Seconds to sleep when the queue is empty",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once the queue is empty instead of polling forever",
+        )
+        parser.add_argument(
+            "--worker-id",
+            default=f"{socket.gethostname()}:{os.getpid()}",
+        )
+
+    def handle(self, *args, **options):
+        concurrency = max(1, options["concurrency"])
+        worker_id = options["worker_id"]
+
+        self.stdout.write(
+            self.style.WARNING(f"AI worker {worker_id} started (concurrency={concurrency})")
+        )
+
+        if concurrency == 1:
+            processed = self._run_inline(worker_id, options)
+        else:
+            processed = self._run_pool(worker_id, concurrency, options)
+
+        self.stdout.write(self.style.SUCCESS(f"AI worker processed {processed} job(s)."))
+
+    def _run_inline(self, worker_id, options):
+        processed = 0
+        while True:
+            jobs = claim_jobs(worker_id, 1)
+            if not jobs:
+                if options["burst"]:
+                    return processed
+                time.sleep(options["poll_interval"])
+                continue
+
+            job = run_job(jobs[0])
+            processed += 1
+            self._report(job)
+
+    def _run_pool(self, worker_id, concurrency, options):
+        processed = 0
+        in_flight = set()
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            while True:
+                free = concurrency - len(in_flight)
+                jobs = claim_jobs(worker_id, free) if free else []
+
+                for job in jobs:
+                    in_flight.add(pool.submit(_run_in_thread, job))
+
+                if not in_flight:
+                    if options["burst"]:
+                        return processed
+                    time.sleep(options["poll_interval"])
+                    continue
+
+                done, in_flight = wait(
+                    in_flight,
+                    timeout=options["poll_interval"],
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    processed += 1
+                    self._report(future.result())
+
+    def _report(self, job):
+        style = self.style.SUCCESS if job.status == "DONE" else self.style.ERROR
+        self.stdout.write(style(f"{job.kind} {job.id} -> {job.status} (attempt {job.attempts})"))
\ No newline at end of file
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-18 10:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('practitioner', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='aijob',
+            name='kind',
+            field=models.CharField(choices=[('RUN_AI', 'Run AI and generate report'), ('HEATMAP', 'Generate Grad-CAM heatmap')], default='RUN_AI', max_length=20),
+        ),
+    ]
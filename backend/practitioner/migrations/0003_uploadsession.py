@@ -0,0 +1,35 @@
+# Generated by Django 6.0 on 2026-10-18 15:10
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_storedblob_content_storage'),
+        ('practitioner', '0002_alter_aijob_kind'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='aijob',
+            name='kind',
+            field=models.CharField(choices=[('RUN_AI', 'Run AI and generate report'), ('HEATMAP', 'Generate Grad-CAM heatmap'), ('PREPROCESS', 'Preprocess uploaded scan')], default='RUN_AI', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='UploadSession',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('filename', models.CharField(max_length=255)),
+                ('total_size', models.PositiveBigIntegerField()),
+                ('checksum', models.CharField(help_text='Expected SHA-256 (hex) of the whole file', max_length=64)),
+                ('received_bytes', models.PositiveBigIntegerField(default=0)),
+                ('status', models.CharField(choices=[('UPLOADING', 'Uploading'), ('COMPLETE', 'Complete'), ('FAILED', 'Failed')], default='UPLOADING', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('test', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to='core.diagnostictest')),
+            ],
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-18 17:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('practitioner', '0003_uploadsession'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='aijob',
+            index=models.Index(condition=models.Q(('status', 'RUNNING')), fields=['locked_at'], name='aijob_running_locked_idx'),
+        ),
+    ]
@@ -1,3 +1,83 @@
+import os
+
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
+from core.models import DiagnosticTest
+import uuid
+
+
+class AIJob(models.Model):
+    KIND_CHOICES = (
+        ('RUN_AI', 'Run AI and generate report'),
+        ('HEATMAP', 'Generate Grad-CAM heatmap'),
+        ('PREPROCESS', 'Preprocess uploaded scan'),
+    )
+
+    STATUS_CHOICES = (
+        ('QUEUED', 'Queued'),
+        ('RUNNING', 'Running'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    test = models.ForeignKey(DiagnosticTest, on_delete=models.CASCADE, related_name='ai_jobs')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, default='RUN_AI')
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='QUEUED')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+
+    locked_by = models.CharField(max_length=255, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='aijob_status_run_after_idx'),
+            # Stale-claim recovery only looks at running jobs
+            models.Index(
+                fields=['locked_at'],
+                name='aijob_running_locked_idx',
+                condition=models.Q(status='RUNNING'),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} job for Test {self.test_id} ({self.status})"
+
+
+class UploadSession(models.Model):
+    """A chunked upload of a scan; bytes are appended to ``part_path``."""
+
+    STATUS_CHOICES = (
+        ('UPLOADING', 'Uploading'),
+        ('COMPLETE', 'Complete'),
+        ('FAILED', 'Failed'),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    test = models.ForeignKey(DiagnosticTest, on_delete=models.CASCADE, related_name='upload_sessions')
+    filename = models.CharField(max_length=255)
+    total_size = models.PositiveBigIntegerField()
+    checksum = models.CharField(max_length=64, help_text='Expected SHA-256 (hex) of the whole file')
+
+    received_bytes = models.PositiveBigIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='UPLOADING')
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def part_path(self):
+        return os.path.join(settings.UPLOAD_TMP_DIR, f"{self.id}.part")
 
-# Create your models here.
+    def __str__(self):
+        return f"Upload {self.id} for Test {self.test_id} ({self.received_bytes}/{self.total_size})"
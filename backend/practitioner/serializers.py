@@ -6,9 +6,12 @@ from core.models import (
     AIInferenceResult,
     Referral
 )
+from django.conf import settings
+from practitioner.models import AIJob, UploadSession
+from core.serializers import SparseFieldsetMixin
 
 
-class PatientLookupSerializer(serializers.ModelSerializer):
+class PatientLookupSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     name = serializers.CharField(source="user.full_name")
     phone = serializers.CharField(source="user.phone")
     abha_id = serializers.CharField(source="user.abha_id")
@@ -28,6 +31,34 @@ class DiagnosticImageUploadSerializer(serializers.Serializer):
     image = serializers.FileField()
 
 
+class UploadSessionCreateSerializer(serializers.Serializer):
+    filename = serializers.CharField(max_length=255)
+    size = serializers.IntegerField(min_value=1)
+    checksum = serializers.RegexField(r"^[0-9a-fA-F]{64}$", help_text="SHA-256 of the whole file")
+
+    def validate_size(self, value):
+        if value > settings.UPLOAD_MAX_BYTES:
+            raise serializers.ValidationError(
+                f"File exceeds the {settings.UPLOAD_MAX_BYTES} byte limit"
+            )
+        return value
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    upload_id = serializers.UUIDField(source="id", read_only=True)
+    test_id = serializers.UUIDField(read_only=True)
+    offset = serializers.IntegerField(source="received_bytes", read_only=True)
+    size = serializers.IntegerField(source="total_size", read_only=True)
+    chunk_size = serializers.SerializerMethodField()
+
+    class Meta:
+        model = UploadSession
+        fields = ["upload_id", "test_id", "filename", "size", "offset", "chunk_size", "status"]
+
+    def get_chunk_size(self, obj):
+        return settings.UPLOAD_CHUNK_MAX_BYTES
+
+
 class ClinicalContextSerializer(serializers.ModelSerializer):
     class Meta:
         model = ClinicalContext
@@ -46,3 +77,28 @@ class ReferralCreateSerializer(serializers.ModelSerializer):
         fields = ["referred_to", "urgency", "reason"]
 
 
+class AIJobSerializer(serializers.ModelSerializer):
+    job_id = serializers.UUIDField(source="id", read_only=True)
+    test_id = serializers.UUIDField(read_only=True)
+    test_status = serializers.CharField(source="test.status", read_only=True)
+    ai_result = serializers.SerializerMethodField()
+
+    class Meta:
+        model = AIJob
+        fields = [
+            "job_id",
+            "test_id",
+            "kind",
+            "status",
+            "attempts",
+            "max_attempts",
+            "test_status",
+            "ai_result",
+            "created_at",
+            "updated_at",
+        ]
+
+    def get_ai_result(self, obj):
+        if obj.status != "DONE" or not hasattr(obj.test, "aiinferenceresult"):
+            return None
+        return AIResultSerializer(obj.test.aiinferenceresult).data
@@ -1,47 +1,149 @@
+import logging
+
 import cv2
 import numpy as np
 from django.conf import settings
 from django.core.files.base import ContentFile
+from django.db import transaction
 
 from core.models import AIInferenceResult, DiagnosticReport
-from ai.breast_cancer.inference import predict_breast_cancer
-from ai.report_generator import generate_report
+from ai.breast_cancer.inference import predict_breast_cancer, generate_heatmap, get_batcher
+from ai.startup import breast_cancer_backend_path, get_tensor_cache
+from practitioner.services.report_service import mark_report_pending, render_if_unclaimed
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_breast_cancer_batcher():
+    if not settings.AI_BATCHING_ENABLED:
+        return None
+
+    return get_batcher(
+        breast_cancer_backend_path(),
+        max_batch_size=settings.AI_BATCH_MAX_SIZE,
+        max_delay_ms=settings.AI_BATCH_MAX_DELAY_MS,
+        backend=settings.BREAST_CANCER_BACKEND,
+    )
 
 
 def run_ai_and_generate_report(test):
+    """
+    Score the test, persist the result and queue its report.
+
+    Neither the Grad-CAM heatmap nor the report PDF is rendered here: the
+    heatmap is filled in by the HEATMAP job or on first view through
+    ensure_heatmap(), and the PDF by the report stage (see report_service).
+    """
     result = predict_breast_cancer(
         test.raw_image.path,
-        settings.BREAST_CANCER_MODEL_PATH
+        breast_cancer_backend_path(),
+        batcher=get_breast_cancer_batcher(),
+        backend=settings.BREAST_CANCER_BACKEND,
+        cache=get_tensor_cache()
+    )
+
+    fields = breast_cancer_result_fields(result["prediction"], result["confidence"])
+
+    # A failed attempt must not leave a half-written result behind, so the
+    # job queue can safely retry it. Re-running a test replaces its result
+    # and clears the heatmap, which belonged to the previous prediction.
+    with transaction.atomic():
+        # Queued before the result is saved, so the report already carries
+        # the new risk level and rerender_on_risk_change does not bump it again
+        mark_report_pending(
+            test,
+            final_risk_level=fields["risk_level"],
+            doctor_signed=False
+        )
+
+        ai_result, _ = AIInferenceResult.objects.update_or_create(
+            test=test,
+            defaults={**fields, "heatmap_image": None}
+        )
+
+    return ai_result
+
+
+def breast_cancer_result_fields(prediction, confidence):
+    return {
+        "model_name": "BREAST_CANCER",
+        "model_version": settings.BREAST_CANCER_MODEL_VERSION,
+        "risk_score": confidence,
+        "risk_level": "HIGH" if prediction == "Malignant" else "LOW",
+        "confidence": confidence,
+    }
+
+
+def needs_heatmap(ai_result):
+    return (
+        ai_result.model_name == "BREAST_CANCER"
+        and not ai_result.heatmap_image
+        and bool(ai_result.test.raw_image)
     )
 
-    risk_level = "HIGH" if result["prediction"] == "Malignant" else "LOW"
 
-    ai_result = AIInferenceResult.objects.create(
-        test=test,
-        model_name="BREAST_CANCER",
-        risk_score=result["confidence"],
-        risk_level=risk_level,
-        confidence=result["confidence"]
+def save_heatmap(ai_result):
+    """Store the Grad-CAM overlay PNG and return the overlay (uint8 RGB)."""
+    test = ai_result.test
+    overlay = generate_heatmap(
+        test.raw_image.path,
+        settings.BREAST_CANCER_MODEL_PATH,
+        class_idx=1 if ai_result.risk_level == "HIGH" else 0,
+        cache=get_tensor_cache()
     )
 
-    # Save heatmap
-    overlay_uint8 = (result["overlay"] * 255).astype("uint8")
-    _, buffer = cv2.imencode(".png", overlay_uint8)
+    overlay_uint8 = (overlay * 255).astype("uint8")
+    # render_overlay produces RGB; OpenCV encodes BGR
+    _, buffer = cv2.imencode(".png", cv2.cvtColor(overlay_uint8, cv2.COLOR_RGB2BGR))
 
     ai_result.heatmap_image.save(
         f"heatmap_{test.id}.png",
         ContentFile(buffer.tobytes()),
         save=True
     )
+    return overlay_uint8
 
-    # Generate PDF
-    pdf = generate_report(test, ai_result)
 
-    DiagnosticReport.objects.create(
-        test=test,
-        report_pdf=pdf,
-        final_risk_level=risk_level,
-        doctor_signed=False
-    )
+def ensure_heatmap(ai_result):
+    """
+    Compute the heatmap on first request if the background stage has not
+    produced it yet. Failures are logged and leave the heatmap empty so the
+    calling detail view still responds.
+    """
+    if not needs_heatmap(ai_result):
+        return ai_result
+
+    try:
+        save_heatmap(ai_result)
+    except Exception:
+        logger.exception("On-demand heatmap generation failed for test %s", ai_result.test_id)
+
+    return ai_result
+
+
+def test_file(test, kind):
+    """
+    The stored ``image`` (uploaded scan) or ``heatmap`` of a test, computing
+    the heatmap first if it has not been generated yet.
+    """
+    if kind == "image":
+        return test.raw_image
+
+    ai_result = getattr(test, "aiinferenceresult", None)
+    if ai_result is None:
+        return None
+    return ensure_heatmap(ai_result).heatmap_image
+
+
+def refresh_report(test, heatmap=None):
+    """
+    Queue the report for re-rendering after its heatmap changed, and render
+    it straight away with the in-memory overlay unless a worker has it.
+    """
+    if not DiagnosticReport.objects.filter(test=test).exists():
+        return None
 
-    return ai_result
\ No newline at end of file
+    report = mark_report_pending(test)
+    render_if_unclaimed(report, heatmap=heatmap)
+    return report
@@ -0,0 +1,180 @@
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from ai.breast_cancer.preprocessing import load_image
+from ai.startup import get_tensor_cache
+from core.models import DiagnosticTest
+from practitioner.models import AIJob
+from practitioner.services.ai_service import (
+    run_ai_and_generate_report,
+    needs_heatmap,
+    save_heatmap,
+    refresh_report,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def _run_ai(job):
+    run_ai_and_generate_report(job.test)
+    enqueue_ai_job(job.test, kind="HEATMAP")
+
+
+def _generate_heatmap(job):
+    ai_result = job.test.aiinferenceresult
+    overlay = save_heatmap(ai_result) if needs_heatmap(ai_result) else None
+    refresh_report(job.test, heatmap=overlay)
+
+
+def _preprocess(job):
+    # Decode the scan into the tensor cache so RUN_AI starts from a cache hit
+    cache = get_tensor_cache()
+    if cache is not None and job.test.raw_image:
+        cache.load(job.test.raw_image.path, (224, 224), load_image)
+
+
+JOB_HANDLERS = {
+    "RUN_AI": _run_ai,
+    "HEATMAP": _generate_heatmap,
+    "PREPROCESS": _preprocess,
+}
+
+ACTIVE_STATUSES = ("QUEUED", "RUNNING")
+
+# Only these job kinds drive DiagnosticTest.status; follow-up stages such as
+# HEATMAP run after the test has already moved on (e.g. to REFERRED).
+STATUS_TRACKING_KINDS = ("RUN_AI",)
+
+# Test statuses a RUN_AI job may move the test out of. A re-run on a test
+# that has been referred or closed rescores it but leaves its status alone.
+QUEUEABLE_TEST_STATUSES = ("UPLOADED", "AI_DONE", "AI_FAILED")
+
+
+def _set_test_status(job, status, from_statuses):
+    if job.kind not in STATUS_TRACKING_KINDS:
+        return
+    # The test may have been referred while the job was running
+    job.test.refresh_from_db(fields=["status"])
+    if job.test.status not in from_statuses:
+        return
+    job.test.status = status
+    job.test.save(update_fields=["status"])
+
+
+def enqueue_ai_job(test, kind="RUN_AI"):
+    """
+    Queue ``kind`` for ``test`` unless an identical job is already pending.
+    RUN_AI jobs also mark an uploaded or processed test as QUEUED.
+    """
+    with transaction.atomic():
+        # Locking the test serializes concurrent enqueues, which could
+        # otherwise both find no pending job and both create one
+        test = DiagnosticTest.objects.select_for_update().get(pk=test.pk)
+        job = AIJob.objects.filter(test=test, kind=kind, status__in=ACTIVE_STATUSES).first()
+        if job is None:
+            job = AIJob.objects.create(
+                test=test,
+                kind=kind,
+                max_attempts=settings.AI_JOB_MAX_ATTEMPTS,
+            )
+        job.test = test
+
+        _set_test_status(job, "QUEUED", QUEUEABLE_TEST_STATUSES)
+
+    return job
+
+
+def claim_jobs(worker_id, limit):
+    """
+    Atomically lock up to ``limit`` runnable jobs for ``worker_id``.
+
+    Jobs left RUNNING by a worker that died longer than
+    AI_JOB_STALE_AFTER_SECONDS ago are picked up again, unless they have
+    used up their attempts; those are marked FAILED instead.
+    """
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=settings.AI_JOB_STALE_AFTER_SECONDS)
+
+    _fail_exhausted(stale_before)
+
+    with transaction.atomic():
+        jobs = list(
+            AIJob.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status="QUEUED", run_after__lte=now)
+                | Q(status="RUNNING", locked_at__lt=stale_before, attempts__lt=F("max_attempts"))
+            )
+            .order_by("run_after", "created_at")[:limit]
+        )
+        if not jobs:
+            return []
+
+        AIJob.objects.filter(id__in=[job.id for job in jobs]).update(
+            status="RUNNING",
+            locked_by=worker_id,
+            locked_at=now,
+            attempts=F("attempts") + 1,
+        )
+
+    return list(
+        AIJob.objects.select_related("test").filter(id__in=[job.id for job in jobs])
+    )
+
+
+def _fail_exhausted(stale_before):
+    # A job that kills its worker on every attempt never reaches
+    # _record_failure, so it is failed here once its attempts are used up
+    exhausted = AIJob.objects.select_related("test").filter(
+        status="RUNNING", locked_at__lt=stale_before, attempts__gte=F("max_attempts")
+    )
+    for job in exhausted:
+        failed = AIJob.objects.filter(pk=job.pk, status="RUNNING", locked_at=job.locked_at).update(
+            status="FAILED",
+            last_error=job.last_error or "Worker stopped while running the job",
+            updated_at=timezone.now(),
+        )
+        if failed:
+            logger.error("AI job %s failed: worker lost on every attempt", job.id)
+            _set_test_status(job, "AI_FAILED", ("RUNNING",))
+
+
+def run_job(job):
+    _set_test_status(job, "RUNNING", ("QUEUED", "RUNNING"))
+
+    try:
+        JOB_HANDLERS[job.kind](job)
+    except Exception:
+        logger.exception("AI job %s failed (attempt %d)", job.id, job.attempts)
+        _record_failure(job, traceback.format_exc())
+        return job
+
+    job.status = "DONE"
+    job.last_error = ""
+    job.save(update_fields=["status", "last_error", "updated_at"])
+
+    _set_test_status(job, "AI_DONE", ("RUNNING",))
+    return job
+
+
+def _record_failure(job, error):
+    job.last_error = error
+
+    if job.attempts < job.max_attempts:
+        delay = settings.AI_JOB_RETRY_DELAY_SECONDS * 2 ** (job.attempts - 1)
+        job.status = "QUEUED"
+        job.run_after = timezone.now() + timedelta(seconds=delay)
+        test_status = "QUEUED"
+    else:
+        job.status = "FAILED"
+        test_status = "AI_FAILED"
+
+    job.save(update_fields=["status", "run_after", "last_error", "updated_at"])
+
+    _set_test_status(job, test_status, ("RUNNING",))
\ No newline at end of file
@@ -0,0 +1,149 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, OuterRef, Q, Subquery
+from django.utils import timezone
+
+from ai.report_generator import generate_report
+from core.models import AIInferenceResult, DiagnosticReport
+
+
+logger = logging.getLogger(__name__)
+
+
+def _renderable(now):
+    """Reports nobody is rendering, or whose renderer has held them too long."""
+    stale_before = now - timedelta(seconds=settings.REPORT_RENDER_LOCK_SECONDS)
+    return Q(status="PENDING") | Q(status="RENDERING", render_started_at__lt=stale_before)
+
+
+def mark_report_pending(test, **fields):
+    """
+    Queue the report of ``test`` for (re-)rendering, creating it if needed.
+    ``fields`` (e.g. final_risk_level, doctor_signed) are updated as well.
+    """
+    report, created = DiagnosticReport.objects.get_or_create(
+        test=test, defaults={**fields, "status": "PENDING"}
+    )
+    if not created:
+        DiagnosticReport.objects.filter(pk=report.pk).update(
+            status="PENDING", revision=F("revision") + 1, **fields
+        )
+    return report
+
+
+def mark_reports_pending(test_ids):
+    """
+    Bulk variant for re-scoring: queue the reports of ``test_ids`` and copy
+    each test's current AI risk level onto its report in one UPDATE.
+    """
+    risk_level = AIInferenceResult.objects.filter(
+        test_id=OuterRef("test_id")
+    ).values("risk_level")[:1]
+
+    return DiagnosticReport.objects.filter(test_id__in=test_ids).update(
+        status="PENDING",
+        revision=F("revision") + 1,
+        final_risk_level=Subquery(risk_level),
+    )
+
+
+def claim_reports(limit):
+    """Lock up to ``limit`` pending reports for rendering by this worker."""
+    now = timezone.now()
+
+    with transaction.atomic():
+        ids = list(
+            DiagnosticReport.objects.select_for_update(skip_locked=True)
+            .filter(_renderable(now))
+            .order_by("generated_at")
+            .values_list("id", flat=True)[:limit]
+        )
+        if not ids:
+            return []
+
+        DiagnosticReport.objects.filter(id__in=ids).update(
+            status="RENDERING", render_started_at=now
+        )
+
+    return list(
+        DiagnosticReport.objects.select_related(
+            "test__patient__user", "test__aiinferenceresult"
+        ).filter(id__in=ids)
+    )
+
+
+def _lock(report):
+    """Short-lived render lock for a single report (on-demand path)."""
+    now = timezone.now()
+    locked = DiagnosticReport.objects.filter(
+        Q(pk=report.pk) & (_renderable(now) | Q(status="FAILED"))
+    ).update(status="RENDERING", render_started_at=now)
+    return locked == 1
+
+
+def render(report, heatmap=None):
+    """
+    Render a claimed report. The result is only published if the report
+    was not marked pending again in the meantime; a superseded PDF is
+    discarded and the newer revision is left for the next render.
+    """
+    report.refresh_from_db()
+    test = report.test
+    previous = report.report_pdf.name
+
+    try:
+        pdf = generate_report(
+            test,
+            test.aiinferenceresult,
+            heatmap=heatmap,
+            risk_level=report.final_risk_level,
+            doctor_signed=report.doctor_signed,
+        )
+        report.report_pdf.save(pdf.name, pdf, save=False)
+    except Exception:
+        logger.exception("Report rendering failed for test %s", report.test_id)
+        DiagnosticReport.objects.filter(pk=report.pk, revision=report.revision).update(
+            status="FAILED", render_started_at=None
+        )
+        report.status = "FAILED"
+        return report
+
+    published = DiagnosticReport.objects.filter(pk=report.pk, revision=report.revision).update(
+        status="READY",
+        report_pdf=report.report_pdf.name,
+        rendered_at=timezone.now(),
+        render_started_at=None,
+    )
+
+    storage = report.report_pdf.storage
+    if published:
+        report.status = "READY"
+        if previous and previous != report.report_pdf.name:
+            storage.delete(previous)
+    else:
+        storage.delete(report.report_pdf.name)
+        report.refresh_from_db()
+
+    return report
+
+
+def render_if_unclaimed(report, heatmap=None):
+    """Render now unless another worker already holds the report."""
+    if not _lock(report):
+        return None
+    return render(report, heatmap=heatmap)
+
+
+def ensure_report(report):
+    """
+    Return the report for download, rendering it in this request if no
+    worker has picked it up yet. A report another process is rendering is
+    returned as is; the caller must check ``status`` and ask the client to
+    retry rather than hold the request open.
+    """
+    if report.status != "READY":
+        render_if_unclaimed(report)
+    return report
@@ -0,0 +1,182 @@
+import json
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import torch
+from django.db import transaction
+
+from ai.breast_cancer.backends import get_classifier
+from ai.breast_cancer.preprocessing import load_image
+from ai.startup import get_tensor_cache
+from core.models import AIInferenceResult, DiagnosticTest
+from core.response_cache import bump_versions
+from practitioner.services.ai_service import breast_cancer_result_fields
+from practitioner.services.report_service import mark_reports_pending
+
+
+logger = logging.getLogger(__name__)
+
+RESCORED_FIELDS = ["model_name", "model_version", "risk_score", "risk_level", "confidence", "heatmap_image"]
+
+
+def decode_scan(path):
+    """Process-pool entry point: preprocessed image, or None if undecodable."""
+    try:
+        cache = get_tensor_cache()
+        if cache is None:
+            return load_image(path)
+        return np.array(cache.load(path, (224, 224), load_image))
+    except Exception:
+        logger.exception("Could not decode %s", path)
+        return None
+
+
+def read_checkpoint(path):
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_checkpoint(path, state):
+    if not path:
+        return
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def tests_to_rescore(model_version, after_id=None, chunk_size=500):
+    qs = (
+        DiagnosticTest.objects.filter(test_type="BREAST_CANCER")
+        .exclude(raw_image="")
+        .exclude(aiinferenceresult__model_version=model_version)
+        .only("id", "patient_id", "raw_image")
+        .order_by("id")
+    )
+    if after_id:
+        qs = qs.filter(id__gt=after_id)
+    return qs.iterator(chunk_size=chunk_size)
+
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def save_scores(tests, probs, model_version):
+    """Write one batch of predictions with a single bulk_update and bulk_create."""
+    existing = AIInferenceResult.objects.in_bulk(
+        [test.id for test in tests], field_name="test_id"
+    )
+
+    to_update, to_create = [], []
+    for test, row in zip(tests, probs):
+        class_idx = int(row.argmax())
+        fields = breast_cancer_result_fields(
+            "Malignant" if class_idx == 1 else "Benign",
+            float(row[class_idx]),
+        )
+        fields["model_version"] = model_version
+        # The stored heatmap explains the previous prediction
+        fields["heatmap_image"] = None
+
+        result = existing.get(test.id)
+        if result is None:
+            to_create.append(AIInferenceResult(test=test, **fields))
+        else:
+            for name, value in fields.items():
+                setattr(result, name, value)
+            to_update.append(result)
+
+    with transaction.atomic():
+        AIInferenceResult.objects.bulk_update(to_update, RESCORED_FIELDS)
+        AIInferenceResult.objects.bulk_create(to_create)
+        # bulk_update skips post_save, so queue the affected reports and
+        # invalidate cached patient responses here
+        mark_reports_pending([test.id for test in tests])
+        bump_versions(test.patient_id for test in tests)
+
+    return len(to_update), len(to_create)
+
+
+def rescore_breast_cancer(model_path, model_version, backend="eager", batch_size=32,
+                          workers=4, checkpoint=None, limit=None, progress=None):
+    """
+    Re-run the breast cancer classifier over stored tests.
+
+    Tests already scored with ``model_version`` are skipped, and the last
+    committed test id is written to ``checkpoint`` after every batch, so an
+    interrupted run resumes where it stopped. Scans are decoded in a process
+    pool one batch ahead of inference.
+    """
+    state = read_checkpoint(checkpoint)
+    if state.get("model_version") != model_version:
+        state = {"model_version": model_version, "last_test_id": None, "processed": 0}
+
+    model = get_classifier(backend, model_path)
+    tests = tests_to_rescore(model_version, state["last_test_id"])
+    if limit:
+        tests = (test for _, test in zip(range(limit), tests))
+
+    stats = {"processed": 0, "updated": 0, "created": 0, "failed": 0}
+    start = time.perf_counter()
+
+    # workers=0 decodes in-process, which is mainly useful for tests
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 0 else None
+    decode = pool.map if pool else map
+
+    try:
+        pending = None
+        for batch in _chunks(tests, batch_size):
+            decoding = (batch, decode(decode_scan, [t.raw_image.path for t in batch]))
+            if pending is not None:
+                _score_batch(model, *pending, stats, state, checkpoint)
+                if progress:
+                    progress(stats, time.perf_counter() - start)
+            pending = decoding
+
+        if pending is not None:
+            _score_batch(model, *pending, stats, state, checkpoint)
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+
+    stats["seconds"] = time.perf_counter() - start
+    stats["images_per_second"] = stats["processed"] / stats["seconds"] if stats["seconds"] else 0.0
+    return stats
+
+
+def _score_batch(model, tests, images, stats, state, checkpoint):
+    decoded = [(test, image) for test, image in zip(tests, images) if image is not None]
+    stats["failed"] += len(tests) - len(decoded)
+
+    if decoded:
+        batch = torch.stack([
+            torch.tensor(image).unsqueeze(0).repeat(3, 1, 1) for _, image in decoded
+        ])
+        with torch.no_grad():
+            probs = torch.softmax(model(batch), dim=1).numpy()
+
+        updated, created = save_scores(
+            [test for test, _ in decoded], probs, state["model_version"]
+        )
+        stats["updated"] += updated
+        stats["created"] += created
+        stats["processed"] += len(decoded)
+
+    state["last_test_id"] = str(tests[-1].id)
+    state["processed"] += len(decoded)
+    write_checkpoint(checkpoint, state)
\ No newline at end of file
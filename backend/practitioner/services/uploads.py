@@ -0,0 +1,151 @@
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.http import UnreadablePostError
+
+from core.storage import stored_content_hash
+from practitioner.models import UploadSession
+from practitioner.services.job_queue import enqueue_ai_job
+
+
+COPY_BUFFER_SIZE = 256 * 1024
+
+# Chunks are spooled to disk past this size while they are received
+SPOOL_MEMORY_BYTES = 1024 * 1024
+
+
+class UploadError(Exception):
+    """A chunk or completion request the session cannot accept."""
+
+
+class OffsetMismatch(UploadError):
+    def __init__(self, expected):
+        super().__init__(f"Expected offset {expected}")
+        self.expected = expected
+
+
+class ChecksumMismatch(UploadError):
+    pass
+
+
+def start_upload(test, filename, total_size, checksum):
+    os.makedirs(settings.UPLOAD_TMP_DIR, exist_ok=True)
+    return UploadSession.objects.create(
+        test=test,
+        filename=os.path.basename(filename),
+        total_size=total_size,
+        checksum=checksum.lower(),
+    )
+
+
+def _check_chunk(session, offset, length):
+    if session.status != "UPLOADING":
+        raise UploadError(f"Upload is {session.status.lower()}")
+    if offset != session.received_bytes:
+        raise OffsetMismatch(session.received_bytes)
+    if offset + length > session.total_size:
+        raise UploadError("Chunk extends past the declared file size")
+
+
+def _receive(stream, length):
+    """
+    Read up to ``length`` bytes of the request body into a spooled file and
+    return it with the number of bytes received. A client that disconnects
+    mid-chunk leaves the bytes that did arrive.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_BYTES, dir=settings.UPLOAD_TMP_DIR)
+    received = 0
+    try:
+        while received < length:
+            chunk = stream.read(min(COPY_BUFFER_SIZE, length - received))
+            if not chunk:
+                break
+            spool.write(chunk)
+            received += len(chunk)
+    except UnreadablePostError:
+        pass
+    spool.seek(0)
+    return spool, received
+
+
+def write_chunk(session_id, offset, stream, length):
+    """
+    Append ``length`` bytes from ``stream`` at ``offset``.
+
+    The chunk is received before the session row is locked, so a slow
+    client never holds the lock; the offset is checked again under the lock
+    and a request that lost the race gets OffsetMismatch. If the client
+    disconnects mid-chunk the bytes that did arrive are kept and the client
+    resumes from the new offset.
+    """
+    _check_chunk(UploadSession.objects.get(pk=session_id), offset, length)
+
+    spool, received = _receive(stream, length)
+    with spool, transaction.atomic():
+        session = UploadSession.objects.select_for_update().get(pk=session_id)
+        _check_chunk(session, offset, length)
+
+        mode = "r+b" if os.path.exists(session.part_path) else "wb"
+        with open(session.part_path, mode) as f:
+            # Drop anything past the committed offset left by a crashed write
+            f.seek(offset)
+            f.truncate()
+            shutil.copyfileobj(spool, f, COPY_BUFFER_SIZE)
+
+        session.received_bytes = offset + received
+        session.save(update_fields=["received_bytes", "updated_at"])
+
+    return session
+
+
+def complete_upload(session_id):
+    """
+    Move a fully received upload into storage, verify its SHA-256 and queue
+    preprocessing. Completing an already completed session is a no-op.
+    """
+    with transaction.atomic():
+        session = (
+            UploadSession.objects.select_for_update()
+            .select_related("test")
+            .get(pk=session_id)
+        )
+
+        if session.status == "COMPLETE":
+            return session
+        if session.status != "UPLOADING":
+            raise UploadError(f"Upload is {session.status.lower()}")
+        if session.received_bytes != session.total_size:
+            raise UploadError(
+                f"Upload incomplete: {session.received_bytes} of {session.total_size} bytes"
+            )
+
+        test = session.test
+        previous = test.raw_image.name
+
+        # The storage hashes the file while copying it in, so the checksum
+        # comes for free from the content-addressed name.
+        with open(session.part_path, "rb") as f:
+            test.raw_image.save(session.filename, File(f), save=False)
+
+        verified = stored_content_hash(test.raw_image.path) == session.checksum
+        if verified:
+            test.save(update_fields=["raw_image"])
+            session.status = "COMPLETE"
+        else:
+            test.raw_image.storage.delete(test.raw_image.name)
+            test.raw_image.name = previous
+            session.status = "FAILED"
+        session.save(update_fields=["status", "updated_at"])
+
+        if verified:
+            enqueue_ai_job(test, kind="PREPROCESS")
+
+    os.remove(session.part_path)
+
+    if not verified:
+        raise ChecksumMismatch("SHA-256 of the uploaded file does not match")
+    return session
@@ -0,0 +1,22 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from core.models import AIInferenceResult, DiagnosticReport
+from doctor.models import DoctorReview
+from practitioner.services.report_service import mark_report_pending
+
+
+@receiver(post_save, sender=DoctorReview)
+def rerender_signed_report(sender, instance, created, **kwargs):
+    test = instance.referral.test
+    if created and DiagnosticReport.objects.filter(test=test).exists():
+        mark_report_pending(test, doctor_signed=True)
+
+
+@receiver(post_save, sender=AIInferenceResult)
+def rerender_on_risk_change(sender, instance, **kwargs):
+    stale = DiagnosticReport.objects.filter(test_id=instance.test_id).exclude(
+        final_risk_level=instance.risk_level
+    )
+    if stale.exists():
+        mark_report_pending(instance.test, final_risk_level=instance.risk_level)
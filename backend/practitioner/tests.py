@@ -1,19 +1,53 @@
-from rest_framework.test import APITestCase
+from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.http import UnreadablePostError
+from django.test import SimpleTestCase, TestCase, override_settings
 from django.utils import timezone
-from datetime import timedelta
 from PIL import Image
+import hashlib
+import importlib.util
 import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
 from core.models import (
     User,
     PatientProfile,
     PractitionerProfile,
     DiagnosticTest,
     AIInferenceResult,
+    DiagnosticReport,
     Referral
 )
 from rest_framework_simplejwt.tokens import RefreshToken
 
+import cv2
+import numpy as np
+import torch
+import torch.nn as nn
+from pydicom.dataset import Dataset, FileMetaDataset
+from pydicom.uid import ExplicitVRLittleEndian, SecondaryCaptureImageStorage, generate_uid
+
+from ai.batching import MicroBatcher
+from ai.breast_cancer.backends import get_classifier, export_torchscript, export_onnx
+from ai.breast_cancer.gradcam import GradCAM
+from ai.breast_cancer.model import BreastCancerModel
+from ai.breast_cancer.preprocessing import load_image, iter_frames, dicom_frame_count
+from ai.breast_cancer.quantization import quantize, compare_predictions, save_quantized
+from ai.registry import ModelRegistry
+from ai.report_generator import generate_report
+from ai.tensor_cache import TensorCache
+from practitioner.models import AIJob, UploadSession
+from practitioner.services.ai_service import ensure_heatmap, run_ai_and_generate_report
+from practitioner.services.job_queue import enqueue_ai_job, claim_jobs, run_job
+from practitioner.services.report_service import claim_reports, mark_report_pending, render
+from practitioner.services.rescoring import rescore_breast_cancer
+from practitioner.services.uploads import write_chunk
+
 
 def get_test_image():
     file = io.BytesIO()
@@ -93,9 +127,6 @@ class DiagnosticTestCreateTest(PractitionerBaseTestCase):
         self.assertTrue(DiagnosticTest.objects.exists())
 
 
-from django.core.files.uploadedfile import SimpleUploadedFile
-
-
 class DiagnosticImageUploadTest(PractitionerBaseTestCase):
 
     def setUp(self):
@@ -171,8 +202,177 @@ class RunAITest(PractitionerBaseTestCase):
             f"/api/practitioner/tests/{self.test.id}/run-ai/"
         )
 
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.test.refresh_from_db()
+        self.assertEqual(self.test.status, "QUEUED")
+
+        call_command("run_ai_worker", burst=True, concurrency=1)
+
         self.assertTrue(AIInferenceResult.objects.exists())
+        self.test.refresh_from_db()
+        self.assertEqual(self.test.status, "AI_DONE")
+
+    def test_run_ai_twice_reuses_pending_job(self):
+        first = self.client.post(f"/api/practitioner/tests/{self.test.id}/run-ai/")
+        second = self.client.post(f"/api/practitioner/tests/{self.test.id}/run-ai/")
+
+        self.assertEqual(first.data["job_id"], second.data["job_id"])
+        self.assertEqual(AIJob.objects.filter(test=self.test).count(), 1)
+
+
+class AIJobQueueTest(PractitionerBaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.test = DiagnosticTest.objects.create(
+            patient=self.patient_profile,
+            practitioner=self.practitioner_profile,
+            test_type="BREAST_CANCER",
+            status="UPLOADED"
+        )
+
+    def test_failed_job_is_retried_then_marked_failed(self):
+        job = enqueue_ai_job(self.test)
+        failing = {"RUN_AI": mock.Mock(side_effect=RuntimeError("model crashed"))}
+
+        with mock.patch("practitioner.services.job_queue.JOB_HANDLERS", failing):
+            for attempt in range(job.max_attempts):
+                AIJob.objects.filter(id=job.id).update(run_after=timezone.now())
+                claimed = claim_jobs("test-worker", 1)
+                self.assertEqual(len(claimed), 1)
+                run_job(claimed[0])
+
+        job.refresh_from_db()
+        self.test.refresh_from_db()
+        self.assertEqual(job.status, "FAILED")
+        self.assertEqual(job.attempts, job.max_attempts)
+        self.assertIn("model crashed", job.last_error)
+        self.assertEqual(self.test.status, "AI_FAILED")
+
+    @override_settings(AI_JOB_STALE_AFTER_SECONDS=0)
+    def test_stale_job_without_attempts_left_is_failed(self):
+        job = enqueue_ai_job(self.test)
+        AIJob.objects.filter(id=job.id).update(
+            status="RUNNING",
+            attempts=job.max_attempts,
+            locked_by="dead-worker",
+            locked_at=timezone.now(),
+        )
+        DiagnosticTest.objects.filter(id=self.test.id).update(status="RUNNING")
+
+        self.assertEqual(claim_jobs("test-worker", 1), [])
+
+        job.refresh_from_db()
+        self.test.refresh_from_db()
+        self.assertEqual(job.status, "FAILED")
+        self.assertEqual(self.test.status, "AI_FAILED")
+
+    def test_retry_waits_for_backoff(self):
+        enqueue_ai_job(self.test)
+        failing = {"RUN_AI": mock.Mock(side_effect=RuntimeError("model crashed"))}
+
+        with mock.patch("practitioner.services.job_queue.JOB_HANDLERS", failing):
+            run_job(claim_jobs("test-worker", 1)[0])
+
+        self.assertEqual(claim_jobs("test-worker", 1), [])
+        self.test.refresh_from_db()
+        self.assertEqual(self.test.status, "QUEUED")
+
+    def test_rerun_keeps_referred_status(self):
+        self.test.status = "REFERRED"
+        self.test.save()
+        enqueue_ai_job(self.test)
+
+        with mock.patch("practitioner.services.job_queue.JOB_HANDLERS", {"RUN_AI": mock.Mock()}):
+            job = run_job(claim_jobs("test-worker", 1)[0])
+
+        self.test.refresh_from_db()
+        self.assertEqual(job.status, "DONE")
+        self.assertEqual(self.test.status, "REFERRED")
+
+    def test_job_status_endpoint(self):
+        job = enqueue_ai_job(self.test)
+
+        response = self.client.get(f"/api/practitioner/jobs/{job.id}/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], "QUEUED")
+        self.assertEqual(response.data["test_status"], "QUEUED")
+        self.assertIsNone(response.data["ai_result"])
+
+
+class LazyHeatmapTest(PractitionerBaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.test = DiagnosticTest.objects.create(
+            patient=self.patient_profile,
+            practitioner=self.practitioner_profile,
+            test_type="BREAST_CANCER",
+            status="UPLOADED",
+            raw_image=SimpleUploadedFile("scan.png", get_test_image().read())
+        )
+
+    @mock.patch("practitioner.services.ai_service.generate_heatmap")
+    @mock.patch("practitioner.services.ai_service.predict_breast_cancer")
+    def test_score_is_persisted_before_heatmap(self, predict, heatmap):
+        predict.return_value = {"prediction": "Malignant", "class_idx": 1, "confidence": 0.9}
+        heatmap.return_value = np.zeros((224, 224, 3))
+
+        enqueue_ai_job(self.test)
+        run_job(claim_jobs("test-worker", 1)[0])
+
+        ai_result = AIInferenceResult.objects.get(test=self.test)
+        self.assertEqual(ai_result.risk_level, "HIGH")
+        self.assertFalse(ai_result.heatmap_image)
+        heatmap.assert_not_called()
+
+        heatmap_job = AIJob.objects.get(test=self.test, kind="HEATMAP")
+        self.assertEqual(heatmap_job.status, "QUEUED")
+
+        run_job(claim_jobs("test-worker", 1)[0])
+
+        ai_result.refresh_from_db()
+        self.assertTrue(ai_result.heatmap_image)
+        heatmap.assert_called_once()
+        self.assertEqual(heatmap.call_args.kwargs["class_idx"], 1)
+
+        self.test.refresh_from_db()
+        self.assertEqual(self.test.status, "AI_DONE")
+
+    @mock.patch("practitioner.services.ai_service.generate_heatmap")
+    def test_heatmap_is_generated_once_on_demand(self, heatmap):
+        heatmap.return_value = np.zeros((224, 224, 3))
+        ai_result = AIInferenceResult.objects.create(
+            test=self.test,
+            model_name="BREAST_CANCER",
+            risk_score=0.7,
+            risk_level="LOW",
+            confidence=0.7
+        )
+
+        ensure_heatmap(ai_result)
+        ensure_heatmap(ai_result)
+
+        heatmap.assert_called_once()
+        self.assertEqual(heatmap.call_args.kwargs["class_idx"], 0)
+        self.assertTrue(ai_result.heatmap_image)
+
+    @mock.patch("practitioner.services.ai_service.generate_heatmap")
+    def test_on_demand_failure_leaves_heatmap_empty(self, heatmap):
+        heatmap.side_effect = RuntimeError("no checkpoint")
+        ai_result = AIInferenceResult.objects.create(
+            test=self.test,
+            model_name="BREAST_CANCER",
+            risk_score=0.7,
+            risk_level="LOW",
+            confidence=0.7
+        )
+
+        ensure_heatmap(ai_result)
+
+        ai_result.refresh_from_db()
+        self.assertFalse(ai_result.heatmap_image)
 
 
 class ViewAIResultTest(PractitionerBaseTestCase):
@@ -230,23 +430,6 @@ class ReferralCreateTest(PractitionerBaseTestCase):
         self.assertTrue(Referral.objects.exists())
 
 
-import os
-from django.test import TestCase
-from django.conf import settings
-from django.core.files.uploadedfile import SimpleUploadedFile
-from rest_framework.test import APIClient
-from rest_framework_simplejwt.tokens import RefreshToken
-
-from core.models import (
-    User,
-    PatientProfile,
-    PractitionerProfile,
-    DiagnosticTest,
-    AIInferenceResult,
-    DiagnosticReport,
-)
-
-
 class PractitionerAIPipelineTest(TestCase):
     """
     End-to-end test:
@@ -350,9 +533,16 @@ class PractitionerAIPipelineTest(TestCase):
             f"/api/practitioner/tests/{self.test.id}/run-ai/"
         )
 
+        self.assertEqual(response.status_code, 202)
+        call_command("run_ai_worker", burst=True, concurrency=1)
+
+        response = self.client.get(
+            f"/api/practitioner/jobs/{response.data['job_id']}/"
+        )
+
         self.assertEqual(response.status_code, 200)
-        self.assertIn("risk_level", response.data)
-        self.assertIn("confidence", response.data)
+        self.assertIn("risk_level", response.data["ai_result"])
+        self.assertIn("confidence", response.data["ai_result"])
 
         # -----------------------------
         # AI Result Assertions
@@ -381,4 +571,668 @@ class PractitionerAIPipelineTest(TestCase):
         # File existence checks
         # -----------------------------
         self.assertTrue(os.path.exists(report.report_pdf.path))
-        self.assertTrue(os.path.exists(ai_result.heatmap_image.path))
\ No newline at end of file
+        self.assertTrue(os.path.exists(ai_result.heatmap_image.path))
+
+
+class _FakeModel:
+    def __init__(self):
+        self.eval_called = False
+
+    def eval(self):
+        self.eval_called = True
+        return self
+
+
+class ModelRegistryTest(SimpleTestCase):
+
+    def setUp(self):
+        self.loads = []
+        self.registry = ModelRegistry()
+        self.registry.register("fake", self._load)
+
+        tmp = tempfile.NamedTemporaryFile(suffix=".pkl", delete=False)
+        tmp.close()
+        self.path = tmp.name
+        self.addCleanup(os.remove, self.path)
+
+    def _load(self, path, device):
+        self.loads.append((path, str(device)))
+        return _FakeModel()
+
+    def test_checkpoint_is_loaded_once_per_process(self):
+        first = self.registry.get("fake", self.path)
+        second = self.registry.get("fake", self.path)
+
+        self.assertIs(first, second)
+        self.assertTrue(first.eval_called)
+        self.assertEqual(len(self.loads), 1)
+
+    def test_changed_checkpoint_is_reloaded(self):
+        first = self.registry.get("fake", self.path)
+
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        second = self.registry.get("fake", self.path)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(len(self.loads), 2)
+
+    def test_unknown_model_name_raises(self):
+        with self.assertRaises(KeyError):
+            self.registry.get("missing", self.path)
+
+
+class MicroBatcherTest(SimpleTestCase):
+
+    def test_concurrent_requests_share_one_forward_pass(self):
+        seen = []
+
+        def double(batch):
+            seen.append(batch.shape[0])
+            return batch * 2
+
+        batcher = MicroBatcher(double, max_batch_size=4, max_delay_ms=200)
+        futures = [batcher.submit(torch.full((3,), float(i))) for i in range(4)]
+        results = [f.result(timeout=5) for f in futures]
+
+        self.assertEqual(seen, [4])
+        for i, result in enumerate(results):
+            self.assertTrue(torch.equal(result, torch.full((3,), 2.0 * i)))
+        self.assertEqual(batcher.stats()["mean_batch_size"], 4.0)
+
+    def test_partial_batch_flushes_after_max_delay(self):
+        batcher = MicroBatcher(lambda batch: batch, max_batch_size=8, max_delay_ms=5)
+
+        result = batcher(torch.ones(2), timeout=5)
+
+        self.assertTrue(torch.equal(result, torch.ones(2)))
+        self.assertEqual(batcher.stats()["batch_size_histogram"], {1: 1})
+
+    def test_errors_are_fanned_out_to_every_caller(self):
+        def fail(batch):
+            raise RuntimeError("boom")
+
+        batcher = MicroBatcher(fail, max_batch_size=2, max_delay_ms=200)
+        futures = [batcher.submit(torch.ones(1)) for _ in range(2)]
+
+        for future in futures:
+            with self.assertRaises(RuntimeError):
+                future.result(timeout=5)
+
+
+class _TinyCNN(nn.Module):
+    def __init__(self):
+        super().__init__()
+        torch.manual_seed(0)
+        self.features = nn.Conv2d(3, 4, kernel_size=3, padding=1)
+        self.head = nn.Linear(4, 2)
+        self.forward_calls = 0
+
+    def forward(self, x):
+        self.forward_calls += 1
+        x = torch.relu(self.features(x))
+        return self.head(x.mean(dim=(2, 3)))
+
+
+class GradCAMTest(SimpleTestCase):
+
+    def setUp(self):
+        self.model = _TinyCNN().eval()
+        self.batch = torch.rand(3, 3, 8, 8)
+
+    def test_single_forward_pass_yields_logits_and_cams(self):
+        with GradCAM(self.model, self.model.features) as gradcam:
+            result = gradcam.run(self.batch)
+
+        self.assertEqual(self.model.forward_calls, 1)
+        self.assertEqual(result["cams"].shape, (3, 8, 8))
+        self.assertTrue(torch.equal(result["class_idx"], result["probs"].argmax(dim=1)))
+        self.assertLessEqual(result["cams"].max(), 1.0)
+        self.assertGreaterEqual(result["cams"].min(), 0.0)
+
+    def test_hooks_are_removed_after_use(self):
+        for _ in range(3):
+            with GradCAM(self.model, self.model.features) as gradcam:
+                gradcam.run(self.batch)
+
+        self.assertEqual(len(self.model.features._forward_hooks), 0)
+        self.assertEqual(len(self.model.features._backward_hooks), 0)
+
+    def test_batched_cams_match_single_image_cams(self):
+        targets = [1, 0, 1]
+        with GradCAM(self.model, self.model.features) as gradcam:
+            batched = gradcam.run(self.batch, targets)["cams"]
+            singles = [
+                gradcam.run(self.batch[i:i + 1], targets[i])["cams"][0]
+                for i in range(3)
+            ]
+
+        for i in range(3):
+            np.testing.assert_allclose(batched[i], singles[i], atol=1e-5)
+
+    def test_run_requires_attached_hooks(self):
+        with self.assertRaises(RuntimeError):
+            GradCAM(self.model, self.model.features).run(self.batch)
+
+
+class BreastCancerBackendParityTest(SimpleTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.tmpdir = tempfile.mkdtemp()
+        torch.manual_seed(0)
+
+        model = BreastCancerModel(num_classes=2).eval()
+        cls.checkpoint = os.path.join(cls.tmpdir, "breast_model.pkl")
+        torch.save({"model_state_dict": model.state_dict()}, cls.checkpoint)
+
+        cls.batch = torch.rand(2, 3, 224, 224)
+        with torch.no_grad():
+            cls.expected = torch.softmax(
+                get_classifier("eager", cls.checkpoint)(cls.batch), dim=1
+            )
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmpdir)
+        super().tearDownClass()
+
+    def _probs(self, backend, path):
+        with torch.no_grad():
+            return torch.softmax(get_classifier(backend, path)(self.batch), dim=1)
+
+    def test_torchscript_matches_eager(self):
+        eager = get_classifier("eager", self.checkpoint)
+        path = export_torchscript(eager, os.path.join(self.tmpdir, "model.pt"))
+
+        torch.testing.assert_close(self._probs("torchscript", path), self.expected, atol=1e-4, rtol=1e-3)
+
+    @unittest.skipUnless(
+        importlib.util.find_spec("onnx") and importlib.util.find_spec("onnxruntime"),
+        "onnx and onnxruntime are not installed"
+    )
+    def test_onnxruntime_matches_eager(self):
+        eager = get_classifier("eager", self.checkpoint)
+        path = export_onnx(eager, os.path.join(self.tmpdir, "model.onnx"))
+
+        torch.testing.assert_close(self._probs("onnxruntime", path), self.expected, atol=1e-4, rtol=1e-3)
+
+    def test_unknown_backend_is_rejected(self):
+        with self.assertRaises(ValueError):
+            get_classifier("tensorrt", self.checkpoint)
+
+
+class BreastCancerQuantizationTest(SimpleTestCase):
+
+    def setUp(self):
+        torch.manual_seed(0)
+        self.model = BreastCancerModel(num_classes=2).eval()
+        self.batches = [torch.rand(2, 3, 224, 224) for _ in range(2)]
+
+    def test_dynamic_quantization_stays_close_to_fp32(self):
+        int8, mode = quantize(self.model, "dynamic")
+
+        drift = compare_predictions(self.model, int8, self.batches)
+
+        self.assertEqual(mode, "dynamic")
+        self.assertEqual(drift["images"], 4)
+        self.assertLess(drift["max_confidence_delta"], 0.05)
+
+    def test_static_without_calibration_falls_back_to_dynamic(self):
+        _, mode = quantize(self.model, "static", calibration_batches=[])
+
+        self.assertEqual(mode, "dynamic")
+
+    def test_quantized_model_loads_through_backend(self):
+        int8, _ = quantize(self.model, "dynamic")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = save_quantized(int8, os.path.join(tmpdir, "model.int8.pt"))
+            loaded = get_classifier("quantized", path)
+
+            with torch.no_grad():
+                torch.testing.assert_close(loaded(self.batches[0]), int8(self.batches[0]))
+
+
+def write_dicom(path, pixels, **attrs):
+    meta = FileMetaDataset()
+    meta.MediaStorageSOPClassUID = SecondaryCaptureImageStorage
+    meta.MediaStorageSOPInstanceUID = generate_uid()
+    meta.TransferSyntaxUID = ExplicitVRLittleEndian
+
+    ds = Dataset()
+    ds.file_meta = meta
+    ds.SOPClassUID = SecondaryCaptureImageStorage
+    ds.SOPInstanceUID = meta.MediaStorageSOPInstanceUID
+    ds.Modality = "MG"
+    ds.SamplesPerPixel = 1
+    ds.PhotometricInterpretation = "MONOCHROME2"
+    ds.Rows, ds.Columns = pixels.shape[-2:]
+    ds.BitsAllocated = 16
+    ds.BitsStored = 16
+    ds.HighBit = 15
+    ds.PixelRepresentation = 0
+    if pixels.ndim == 3:
+        ds.NumberOfFrames = pixels.shape[0]
+    for key, value in attrs.items():
+        setattr(ds, key, value)
+    ds.PixelData = pixels.astype(np.uint16).tobytes()
+    ds.save_as(path, enforce_file_format=True)
+    return path
+
+
+class ImageLoaderTest(SimpleTestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+
+    def test_large_dicom_is_downsampled_and_normalized(self):
+        pixels = np.tile(np.arange(1200, dtype=np.uint16), (900, 1))
+        path = write_dicom(
+            os.path.join(self.tmpdir, "scan.dcm"),
+            pixels,
+            RescaleSlope=2,
+            RescaleIntercept=-100,
+            WindowCenter=[1100, 1200],
+            WindowWidth=[1000, 800],
+        )
+
+        image = load_image(path)
+
+        self.assertEqual(image.shape, (224, 224))
+        self.assertEqual(image.dtype, np.float32)
+        self.assertAlmostEqual(float(image.min()), 0.0, places=4)
+        self.assertAlmostEqual(float(image.max()), 1.0, places=4)
+        # Left side is below the window and clipped to the floor
+        self.assertTrue(np.all(image[:, :40] == 0.0))
+
+    def test_multi_frame_dicom_frames_are_read_lazily(self):
+        frames = np.stack([
+            np.full((300, 300), 10, dtype=np.uint16),
+            np.tile(np.arange(300, dtype=np.uint16), (300, 1)),
+        ])
+        path = write_dicom(os.path.join(self.tmpdir, "multi.dcm"), frames)
+
+        self.assertEqual(dicom_frame_count(path), 2)
+
+        second = load_image(path, frame=1)
+        self.assertEqual(second.shape, (224, 224))
+        self.assertGreater(float(second[:, -1].mean()), float(second[:, 0].mean()))
+
+        all_frames = list(iter_frames(path))
+        self.assertEqual(len(all_frames), 2)
+        np.testing.assert_allclose(all_frames[1], second, atol=1e-6)
+
+        with self.assertRaises(IndexError):
+            load_image(path, frame=2)
+
+    def test_large_raster_uses_reduced_decode(self):
+        path = os.path.join(self.tmpdir, "scan.png")
+        cv2.imwrite(path, np.tile(np.arange(256, dtype=np.uint8), (1000, 4)))
+
+        image = load_image(path)
+
+        self.assertEqual(image.shape, (224, 224))
+        self.assertAlmostEqual(float(image.max()), 1.0, places=4)
+
+
+class TensorCacheTest(SimpleTestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.scan = os.path.join(self.tmpdir, "scan.png")
+        cv2.imwrite(self.scan, np.tile(np.arange(256, dtype=np.uint8), (256, 1)))
+        self.decodes = 0
+
+    def _loader(self, path, size):
+        self.decodes += 1
+        return load_image(path, size)
+
+    def _cache(self, **kwargs):
+        kwargs.setdefault("max_bytes", 10 * 1024 * 1024)
+        return TensorCache(os.path.join(self.tmpdir, "cache"), **kwargs)
+
+    def test_repeated_loads_skip_decode(self):
+        cache = self._cache()
+
+        first = cache.load(self.scan, (224, 224), self._loader)
+        second = cache.load(self.scan, (224, 224), self._loader)
+
+        self.assertEqual(self.decodes, 1)
+        np.testing.assert_array_equal(first, second)
+        self.assertFalse(second.flags.writeable)
+
+    def test_disk_entries_survive_a_new_process(self):
+        self._cache().load(self.scan, (224, 224), self._loader)
+
+        cached = self._cache().load(self.scan, (224, 224), self._loader)
+
+        self.assertEqual(self.decodes, 1)
+        self.assertIsInstance(cached, np.memmap)
+
+    def test_preprocessing_version_is_part_of_the_key(self):
+        self._cache(version="1").load(self.scan, (224, 224), self._loader)
+        self._cache(version="2").load(self.scan, (224, 224), self._loader)
+
+        self.assertEqual(self.decodes, 2)
+
+    def test_oldest_entries_are_evicted_over_budget(self):
+        entry_bytes = 224 * 224 * 4 + 128
+        cache = self._cache(max_bytes=int(entry_bytes * 2.5), memory_items=0)
+
+        for i in range(4):
+            cache.put(f"{i:064x}", np.full((224, 224), i, dtype=np.float32))
+            path = cache._path(f"{i:064x}")
+            os.utime(path, (i, i))
+
+        self.assertIsNone(cache.get(f"{0:064x}"))
+        self.assertIsNotNone(cache.get(f"{3:064x}"))
+        self.assertLessEqual(sum(size for _, size, _ in cache._files()), cache.max_bytes)
+
+
+class _ConstantClassifier:
+
+    def __init__(self, logits):
+        self.logits = torch.tensor(logits)
+        self.batch_sizes = []
+
+    def __call__(self, x):
+        self.batch_sizes.append(x.shape[0])
+        return self.logits.repeat(x.shape[0], 1)
+
+
+@mock.patch("practitioner.services.rescoring.get_tensor_cache", return_value=None)
+class RescoringTest(PractitionerBaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.tests = [
+            DiagnosticTest.objects.create(
+                patient=self.patient_profile,
+                practitioner=self.practitioner_profile,
+                test_type="BREAST_CANCER",
+                status="AI_DONE",
+                raw_image=SimpleUploadedFile(f"scan{i}.png", get_test_image().read())
+            )
+            for i in range(5)
+        ]
+        AIInferenceResult.objects.create(
+            test=self.tests[0],
+            model_name="BREAST_CANCER",
+            model_version="v1",
+            risk_score=0.6,
+            risk_level="LOW",
+            confidence=0.6
+        )
+        self.state_file = os.path.join(tempfile.mkdtemp(), "rescore.json")
+        self.addCleanup(shutil.rmtree, os.path.dirname(self.state_file))
+
+    def _rescore(self, model, **kwargs):
+        with mock.patch("practitioner.services.rescoring.get_classifier", return_value=model):
+            return rescore_breast_cancer(
+                "unused.pth", "v2", batch_size=2, workers=0, checkpoint=self.state_file, **kwargs
+            )
+
+    def test_updates_and_creates_results_in_batches(self, _):
+        model = _ConstantClassifier([[0.0, 2.0]])
+
+        stats = self._rescore(model)
+
+        self.assertEqual(stats["processed"], 5)
+        self.assertEqual((stats["updated"], stats["created"]), (1, 4))
+        self.assertEqual(model.batch_sizes, [2, 2, 1])
+        self.assertEqual(
+            AIInferenceResult.objects.filter(model_version="v2", risk_level="HIGH").count(), 5
+        )
+
+    def test_interrupted_run_resumes_from_checkpoint(self, _):
+        self._rescore(_ConstantClassifier([[2.0, 0.0]]), limit=3)
+
+        model = _ConstantClassifier([[2.0, 0.0]])
+        stats = self._rescore(model)
+
+        self.assertEqual(stats["processed"], 2)
+        self.assertEqual(sum(model.batch_sizes), 2)
+        self.assertEqual(AIInferenceResult.objects.filter(model_version="v2").count(), 5)
+
+
+class ReportGeneratorTest(PractitionerBaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.test = DiagnosticTest.objects.create(
+            patient=self.patient_profile,
+            practitioner=self.practitioner_profile,
+            test_type="BREAST_CANCER",
+            status="AI_DONE"
+        )
+        self.ai_result = AIInferenceResult.objects.create(
+            test=self.test,
+            model_name="BREAST_CANCER",
+            risk_score=0.8,
+            risk_level="HIGH",
+            confidence=0.8
+        )
+
+    @mock.patch("os.remove")
+    def test_report_is_rendered_in_memory(self, remove):
+        pdf = generate_report(self.test, self.ai_result)
+
+        self.assertTrue(pdf.read().startswith(b"%PDF"))
+        self.assertEqual(pdf.name, f"report_{self.test.id}.pdf")
+        remove.assert_not_called()
+
+    def test_overlay_array_is_used_without_reading_the_stored_png(self):
+        overlay = np.zeros((224, 224, 3), dtype=np.uint8)
+
+        with mock.patch.object(type(self.ai_result.heatmap_image), "open") as open_file:
+            with_heatmap = generate_report(self.test, self.ai_result, heatmap=overlay)
+
+        open_file.assert_not_called()
+        self.assertGreater(with_heatmap.size, generate_report(self.test, self.ai_result).size)
+
+
+class ReportRenderingTest(PractitionerBaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.test = DiagnosticTest.objects.create(
+            patient=self.patient_profile,
+            practitioner=self.practitioner_profile,
+            test_type="BREAST_CANCER",
+            status="UPLOADED",
+            raw_image=SimpleUploadedFile("scan.png", get_test_image().read())
+        )
+
+    @mock.patch("practitioner.services.ai_service.predict_breast_cancer")
+    def test_report_is_rendered_off_the_request_path(self, predict):
+        predict.return_value = {"prediction": "Benign", "class_idx": 0, "confidence": 0.8}
+
+        enqueue_ai_job(self.test)
+        run_job(claim_jobs("test-worker", 1)[0])
+
+        report = DiagnosticReport.objects.get(test=self.test)
+        self.assertEqual(report.status, "PENDING")
+        self.assertFalse(report.report_pdf)
+
+        call_command("render_reports", burst=True, concurrency=1)
+
+        report.refresh_from_db()
+        self.assertEqual(report.status, "READY")
+        self.assertTrue(report.report_pdf.read().startswith(b"%PDF"))
+
+    def test_risk_level_change_queues_rerender(self):
+        ai_result = AIInferenceResult.objects.create(
+            test=self.test,
+            model_name="BREAST_CANCER",
+            risk_score=0.7,
+            risk_level="LOW",
+            confidence=0.7
+        )
+        mark_report_pending(self.test, final_risk_level="LOW")
+        call_command("render_reports", burst=True, concurrency=1)
+
+        ai_result.risk_level = "HIGH"
+        ai_result.save()
+
+        report = DiagnosticReport.objects.get(test=self.test)
+        self.assertEqual(report.status, "PENDING")
+        self.assertEqual(report.final_risk_level, "HIGH")
+
+    @mock.patch("practitioner.services.ai_service.predict_breast_cancer")
+    def test_rerun_bumps_report_revision_once(self, predict):
+        AIInferenceResult.objects.create(
+            test=self.test,
+            model_name="BREAST_CANCER",
+            risk_score=0.7,
+            risk_level="LOW",
+            confidence=0.7
+        )
+        mark_report_pending(self.test, final_risk_level="LOW")
+        revision = DiagnosticReport.objects.get(test=self.test).revision
+        predict.return_value = {"prediction": "Malignant", "class_idx": 1, "confidence": 0.9}
+
+        run_ai_and_generate_report(self.test)
+
+        report = DiagnosticReport.objects.get(test=self.test)
+        self.assertEqual(report.final_risk_level, "HIGH")
+        self.assertEqual(report.revision, revision + 1)
+
+    def test_rerender_uses_report_risk_level_and_signature(self):
+        AIInferenceResult.objects.create(
+            test=self.test,
+            model_name="BREAST_CANCER",
+            risk_score=0.7,
+            risk_level="LOW",
+            confidence=0.7
+        )
+        mark_report_pending(self.test, final_risk_level="HIGH", doctor_signed=True)
+
+        with mock.patch(
+            "practitioner.services.report_service.generate_report", wraps=generate_report
+        ) as generate:
+            render(claim_reports(1)[0])
+
+        self.assertEqual(generate.call_args.kwargs["risk_level"], "HIGH")
+        self.assertTrue(generate.call_args.kwargs["doctor_signed"])
+        self.assertEqual(DiagnosticReport.objects.get(test=self.test).status, "READY")
+
+    def test_superseded_render_is_not_published(self):
+        AIInferenceResult.objects.create(
+            test=self.test,
+            model_name="BREAST_CANCER",
+            risk_score=0.7,
+            risk_level="LOW",
+            confidence=0.7
+        )
+        mark_report_pending(self.test, final_risk_level="LOW")
+
+        with mock.patch("practitioner.services.report_service.generate_report") as generate:
+            def generate_then_sign(*args, **kwargs):
+                mark_report_pending(self.test, doctor_signed=True)
+                return generate_report(*args, **kwargs)
+
+            generate.side_effect = generate_then_sign
+            render(claim_reports(1)[0])
+
+        report = DiagnosticReport.objects.get(test=self.test)
+        self.assertEqual(report.status, "PENDING")
+        self.assertFalse(report.report_pdf)
+
+
+class ChunkedUploadTest(PractitionerBaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        override = override_settings(UPLOAD_TMP_DIR=tmp_dir)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.test = DiagnosticTest.objects.create(
+            patient=self.patient_profile,
+            practitioner=self.practitioner_profile,
+            test_type="BREAST_CANCER",
+            status="UPLOADED"
+        )
+        self.data = get_test_image().read()
+
+    def _start(self, checksum=None):
+        response = self.client.post(
+            f"/api/practitioner/tests/{self.test.id}/uploads/",
+            {
+                "filename": "study.jpg",
+                "size": len(self.data),
+                "checksum": checksum or hashlib.sha256(self.data).hexdigest()
+            },
+            format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data["upload_id"]
+
+    def _put(self, upload_id, offset, chunk):
+        return self.client.put(
+            f"/api/practitioner/uploads/{upload_id}/",
+            chunk,
+            content_type="application/offset+octet-stream",
+            HTTP_UPLOAD_OFFSET=str(offset)
+        )
+
+    def test_resumed_upload_completes_and_queues_preprocessing(self):
+        upload_id = self._start()
+        half = len(self.data) // 2
+
+        self.assertEqual(self._put(upload_id, 0, self.data[:half]).data["offset"], half)
+
+        # Client reconnects and asks where to resume
+        offset = self.client.get(f"/api/practitioner/uploads/{upload_id}/").data["offset"]
+        response = self._put(upload_id, offset, self.data[offset:])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], "COMPLETE")
+
+        self.test.refresh_from_db()
+        self.assertEqual(self.test.raw_image.read(), self.data)
+        self.assertTrue(AIJob.objects.filter(test=self.test, kind="PREPROCESS").exists())
+
+    def test_wrong_offset_is_rejected_with_expected_offset(self):
+        upload_id = self._start()
+        self._put(upload_id, 0, self.data[:10])
+
+        response = self._put(upload_id, 5, self.data[5:20])
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data["offset"], 10)
+
+    def test_disconnect_keeps_the_bytes_that_arrived(self):
+        upload_id = self._start()
+        stream = mock.Mock()
+        stream.read.side_effect = [self.data[:10], UnreadablePostError("client went away")]
+
+        session = write_chunk(upload_id, 0, stream, 100)
+
+        self.assertEqual(session.received_bytes, 10)
+
+    def test_disk_write_error_does_not_advance_the_offset(self):
+        upload_id = self._start()
+
+        with mock.patch("practitioner.services.uploads.shutil.copyfileobj", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                write_chunk(upload_id, 0, io.BytesIO(self.data[:10]), 10)
+
+        self.assertEqual(UploadSession.objects.get(id=upload_id).received_bytes, 0)
+
+    def test_checksum_mismatch_fails_the_upload(self):
+        upload_id = self._start(checksum="0" * 64)
+
+        response = self._put(upload_id, 0, self.data)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(UploadSession.objects.get(id=upload_id).status, "FAILED")
+        self.test.refresh_from_db()
+        self.assertFalse(self.test.raw_image)
+        self.assertFalse(AIJob.objects.filter(test=self.test).exists())
@@ -6,7 +6,11 @@ from practitioner.views import (
     ClinicalContextCreateView,
     RunAITestView,
     ViewAIResultView,
-    ReferralCreateView
+    ReferralCreateView,
+    AIJobStatusView,
+    UploadSessionCreateView,
+    UploadSessionView,
+    UploadSessionCompleteView
 )
 
 
@@ -14,8 +18,12 @@ urlpatterns = [
     path("patient-search/", PatientLookupView.as_view()),
     path("tests/create/", DiagnosticTestCreateView.as_view()),
     path("tests/<uuid:test_id>/upload/", DiagnosticImageUploadView.as_view()),
+    path("tests/<uuid:test_id>/uploads/", UploadSessionCreateView.as_view()),
+    path("uploads/<uuid:upload_id>/", UploadSessionView.as_view()),
+    path("uploads/<uuid:upload_id>/complete/", UploadSessionCompleteView.as_view()),
     path("tests/<uuid:test_id>/context/", ClinicalContextCreateView.as_view()),
     path("tests/<uuid:test_id>/run-ai/", RunAITestView.as_view()),
     path("tests/<uuid:test_id>/ai-result/", ViewAIResultView.as_view()),
     path("tests/<uuid:test_id>/refer/", ReferralCreateView.as_view()),
+    path("jobs/<uuid:job_id>/", AIJobStatusView.as_view()),
 ]
\ No newline at end of file
@@ -9,7 +9,10 @@ from practitioner.serializers import (
     DiagnosticImageUploadSerializer,
     ClinicalContextSerializer,
     AIResultSerializer,
-    ReferralCreateSerializer
+    ReferralCreateSerializer,
+    AIJobSerializer,
+    UploadSessionCreateSerializer,
+    UploadSessionSerializer
 )
 from core.models import (
     PatientProfile,
@@ -18,7 +21,17 @@ from core.models import (
     Referral,
     AIInferenceResult
 )
-from practitioner.services.ai_service import run_ai_and_generate_report
+from django.conf import settings
+from core.pagination import paginated_response
+from practitioner.models import AIJob, UploadSession
+from practitioner.services.job_queue import enqueue_ai_job
+from practitioner.services.uploads import (
+    UploadError,
+    OffsetMismatch,
+    start_upload,
+    write_chunk,
+    complete_upload
+)
 
 
 class PatientLookupView(APIView):
@@ -41,8 +54,7 @@ class PatientLookupView(APIView):
         if phone:
             qs = qs.filter(user__phone=phone)
 
-        serializer = PatientLookupSerializer(qs, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return paginated_response(request, qs, PatientLookupSerializer, "-created_at")
 
 
 class DiagnosticTestCreateView(APIView):
@@ -82,6 +94,103 @@ class DiagnosticImageUploadView(APIView):
         return Response({"message": "Image uploaded"})
     
 
+class UploadSessionCreateView(APIView):
+    """Start a chunked upload of the scan for a test."""
+    permission_classes = [IsAuthenticated, IsPractitioner]
+
+    def post(self, request, test_id):
+        serializer = UploadSessionCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        test = get_object_or_404(
+            DiagnosticTest,
+            id=test_id,
+            practitioner=request.user.practitioner_profile
+        )
+
+        session = start_upload(
+            test,
+            serializer.validated_data["filename"],
+            serializer.validated_data["size"],
+            serializer.validated_data["checksum"]
+        )
+
+        return Response(
+            UploadSessionSerializer(session).data,
+            status=status.HTTP_201_CREATED
+        )
+
+
+class UploadSessionView(APIView):
+    """
+    GET reports the committed offset to resume from. PUT appends the
+    request body at the ``Upload-Offset`` header; the final chunk
+    completes the upload.
+    """
+    permission_classes = [IsAuthenticated, IsPractitioner]
+
+    def _session(self, request, upload_id):
+        return get_object_or_404(
+            UploadSession,
+            id=upload_id,
+            test__practitioner=request.user.practitioner_profile
+        )
+
+    def get(self, request, upload_id):
+        session = self._session(request, upload_id)
+        return Response(UploadSessionSerializer(session).data)
+
+    def put(self, request, upload_id):
+        session = self._session(request, upload_id)
+
+        try:
+            offset = int(request.headers["Upload-Offset"])
+            length = int(request.headers["Content-Length"])
+        except (KeyError, ValueError):
+            return Response(
+                {"error": "Upload-Offset and Content-Length headers are required"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if length > settings.UPLOAD_CHUNK_MAX_BYTES:
+            return Response(
+                {"error": f"Chunks are limited to {settings.UPLOAD_CHUNK_MAX_BYTES} bytes"},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
+
+        try:
+            session = write_chunk(session.id, offset, request.stream, length)
+            if session.received_bytes == session.total_size:
+                session = complete_upload(session.id)
+        except OffsetMismatch as exc:
+            return Response(
+                {"error": str(exc), "offset": exc.expected},
+                status=status.HTTP_409_CONFLICT
+            )
+        except UploadError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(UploadSessionSerializer(session).data)
+
+
+class UploadSessionCompleteView(APIView):
+    permission_classes = [IsAuthenticated, IsPractitioner]
+
+    def post(self, request, upload_id):
+        session = get_object_or_404(
+            UploadSession,
+            id=upload_id,
+            test__practitioner=request.user.practitioner_profile
+        )
+
+        try:
+            session = complete_upload(session.id)
+        except UploadError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(UploadSessionSerializer(session).data)
+
+
 class ClinicalContextCreateView(APIView):
     permission_classes = [IsAuthenticated, IsPractitioner]
 
@@ -142,9 +251,22 @@ class RunAITestView(APIView):
             practitioner=request.user.practitioner_profile
         )
 
-        ai_result = run_ai_and_generate_report(test)
+        job = enqueue_ai_job(test)
+
+        return Response(
+            AIJobSerializer(job).data,
+            status=status.HTTP_202_ACCEPTED
+        )
+
 
-        test.status = "AI_DONE"
-        test.save(update_fields=["status"])
+class AIJobStatusView(APIView):
+    permission_classes = [IsAuthenticated, IsPractitioner]
+
+    def get(self, request, job_id):
+        job = get_object_or_404(
+            AIJob.objects.select_related("test", "test__aiinferenceresult"),
+            id=job_id,
+            test__practitioner=request.user.practitioner_profile
+        )
 
-        return Response(AIResultSerializer(ai_result).data)
\ No newline at end of file
+        return Response(AIJobSerializer(job).data)
\ No newline at end of file
@@ -42,6 +42,27 @@ const baseQueryWithRefresh = async (args, api, extraOptions) => {
     return result;
 }
 
+// List endpoints return one cursor page per request and link the next one
+// from the Link header; list screens follow it to receive every row.
+const nextPageUrl = (response) => {
+    const match = response?.headers.get('Link')?.match(/<([^>]+)>;\s*rel="next"/);
+    return match ? match[1] : null;
+}
+
+export const allPages = (buildUrl) => async (arg, api, extraOptions, baseQuery) => {
+    let url = buildUrl(arg);
+    const rows = [];
+    while (url) {
+        const result = await baseQuery(url, api, extraOptions);
+        if (result.error) {
+            return result;
+        }
+        rows.push(...result.data);
+        url = nextPageUrl(result.meta?.response);
+    }
+    return { data: rows };
+}
+
 export const apiSlice = createApi({
     reducerPath: 'api',
     baseQuery: baseQueryWithRefresh,
@@ -1,9 +1,9 @@
-import { apiSlice } from './index';
+import { apiSlice, allPages } from './index';
 
 export const patientApiSlice = apiSlice.injectEndpoints({
   endpoints: (builder) => ({
     getPatientTests: builder.query({
-      query: () => "patient/tests/",
+      queryFn: allPages(() => "patient/tests/"),
       pollingInterval: 15000,
       keepUnusedDataFor: 0,
     }),
@@ -13,7 +13,7 @@ export const patientApiSlice = apiSlice.injectEndpoints({
       keepUnusedDataFor: 0,
     }),
     getPatientReferrals: builder.query({
-      query: () => "patient/referrals/",
+      queryFn: allPages(() => "patient/referrals/"),
       pollingInterval: 15000,
       keepUnusedDataFor: 0,
     }),
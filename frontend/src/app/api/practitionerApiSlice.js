@@ -1,13 +1,13 @@
-import { apiSlice } from './index';
+import { apiSlice, allPages } from './index';
 
 export const practitionerApiSlice = apiSlice.injectEndpoints({
   endpoints: (builder) => ({
     searchPatient: builder.query({
-      query: ({ phone, abhi_id }) => {
+      queryFn: allPages(({ phone, abhi_id }) => {
         if (phone) return `practitioner/patient-search/?phone=${phone}`;
         if (abhi_id) return `practitioner/patient-search/?abhi_id=${abhi_id}`;
         return 'practitioner/patient-search/';
-      },
+      }),
       keepUnusedDataFor: 0,
     }),
     createDiagnosticTest: builder.mutation({